@@ -22,19 +22,47 @@ Tested on Windows; should also work on macOS/Linux with paths adjusted.
 
 import os
 import sys
+import asyncio
+import locale
 import subprocess
+import shutil
+import tempfile
 import threading
+import json
+import mmap
+import re
+import struct
+import sqlite3
+import fnmatch
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import hashlib
+from array import array
+import time
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import xxhash   # optional: much faster than blake2b on multi-GB traces
+except ImportError:
+    xxhash = None
+try:
+    import lz4.block as lz4_block   # optional: C decoder for compressed trace packets
+except ImportError:
+    lz4_block = None
+
 # Try importing PySide6 with a friendly error if missing
 try:
-    from PySide6.QtCore import Qt, QTimer
+    from PySide6.QtCore import (
+        Qt, QTimer, QObject, QRunnable, QThreadPool, Signal, QAbstractTableModel, QAbstractItemModel, QModelIndex,
+        QSortFilterProxyModel, QRegularExpression
+    )
+    from PySide6.QtGui import QFont
     from PySide6.QtWidgets import (
         QApplication, QWidget, QFileDialog, QVBoxLayout, QHBoxLayout, QLabel,
         QPushButton, QLineEdit, QTextEdit, QListWidget, QListWidgetItem, QGroupBox,
         QMessageBox, QCheckBox, QTableWidget, QTableWidgetItem, QHeaderView,
-        QAbstractItemView
+        QAbstractItemView, QSpinBox, QProgressBar, QTableView, QTabWidget, QTreeView, QComboBox
     )
 except Exception as _e:  # ImportError/ModuleNotFoundError
     print("*** PySide6 is not installed or failed to load. ***")
@@ -42,100 +70,2583 @@ except Exception as _e:  # ImportError/ModuleNotFoundError
     print(f"Original import error: {_e}")
     raise
 
-# ---- defaults / presets ----
-DEFAULT_TRACE_ARGS = (
-    "-tracehost=127.0.0.1 -trace=Bookmark,Frame,CPU,GPU,LoadTime,File "
-    "-cpuprofilertrace -statnamedevents -filetrace -loadtimetrace\n"
-    "For Memory Insights: include -trace=default,memory (and ensure Dev build)\n"
-)
+# ---- defaults / presets ----
+DEFAULT_TRACE_ARGS = (
+    "-tracehost=127.0.0.1 -trace=Bookmark,Frame,CPU,GPU,LoadTime,File "
+    "-cpuprofilertrace -statnamedevents -filetrace -loadtimetrace\n"
+    "For Memory Insights: include -trace=default,memory (and ensure Dev build)\n"
+)
+
+# ------------------------- helpers -------------------------
+
+def _launch_error(cmd:list[str], e:Exception) -> RuntimeError:
+    # Common on Windows when selecting a folder instead of the .exe,
+    # or when the file is blocked by SmartScreen/AV.
+    return RuntimeError(f"Permission error launching: {cmd[0]} — check that it's an executable (.exe on Windows) and not blocked (Right‑click > Properties > Unblock). Original: {e}")
+
+
+def redact_args(cmd:list[str]) -> list[str]:
+    # the value after -k is UAFT's security token; keep it out of logs and dialogs
+    return [("***" if i and cmd[i - 1] == "-k" else a) for i, a in enumerate(cmd)]
+
+
+class CommandTimeout(RuntimeError):
+    """A UAFT/adb call exceeded its time budget; its whole process tree has been killed."""
+    def __init__(self, op:str, cmd:list[str], timeout:float, idle:bool=False):
+        self.op, self.cmd, self.timeout = op, redact_args(cmd), timeout
+        what = f"made no progress for {timeout:g}s" if idle else f"timed out after {timeout:g}s"
+        super().__init__(f"{op} {what} and was stopped.\n"
+                         f"Command: {' '.join(self.cmd)}\n"
+                         "Check that the device is connected and authorized and that the app with the AFS receiver is running.")
+
+
+# Children get their own process group (POSIX) so a timeout can take down everything
+# they spawned (UAFT runs adb under the hood), not just the direct child.
+_GROUP_KWARGS = {} if sys.platform.startswith("win") else {"start_new_session": True}
+
+
+def kill_tree(pid:int):
+    try:
+        if sys.platform.startswith("win"):
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            import signal
+            os.killpg(pid, signal.SIGKILL)
+    except (OSError, subprocess.SubprocessError):
+        pass
+
+
+class ChildProcesses:
+    """Children started by run()/run_lines()/run_async() that haven't exited yet.
+
+    kill_all() takes their process trees down when the app closes, instead of leaving the
+    thread pool to wait out pulls and exports whose timeouts run to half an hour; a child
+    started after that is killed straight away.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pids:set[int] = set()
+        self.closed = False
+
+    def add(self, pid:int):
+        with self._lock:
+            if not self.closed:
+                self._pids.add(pid)
+                return
+        kill_tree(pid)
+
+    def discard(self, pid:int):
+        with self._lock:
+            self._pids.discard(pid)
+
+    def kill_all(self):
+        with self._lock:
+            self.closed = True
+            pids, self._pids = self._pids, set()
+        for pid in pids:
+            kill_tree(pid)
+
+
+_children = ChildProcesses()
+
+
+def _op_name(cmd:list[str], op:str|None) -> str:
+    return op or Path(cmd[0]).name
+
+
+def _time_left(start:float, timeout:float|None, activity=None) -> float|None:
+    # Seconds until the watchdog fires (None: never, <= 0: now). With `activity` (a callable
+    # giving the time.monotonic() of the child's last progress) the budget restarts at each
+    # sign of progress, and is re-checked at least once a second.
+    if timeout is None:
+        return None
+    last = start if activity is None else max(start, activity())
+    left = last + timeout - time.monotonic()
+    return left if activity is None else min(left, 1.0)
+
+
+def run(cmd:list[str], cwd:Path|None=None, timeout:float|None=None, op:str|None=None, activity=None) -> tuple[int,str,str]:
+    """Run cmd to completion; (exit code, stdout, stderr).
+
+    The process tree is killed and CommandTimeout raised after `timeout` seconds, or, with
+    `activity` (see _time_left), after `timeout` seconds without progress.
+    """
+    try:
+        proc = subprocess.Popen(cmd, cwd=str(cwd) if cwd else None,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                text=True, shell=False, **_GROUP_KWARGS)
+    except PermissionError as e:
+        raise _launch_error(cmd, e)
+    _children.add(proc.pid)
+    start = time.monotonic()
+    try:
+        while True:
+            wait = _time_left(start, timeout, activity)
+            try:
+                if wait is not None and wait <= 0:
+                    raise subprocess.TimeoutExpired(cmd, timeout)
+                out, err = proc.communicate(timeout=wait)
+                break
+            except subprocess.TimeoutExpired:
+                if activity is not None and _time_left(start, timeout, activity) > 0:
+                    continue   # still making progress; communicate() can simply be called again
+                kill_tree(proc.pid)
+                proc.kill()
+                proc.communicate()
+                raise CommandTimeout(_op_name(cmd, op), cmd, timeout, idle=activity is not None) from None
+    finally:
+        _children.discard(proc.pid)
+    return proc.returncode, out, err
+
+
+def run_lines(cmd:list[str], cwd:Path|None=None, check:bool=True, timeout:float|None=None, op:str|None=None):
+    """Streaming variant of run(): yields stdout lines as the child prints them.
+
+    stderr is drained on a helper thread so neither pipe can stall the child. With
+    check=True a non-zero exit raises RuntimeError after the last line; closing the
+    generator early kills the child. A watchdog kills the process tree once `timeout`
+    seconds have passed and CommandTimeout is raised (regardless of `check`).
+    """
+    try:
+        proc = subprocess.Popen(cmd, cwd=str(cwd) if cwd else None,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                text=True, bufsize=1, shell=False, **_GROUP_KWARGS)
+    except PermissionError as e:
+        raise _launch_error(cmd, e)
+    _children.add(proc.pid)
+    err_chunks:list[str] = []
+    drain = threading.Thread(target=lambda: err_chunks.append(proc.stderr.read()), daemon=True)
+    drain.start()
+    expired = threading.Event()
+    watchdog = None
+    if timeout is not None:
+        def expire():
+            expired.set()
+            kill_tree(proc.pid)
+            proc.kill()
+        watchdog = threading.Timer(timeout, expire)
+        watchdog.daemon = True
+        watchdog.start()
+    try:
+        for ln in proc.stdout:
+            yield ln.rstrip("\r\n")
+        proc.wait()
+    finally:
+        if watchdog is not None:
+            watchdog.cancel()
+        if proc.poll() is None:
+            kill_tree(proc.pid)
+            proc.kill()
+            proc.wait()
+        _children.discard(proc.pid)
+        proc.stdout.close()
+        drain.join()
+        proc.stderr.close()
+    if expired.is_set():
+        raise CommandTimeout(_op_name(cmd, op), cmd, timeout)
+    if check and proc.returncode != 0:
+        raise RuntimeError("".join(err_chunks) or f"{cmd[0]} exited with code {proc.returncode}")
+
+
+async def run_async(cmd:list[str], cwd:Path|None=None, timeout:float|None=None, op:str|None=None, activity=None) -> tuple[int,str,str]:
+    """asyncio counterpart of run(): many of these can be awaited concurrently from one thread.
+
+    On timeout or cancellation the child's process tree is killed and reaped before the
+    exception (CommandTimeout / CancelledError) propagates.
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(*cmd, cwd=str(cwd) if cwd else None,
+                                                    stdout=asyncio.subprocess.PIPE,
+                                                    stderr=asyncio.subprocess.PIPE,
+                                                    **_GROUP_KWARGS)
+    except PermissionError as e:
+        raise _launch_error(cmd, e)
+    _children.add(proc.pid)
+    start = time.monotonic()
+    comm = asyncio.ensure_future(proc.communicate())
+    try:
+        while True:
+            wait = _time_left(start, timeout, activity)
+            if wait is not None and wait <= 0:
+                raise asyncio.TimeoutError
+            done, _ = await asyncio.wait({comm}, timeout=wait)
+            if done:
+                out, err = comm.result()
+                break
+    except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+        comm.cancel()
+        if proc.returncode is None:
+            kill_tree(proc.pid)
+            proc.kill()
+            await proc.wait()
+        if isinstance(e, asyncio.TimeoutError):
+            raise CommandTimeout(_op_name(cmd, op), cmd, timeout, idle=activity is not None) from None
+        raise
+    finally:
+        _children.discard(proc.pid)
+    enc = locale.getpreferredencoding(False)   # same decoding as run(text=True)
+    return proc.returncode, out.decode(enc, errors="replace"), err.decode(enc, errors="replace")
+
+
+class TransferProgress:
+    """Snapshot of a running transfer: bytes so far, expected total (if known), smoothed rate."""
+    __slots__ = ("done", "total", "rate", "elapsed")
+
+    def __init__(self, done:int, total:int|None, rate:float, elapsed:float):
+        self.done, self.total, self.rate, self.elapsed = done, total, rate, elapsed
+
+    @property
+    def eta(self) -> float|None:
+        if not self.total or self.rate <= 0:
+            return None
+        return max(0.0, (self.total - self.done) / self.rate)
+
+
+class FileGrowthMonitor:
+    """Watches a file another process (UAFT) is writing and reports TransferProgress.
+
+    Use as a context manager around the blocking call; progress() (if given) is called from
+    a helper thread every `interval` seconds and once more on exit. last_growth() is the
+    time.monotonic() the file last got bigger, for run()'s `activity` watchdog.
+    """
+    def __init__(self, path:Path, progress=None, total:int|None=None, interval:float=0.25):
+        self.path, self.progress, self.total, self.interval = path, progress, total, interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+        self._start = self._last_t = self._grew_at = 0.0
+        self._last_size = 0
+        self._rate = 0.0
+
+    def __enter__(self):
+        self._start = self._last_t = self._grew_at = time.monotonic()
+        self._thread.start()
+        return self
+
+    def last_growth(self) -> float:
+        return self._grew_at
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+    def _size(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except OSError:
+            return 0
+
+    def _sample(self):
+        now, size = time.monotonic(), self._size()
+        dt = now - self._last_t
+        if dt > 0:
+            inst = max(0, size - self._last_size) / dt
+            # exponential smoothing so a bursty USB link doesn't make the ETA jump around
+            self._rate = inst if self._rate == 0 else 0.7 * self._rate + 0.3 * inst
+        if size > self._last_size:
+            self._grew_at = now
+        self._last_t, self._last_size = now, size
+        if self.progress is not None:
+            self.progress(TransferProgress(size, self.total, self._rate, now - self._start))
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+
+def _fmt_bytes(n:float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def file_digest(path:Path, chunk:int=1 << 20) -> str:
+    """Streaming content hash as "<algo>:<hex>", read chunk by chunk so memory stays flat.
+
+    xxh3-128 when the xxhash package is installed, blake2b-128 otherwise; the prefix keeps
+    hashes from the two apart when comparing against older records.
+    """
+    if xxhash is not None:
+        h, algo = xxhash.xxh3_128(), "xxh3"
+    else:
+        h, algo = hashlib.blake2b(digest_size=16), "blake2b"
+    with open(path, "rb") as f:
+        while block := f.read(chunk):
+            h.update(block)
+    return f"{algo}:{h.hexdigest()}"
+
+
+def path_exists(p:str) -> bool:
+    return Path(p).expanduser().exists()
+
+
+def user_config_dir() -> Path:
+    if sys.platform.startswith("win"):
+        base = Path(os.environ.get("APPDATA") or Path.home()/"AppData"/"Roaming")
+    elif sys.platform == "darwin":
+        base = Path.home()/"Library"/"Application Support"
+    else:
+        base = Path(os.environ.get("XDG_CONFIG_HOME") or Path.home()/".config")
+    return base/"UAFT Helper GUI"
+
+
+def write_json_atomic(path:Path, data):
+    # write-then-rename so a crash mid-save never leaves a truncated file behind
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # per process and thread, so concurrent saves of the same file can't share a temp file
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class JsonFile:
+    """A JSON document with a "version" key, loaded once and saved atomically.
+
+    A missing, corrupt or other-version file loads as empty(). Subclasses set VERSION and
+    extend empty(); `data` is guarded by `_lock` and save() writes a snapshot taken under it.
+    """
+    VERSION = 1
+
+    def __init__(self, path:Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.data = self.empty()
+        try:
+            loaded = json.loads(self.path.read_text(encoding="utf-8"))
+            if loaded.get("version") == self.VERSION:
+                self.data.update(loaded)
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def empty(self) -> dict:
+        return {"version": self.VERSION}
+
+    def save(self):
+        with self._lock:
+            snapshot = json.loads(json.dumps(self.data))
+        write_json_atomic(self.path, snapshot)
+
+# ------------------------- adb -------------------------
+ADB_PROPS = ("ro.product.manufacturer", "ro.product.model")
+ADB_MAX_PARALLEL = 6     # concurrent adb connections while decorating the device table
+ADB_TIMEOUT = 15.0       # seconds; unauthorized/offline devices can hang adb
+ADB_SERVER_PORT = int(os.environ.get("ANDROID_ADB_SERVER_PORT", "5037"))
+
+
+class AdbError(RuntimeError):
+    pass
+
+
+class AdbClient:
+    """Talks the adb host protocol to the local adb server instead of spawning `adb`.
+
+    Requests are a 4-hex-digit length plus the service name; the server answers OKAY or
+    FAIL + length-prefixed message. The server closes a connection once its service is
+    done (and `shell:` consumes it entirely), so connections cannot be reused; the pool
+    here bounds how many are open at once. Create the client inside the event loop
+    that uses it.
+    """
+    def __init__(self, host:str="127.0.0.1", port:int=ADB_SERVER_PORT,
+                 max_connections:int=ADB_MAX_PARALLEL, timeout:float|None=ADB_TIMEOUT):
+        self.host, self.port, self.timeout = host, port, timeout
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def _open(self, service:str):
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+        try:
+            await self._send(reader, writer, service)
+        except BaseException:
+            writer.close()
+            raise
+        return reader, writer
+
+    async def _send(self, reader, writer, service:str):
+        data = service.encode("utf-8")
+        writer.write(b"%04x" % len(data) + data)
+        await writer.drain()
+        status = await asyncio.wait_for(reader.readexactly(4), self.timeout)
+        if status == b"OKAY":
+            return
+        if status == b"FAIL":
+            raise AdbError(f"adb {service}: {await self._read_block(reader)}")
+        raise AdbError(f"adb {service}: unexpected reply {status!r}")
+
+    async def _read_block(self, reader) -> str:
+        n = int(await asyncio.wait_for(reader.readexactly(4), self.timeout), 16)
+        return (await asyncio.wait_for(reader.readexactly(n), self.timeout)).decode("utf-8", errors="replace")
+
+    async def query(self, service:str) -> str:
+        """One-shot host service with a length-prefixed reply, e.g. host:devices-l."""
+        async with self._slots:
+            reader, writer = await self._open(service)
+            try:
+                return await self._read_block(reader)
+            finally:
+                writer.close()
+
+    async def devices(self) -> list[dict[str,str]]:
+        # "<serial> <state> usb:1-1 product:x model:Pixel_8 device:y transport_id:3"
+        return [_parse_device_line(ln) for ln in (await self.query("host:devices-l")).splitlines() if ln.strip()]
+
+    async def shell(self, serial:str, command:str) -> str:
+        async with self._slots:
+            reader, writer = await self._open(f"host:transport:{serial}")
+            try:
+                await self._send(reader, writer, f"shell:{command}")
+                out = await asyncio.wait_for(reader.read(), self.timeout)
+            finally:
+                writer.close()
+        return out.decode("utf-8", errors="replace")
+
+    async def track_devices(self):
+        """Yield the full device list every time adb reports a change (plug/unplug/state).
+
+        Uses host:track-devices-l, falling back to host:track-devices on older servers.
+        The first list arrives immediately; the connection stays open until cancelled.
+        """
+        async with self._slots:
+            try:
+                reader, writer = await self._open("host:track-devices-l")
+            except AdbError:
+                reader, writer = await self._open("host:track-devices")
+            try:
+                while True:
+                    n = int(await reader.readexactly(4), 16)
+                    body = (await reader.readexactly(n)).decode("utf-8", errors="replace")
+                    yield [_parse_device_line(ln) for ln in body.splitlines() if ln.strip()]
+            finally:
+                writer.close()
+
+
+class DeviceTracker:
+    """Runs AdbClient.track_devices() on a worker thread until stop() is called.
+
+    Reconnects (every `retry` seconds) if the adb server goes away; while connected it
+    only wakes up when adb pushes a change.
+    """
+    def __init__(self, retry:float=3.0):
+        self.retry = retry
+        self._lock = threading.Lock()
+        self._loop = None
+        self._task = None
+        self._stopped = False
+
+    def run(self, progress):
+        # worker thread; progress(list_of_device_dicts) per change
+        async def main():
+            while True:
+                try:
+                    async for devs in AdbClient(timeout=ADB_TIMEOUT).track_devices():
+                        progress(devs)
+                except (OSError, AdbError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    pass
+                await asyncio.sleep(self.retry)
+
+        async def guarded():
+            with self._lock:
+                if self._stopped:
+                    return
+                self._loop, self._task = asyncio.get_running_loop(), asyncio.current_task()
+            await main()
+
+        try:
+            asyncio.run(guarded())
+        except asyncio.CancelledError:
+            pass
+
+    def stop(self):
+        with self._lock:
+            self._stopped = True
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+
+
+def _parse_device_line(ln:str) -> dict[str,str]:
+    # devices-l pads with spaces, plain track-devices separates serial and state with a tab
+    serial, *fields = ln.split()
+    dev = {"serial": serial, "state": fields[0] if fields else ""}
+    for f in fields[1:]:
+        k, sep, v = f.partition(":")
+        if sep:
+            dev[k] = v
+    return dev
+
+
+async def adb_device_info_async(serial:str, client:AdbClient|None=None) -> tuple[str,str]:
+    """(make, model) for a serial from a single shell running every getprop.
+
+    Uses the adb server directly when a client is given and falls back to the adb
+    binary (which also starts the server) if it can't be reached.
+    """
+    script = "; ".join(f"getprop {p}" for p in ADB_PROPS)
+    out = None
+    if client is not None:
+        try:
+            out = await client.shell(serial, script)
+        except AdbError:
+            return "?", serial
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            out = None
+    if out is None:
+        try:
+            code, out, err = await run_async(["adb", "-s", serial, "shell", script],
+                                             timeout=ADB_TIMEOUT, op="adb getprop")
+        except Exception:
+            return "?", serial
+        if code != 0:
+            return "?", serial
+    vals = [ln.strip() for ln in out.splitlines()] + [""] * len(ADB_PROPS)
+    return vals[0] or "?", vals[1] or serial
+
+
+def decorate_devices(serials:list[str], progress, limit:int=ADB_MAX_PARALLEL):
+    """Look up make/model for all serials concurrently, at most `limit` adb calls at a time.
+
+    progress((make, model, serial)) is called as each device completes, not in input order.
+    """
+    async def main():
+        sem = asyncio.Semaphore(limit)
+        client = AdbClient(max_connections=limit)
+
+        async def one(serial:str):
+            async with sem:
+                return (*await adb_device_info_async(serial, client), serial)
+
+        for fut in asyncio.as_completed([one(d) for d in serials]):
+            progress(await fut)
+
+    if serials:
+        asyncio.run(main())
+
+
+# ------------------------- core UAFT driver -------------------------
+# Per-line filters, shared by the streaming UAFT generators and AsyncUAFT.
+def _device_from_line(ln:str) -> str|None:
+    # filter lines that look like device serials
+    ln = ln.strip().lstrip("@")
+    # Heuristic: serial lines have no spaces
+    return ln if ln and " " not in ln and ln.lower() != "devices" else None
+
+
+def _package_from_line(ln:str) -> str|None:
+    ln = ln.strip()
+    return ln if ln and "." in ln else None
+
+
+def _trace_from_line(ln:str) -> str|None:
+    ln = ln.strip()
+    return ln if ln.endswith(".trace") or ln.endswith(".utrace") else None
+
+
+class RemoteEntry:
+    """A file from `ls -l`: path plus size (bytes) and timestamp text when UAFT printed them."""
+    __slots__ = ("path", "size", "stamp", "is_dir")
+
+    def __init__(self, path:str, size:int|None=None, stamp:str|None=None, is_dir:bool=False):
+        self.path, self.size, self.stamp, self.is_dir = path, size, stamp, is_dir
+
+    def __repr__(self):
+        return f"RemoteEntry({self.path!r}, {self.size!r}, {self.stamp!r})"
+
+
+# `ls -l` as toybox prints it on the device: mode, links, owner, group, size, date and
+# time (ISO "2025-01-31 12:34", or "Jan 31 12:34" / "Jan 31  2024"), then the name, which
+# may contain spaces and for symlinks ends in " -> target".
+LS_LONG_LINE = re.compile(
+    r"(?P<mode>[-bcdlps][-rwxsStT]{9}[.+@]?)\s+\d+\s+\S+\s+\S+\s+(?P<size>\d+)\s+"
+    r"(?P<stamp>\d{4}-\d\d-\d\d\s+\d\d:\d\d(?::\d\d(?:\.\d+)?)?(?:\s+[+-]\d{4})?"
+    r"|[A-Z][a-z]{2}\s+\d{1,2}\s+(?:\d\d:\d\d|\d{4}))\s(?P<name>.+)$")
+
+
+def _entry_from_line(ln:str) -> RemoteEntry|None:
+    # A line that isn't in the `ls -l` layout is kept whole as the path with no size or
+    # timestamp, so size checks and the still-growing check are skipped for it rather
+    # than run against a wrong guess.
+    ln = ln.strip()
+    if not ln or re.fullmatch(r"total \d+", ln):
+        return None
+    m = LS_LONG_LINE.match(ln)
+    if m is None:
+        return RemoteEntry(ln)
+    name, mode = m["name"], m["mode"]
+    if mode[0] == "l":
+        name = name.split(" -> ", 1)[0]
+    return RemoteEntry(name, int(m["size"]), " ".join(m["stamp"].split()), is_dir=mode[0] == "d")
+
+
+def _trace_entry_from_line(ln:str) -> RemoteEntry|None:
+    e = _entry_from_line(ln)
+    return e if e is not None and _trace_from_line(e.path) else None
+
+
+def _trace_entries(lines):
+    # `ls -l -R`: bare names belong to the "<dir>:" header above them
+    folder = None
+    for ln in lines:
+        s = ln.strip()
+        if s.endswith(":") and not LS_LONG_LINE.match(s):
+            folder = s[:-1].rstrip("/")
+        elif (e := _trace_entry_from_line(s)) is not None:
+            if folder and not e.path.startswith("^"):
+                e.path = f"{folder}/{e.path}"
+            yield e
+
+
+def _dir_entries(lines, parent:str) -> list[RemoteEntry]:
+    # One level of `ls -l <parent>`. Names may come back bare or as full AFS paths, and
+    # directories are marked by a "d" mode or, in plain listings, a trailing "/".
+    entries:list[RemoteEntry] = []
+    for ln in lines:
+        e = _entry_from_line(ln)
+        if e is None or e.path.endswith(":"):   # `ls -R`-style "<dir>:" headers
+            continue
+        e.is_dir = e.is_dir or e.path.endswith("/")
+        name = e.path.rstrip("/")
+        if not name.startswith("^"):
+            name = f"{parent.rstrip('/')}/{name}"
+        if name.rstrip("/") == parent.rstrip("/"):
+            continue
+        e.path = name
+        entries.append(e)
+    return entries
+
+
+def target_key(conn:tuple) -> str:
+    # "<serial or ip>|<package>" — identifies one app on one device
+    serial, ip, port, pkg, token = conn
+    return f"{serial or ip or ''}|{pkg}"
+
+
+def _filter_lines(lines, pick) -> list[str]:
+    return [x for x in map(pick, lines) if x is not None]
+
+
+# Seconds per UAFT operation. Pulls get extra time for the expected transfer size at
+# PULL_MIN_RATE; a pull of unknown size may take as long as it likes while the file keeps
+# growing. Override any of these with a "timeouts" object in state.json.
+DEFAULT_TIMEOUTS = {"devices": 30.0, "packages": 60.0, "ls": 120.0, "push": 120.0, "pull": 120.0}
+PULL_MIN_RATE = 1 << 20   # bytes/s; a pull or push slower than this counts as hung
+PULL_RETRIES = 2          # extra attempts when a pulled file comes back short
+
+
+class IncompletePull(RuntimeError):
+    """UAFT finished a pull but the file that landed is smaller or larger than listed."""
+    def __init__(self, remote:str, size:int, expected:int):
+        self.remote, self.size, self.expected = remote, size, expected
+        super().__init__(f"got {size} of {expected} bytes")
+
+
+# Pulls land in a per-job hidden folder next to the destination and are renamed into
+# place only once complete, so nothing (Insights, Sync, the watcher, another pull of
+# the same file) ever sees a half-written trace under its real name. Same folder means
+# same filesystem, so the rename is atomic. Folders named after a process id; ones left
+# behind by a crash are swept before the next pull into the same destination.
+PULL_TMP_PREFIX = ".uaft-pull-"
+PULL_TMP_STALE = 3600.0   # seconds without a write before another process's pull folder counts as abandoned
+_pull_tmp_lock = threading.Lock()
+_live_pull_tmps:set[Path] = set()
+
+
+def _pull_tmpdir(local_dir:Path) -> Path:
+    local_dir.mkdir(parents=True, exist_ok=True)
+    sweep_pull_tmpdirs(local_dir)
+    with _pull_tmp_lock:
+        tmp = Path(tempfile.mkdtemp(prefix=f"{PULL_TMP_PREFIX}{os.getpid()}-", dir=local_dir))
+        _live_pull_tmps.add(tmp)
+    return tmp
+
+
+def _drop_pull_tmpdir(tmp:Path):
+    shutil.rmtree(tmp, ignore_errors=True)
+    with _pull_tmp_lock:
+        _live_pull_tmps.discard(tmp)
+
+
+def _last_write(folder:Path) -> float:
+    try:
+        with os.scandir(folder) as it:
+            return max([folder.stat().st_mtime] + [e.stat().st_mtime for e in it])
+    except OSError:
+        return 0.0
+
+
+def sweep_pull_tmpdirs(local_dir:Path, stale:float=PULL_TMP_STALE) -> int:
+    """Delete pull folders in local_dir left behind by a crash or kill; returns how many.
+
+    This process's running pulls are kept. Another process's folder only goes once
+    nothing in it was written for `stale` seconds, since a second instance may be pulling.
+    """
+    me, now, doomed = str(os.getpid()), time.time(), []
+    with _pull_tmp_lock:
+        for d in local_dir.glob(PULL_TMP_PREFIX + "*"):
+            if d in _live_pull_tmps or not d.is_dir():
+                continue
+            pid = d.name[len(PULL_TMP_PREFIX):].partition("-")[0]
+            if pid == me or now - _last_write(d) >= stale:
+                doomed.append(d)
+    for d in doomed:
+        shutil.rmtree(d, ignore_errors=True)
+    return len(doomed)
+
+
+def _commit_pull(tmp:Path, remote_file:str, local_dir:Path, expected_size:int|None, verify:bool) -> Path:
+    name = Path(remote_file).name
+    landed = tmp/name
+    if not landed.is_file():
+        raise RuntimeError(f"UAFT reported success but {name} never arrived")
+    size = landed.stat().st_size
+    if verify and expected_size is not None and size != expected_size:
+        raise IncompletePull(remote_file, size, expected_size)
+    local = local_dir/name
+    os.replace(landed, local)
+    return local
+
+
+class UAFT:
+    def __init__(self, uaft_path:Path, timeouts:dict[str,float]|None=None):
+        self.uaft_path = uaft_path
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        st = uaft_path.stat()
+        # identifies this exact binary in cache keys; a rebuilt UAFT gets a new key
+        self.stamp = (str(uaft_path), st.st_mtime_ns)
+
+    def _base_args(self, serial:str|None, ip:str|None, port:str|None, package:str|None, token:str|None):
+        args = [str(self.uaft_path)]
+        # Prefer serial over IP; if serial is provided, ignore IP to avoid confusing UAFT
+        if serial:
+            args += ["-s", serial]
+        elif ip:
+            args += ["-ip", ip]
+        if port:
+            args += ["-t", port]
+        if package:
+            args += ["-p", package]
+        if token:
+            args += ["-k", token]
+        return args
+
+    # iter_* variants filter UAFT's output as it arrives, so callers can show the
+    # first results before the command finishes; the list methods drain them.
+    def timeout_for(self, op:str, size:int|None=None) -> float:
+        t = self.timeouts[op]
+        if op in ("pull", "push") and size:
+            t += size / PULL_MIN_RATE
+        return t
+
+    @staticmethod
+    def pull_activity(monitor:FileGrowthMonitor, size:int|None):
+        # Without a listed size there is no total to budget for: the pull's timeout then
+        # counts from the last time the landing file grew, so a multi-GB trace pulled from a
+        # path-only listing isn't cut off while data is still arriving.
+        return None if size else monitor.last_growth
+
+    def iter_devices(self):
+        for ln in run_lines([str(self.uaft_path), "devices"], timeout=self.timeout_for("devices"), op="UAFT devices"):   # UAFT prints list
+            if (d := _device_from_line(ln)) is not None:
+                yield d
+
+    def devices(self) -> list[str]:
+        return list(self.iter_devices())
+
+    def _packages_args(self, serial:str|None) -> list[str]:
+        args = [str(self.uaft_path)]
+        if serial:
+            args += ["-s", serial]
+        return args + ["packages"]
+
+    def iter_packages(self, serial:str|None=None):
+        for ln in run_lines(self._packages_args(serial), timeout=self.timeout_for("packages"), op="UAFT packages"):
+            if (p := _package_from_line(ln)) is not None:
+                yield p
+
+    def packages(self, serial:str|None=None) -> list[str]:
+        return list(self.iter_packages(serial))
+
+    def push(self, serial:str|None, ip:str|None, port:str|None, package:str, token:str|None, local_file:str, remote:str, size:int|None=None):
+        # UAFT: push <local> <remote>
+        args = self._base_args(serial, ip, port, package, token) + ["push", local_file, remote]
+        code, out, err = run(args, timeout=self.timeout_for("push", size), op="UAFT push")
+        if code != 0:
+            raise RuntimeError(err or out)
+        return out
+
+    def push_commandfile(self, serial:str|None, ip:str|None, port:str|None, package:str, token:str|None, local_cmd:str):
+        return self.push(serial, ip, port, package, token, local_cmd, "^commandfile")
+
+    def iter_traces(self, serial:str|None, ip:str|None, port:str|None, package:str, token:str|None):
+        # UAFT: ls -R ^saved/Traces
+        args = self._base_args(serial, ip, port, package, token) + ["ls", "-R", "^saved/Traces"]
+        # If folder missing, UAFT returns non-zero; treat as no traces
+        for ln in run_lines(args, check=False, timeout=self.timeout_for("ls"), op="UAFT ls"):
+            if (f := _trace_from_line(ln)) is not None:
+                yield f
+
+    def list_traces(self, serial:str|None, ip:str|None, port:str|None, package:str, token:str|None) -> list[str]:
+        return list(self.iter_traces(serial, ip, port, package, token))
+
+    def iter_trace_entries(self, serial:str|None, ip:str|None, port:str|None, package:str, token:str|None, path:str="^saved/Traces"):
+        # UAFT: ls -l -R <path>; yields RemoteEntry with size/timestamp for change detection
+        args = self._base_args(serial, ip, port, package, token) + ["ls", "-l", "-R", path]
+        yield from _trace_entries(run_lines(args, check=False, timeout=self.timeout_for("ls"), op="UAFT ls"))
+
+    def list_dir(self, serial:str|None, ip:str|None, port:str|None, package:str, token:str|None, path:str) -> list[RemoteEntry]:
+        # UAFT: ls -l <path>; one level only, directories flagged with is_dir
+        args = self._base_args(serial, ip, port, package, token) + ["ls", "-l", path]
+        code, out, err = run(args, timeout=self.timeout_for("ls"), op="UAFT ls")
+        if code != 0:
+            raise RuntimeError((err or out).strip() or f"Can't list {path}")
+        return _dir_entries(out.splitlines(), path)
+
+    def pull_trace(self, serial:str|None, ip:str|None, port:str|None, package:str, token:str|None, remote_file:str, local_dir:Path, expected_size:int|None=None, progress=None, verify:bool=False) -> Path:
+        # progress: optional callable receiving TransferProgress while the file lands
+        # verify: raise IncompletePull (and keep the old local copy) if the size isn't expected_size
+        tmp = _pull_tmpdir(local_dir)
+        try:
+            args = self._base_args(serial, ip, port, package, token) + ["pull", remote_file, str(tmp)]
+            with FileGrowthMonitor(tmp/Path(remote_file).name, progress, expected_size) as monitor:
+                code, out, err = run(args, timeout=self.timeout_for("pull", expected_size), op="UAFT pull",
+                                     activity=self.pull_activity(monitor, expected_size))
+            if code != 0:
+                raise RuntimeError(err or out)
+            return _commit_pull(tmp, remote_file, local_dir, expected_size, verify)
+        finally:
+            _drop_pull_tmpdir(tmp)
+
+
+class AsyncUAFT:
+    """The UAFT operations as coroutines built on run_async(), for one UAFT driver.
+
+    Wraps rather than extends UAFT, so it can't be passed where the blocking driver is
+    expected. Calls use the driver's per-operation timeouts (or `timeout` for every call
+    when given); the child is killed when it expires or when the awaiting task is
+    cancelled, e.g.:
+
+        asyncio.gather(*(AsyncUAFT(uaft).packages(s) for s in serials))
+    """
+    def __init__(self, uaft:UAFT, timeout:float|None=None):
+        self.uaft = uaft
+        self.timeout = timeout
+
+    async def _run(self, args:list[str], op:str, size:int|None=None, activity=None) -> tuple[int,str,str]:
+        return await run_async(args, timeout=self.timeout or self.uaft.timeout_for(op, size), op=f"UAFT {op}",
+                               activity=activity)
+
+    async def devices(self) -> list[str]:
+        code, out, err = await self._run([str(self.uaft.uaft_path), "devices"], "devices")
+        if code != 0:
+            raise RuntimeError(err or out)
+        return _filter_lines(out.splitlines(), _device_from_line)
+
+    async def packages(self, serial:str|None=None) -> list[str]:
+        code, out, err = await self._run(self.uaft._packages_args(serial), "packages")
+        if code != 0:
+            raise RuntimeError(err or out)
+        return _filter_lines(out.splitlines(), _package_from_line)
+
+    async def push(self, serial:str|None, ip:str|None, port:str|None, package:str, token:str|None, local_file:str, remote:str, size:int|None=None):
+        args = self.uaft._base_args(serial, ip, port, package, token) + ["push", local_file, remote]
+        code, out, err = await self._run(args, "push", size)
+        if code != 0:
+            raise RuntimeError(err or out)
+        return out
+
+    async def push_commandfile(self, serial:str|None, ip:str|None, port:str|None, package:str, token:str|None, local_cmd:str):
+        return await self.push(serial, ip, port, package, token, local_cmd, "^commandfile")
+
+    async def list_traces(self, serial:str|None, ip:str|None, port:str|None, package:str, token:str|None) -> list[str]:
+        args = self.uaft._base_args(serial, ip, port, package, token) + ["ls", "-R", "^saved/Traces"]
+        code, out, err = await self._run(args, "ls")
+        if code != 0:
+            return []
+        return _filter_lines(out.splitlines(), _trace_from_line)
+
+    async def list_dir(self, serial:str|None, ip:str|None, port:str|None, package:str, token:str|None, path:str) -> list[RemoteEntry]:
+        args = self.uaft._base_args(serial, ip, port, package, token) + ["ls", "-l", path]
+        code, out, err = await self._run(args, "ls")
+        if code != 0:
+            raise RuntimeError((err or out).strip() or f"Can't list {path}")
+        return _dir_entries(out.splitlines(), path)
+
+    async def pull_trace(self, serial:str|None, ip:str|None, port:str|None, package:str, token:str|None, remote_file:str, local_dir:Path, expected_size:int|None=None, progress=None, verify:bool=False) -> Path:
+        # same contract as UAFT.pull_trace; progress is called from a helper thread
+        tmp = _pull_tmpdir(local_dir)
+        try:
+            args = self.uaft._base_args(serial, ip, port, package, token) + ["pull", remote_file, str(tmp)]
+            with FileGrowthMonitor(tmp/Path(remote_file).name, progress, expected_size) as monitor:
+                code, out, err = await self._run(args, "pull", expected_size, UAFT.pull_activity(monitor, expected_size))
+            if code != 0:
+                raise RuntimeError(err or out)
+            return _commit_pull(tmp, remote_file, local_dir, expected_size, verify)
+        finally:
+            _drop_pull_tmpdir(tmp)
+
+# ------------------------- transfers -------------------------
+class Transfer:
+    """One queued pull: where from (UAFT connection args), what, and where to."""
+    _ids = iter(range(1, 1 << 62))
+
+    def __init__(self, conn:tuple, remote:str, dest:Path, size:int|None=None, stamp:str|None=None):
+        self.id = next(Transfer._ids)
+        self.conn = conn              # (serial, ip, port, package, token)
+        self.remote = remote
+        self.dest = dest
+        self.size = size              # from `ls -l`, when known
+        self.stamp = stamp
+        self.attempts = 1
+
+    @property
+    def device(self) -> str:
+        serial, ip = self.conn[0], self.conn[1]
+        return serial or ip or ""
+
+    @property
+    def key(self) -> tuple[str,str,str]:
+        return target_key(self.conn), self.remote, str(self.dest)
+
+
+class TransferQueue:
+    """FIFO scheduler with a global and a per-device concurrency limit.
+
+    `launch(transfer)` must start the work asynchronously and call finished(transfer)
+    when it ends, from any thread. A queued transfer whose device is already at its
+    limit is skipped over, so one busy phone doesn't stall pulls from the others.
+    """
+    def __init__(self, launch, max_total:int=4, max_per_device:int=2):
+        self._launch = launch
+        self.max_total, self.max_per_device = max_total, max_per_device
+        self._lock = threading.Lock()
+        self._pending:list[Transfer] = []
+        self._active:dict[str,int] = {}
+
+    def submit(self, transfers:list[Transfer]):
+        with self._lock:
+            self._pending.extend(transfers)
+        self._pump()
+
+    def set_limits(self, max_total:int, max_per_device:int):
+        with self._lock:
+            self.max_total, self.max_per_device = max_total, max_per_device
+        self._pump()
+
+    def finished(self, t:Transfer):
+        with self._lock:
+            self._active[t.device] -= 1
+            if not self._active[t.device]:
+                del self._active[t.device]
+        self._pump()
+
+    @property
+    def busy(self) -> bool:
+        with self._lock:
+            return bool(self._pending or self._active)
+
+    def counts(self) -> tuple[int,int]:
+        """(running, waiting)"""
+        with self._lock:
+            return sum(self._active.values()), len(self._pending)
+
+    def _pump(self):
+        starting = []
+        with self._lock:
+            running = sum(self._active.values())
+            for t in list(self._pending):
+                if running >= self.max_total:
+                    break
+                if self._active.get(t.device, 0) >= self.max_per_device:
+                    continue
+                self._pending.remove(t)
+                self._active[t.device] = self._active.get(t.device, 0) + 1
+                running += 1
+                starting.append(t)
+        for t in starting:
+            self._launch(t)
+
+STABLE_AFTER = 3.0   # seconds a trace's size/timestamp must stay unchanged before it is pulled
+STABLE_POLL = 2.0    # seconds between listings while pulls wait for traces to settle
+
+
+class StabilityTracker:
+    """Tells from successive `ls -l` listings whether a trace is still being written.
+
+    state() is "stable" once a file's (size, timestamp) has been seen unchanged in two
+    listings at least `settle` seconds apart, "growing" if it changed between listings,
+    and "new" before there is enough history. Listings without size or timestamp can't
+    show growth, so those files count as stable.
+    """
+    def __init__(self, settle:float=STABLE_AFTER):
+        self.settle = settle
+        self._lock = threading.Lock()
+        self._seen:dict[tuple[str,str],tuple[tuple,float,float,bool]] = {}   # -> (sig, since, last_seen, changed)
+
+    def observe(self, target:str, entries):
+        now = time.monotonic()
+        with self._lock:
+            for e in entries:
+                key, sig = (target, e.path), (e.size, e.stamp)
+                prev = self._seen.get(key)
+                if prev is None:
+                    self._seen[key] = (sig, now, now, False)
+                elif prev[0] == sig:
+                    self._seen[key] = (sig, prev[1], now, prev[3])
+                else:
+                    self._seen[key] = (sig, now, now, True)
+
+    def state(self, target:str, path:str) -> str:
+        with self._lock:
+            seen = self._seen.get((target, path))
+        if seen is None:
+            return "new"
+        sig, since, last_seen, changed = seen
+        if sig == (None, None):
+            return "stable"
+        if last_seen - since >= self.settle:
+            return "stable"
+        return "growing" if changed else "new"
+
+
+WATCH_MIN_INTERVAL = 2.0    # seconds between listings while traces are appearing or growing
+WATCH_MAX_INTERVAL = 30.0   # backoff ceiling while nothing changes
+
+
+class TraceWatcher:
+    """Polls one target's ^saved/Traces and reports traces once they stop growing.
+
+    Runs on a worker until stop(). The interval doubles (up to max_interval) while the
+    listing doesn't change and drops back to min_interval as soon as a trace appears or
+    grows, so an idle device costs one `ls` every half minute. progress() receives
+    ("ready", [RemoteEntry]) for finished traces not yet in the manifest, or
+    ("error", exception) when a listing fails (the watcher keeps going). Each trace is
+    reported once; call forget() when its pull fails so the next listing offers it again.
+    """
+    def __init__(self, uaft:"UAFT", conn:tuple, stability:StabilityTracker, manifest:"TraceManifest",
+                 min_interval:float=WATCH_MIN_INTERVAL, max_interval:float=WATCH_MAX_INTERVAL):
+        self.uaft, self.conn, self.stability, self.manifest = uaft, conn, stability, manifest
+        self.min_interval, self.max_interval = min_interval, max_interval
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._announced:set[tuple] = set()   # (path, size, stamp) already reported
+
+    def stop(self):
+        self._stop.set()
+
+    def forget(self, path:str):
+        with self._lock:
+            self._announced = {a for a in self._announced if a[0] != path}
+
+    def run(self, progress):
+        key = target_key(self.conn)
+        last_sigs = None
+        interval = self.min_interval
+        while not self._stop.is_set():
+            try:
+                entries = list(self.uaft.iter_trace_entries(*self.conn))
+            except Exception as e:
+                progress(("error", e))
+                interval = self.max_interval
+            else:
+                self.stability.observe(key, entries)
+                sigs = {(e.path, e.size, e.stamp) for e in entries}
+                with self._lock:
+                    ready = [e for e in entries
+                             if (e.path, e.size, e.stamp) not in self._announced
+                             and self.stability.state(key, e.path) == "stable"
+                             and not self.manifest.is_current(key, e)]
+                    self._announced.update((e.path, e.size, e.stamp) for e in ready)
+                if ready:
+                    progress(("ready", ready))
+                settling = any(self.stability.state(key, e.path) != "stable" for e in entries)
+                if sigs != last_sigs or settling:
+                    interval = self.min_interval
+                else:
+                    interval = min(interval * 2, self.max_interval)
+                last_sigs = sigs
+            self._stop.wait(interval)
+
+
+class TraceManifest(JsonFile):
+    """Record of traces already pulled into a folder, kept there as .uaft-manifest.json.
+
+    targets["<serial>|<package>"][remote path] = {"size", "stamp", "local", "pulled_at"}, plus
+    "hash" (see file_digest) and "info" (read_utrace_info) once the pull has been processed.
+    stats[local name] = {"size", "mtime_ns", "version", "stats"} caches utrace_stats() per
+    local file, for the UTRACE_STATS_VERSION it was computed with.
+    A remote file whose size and timestamp still match its record (and whose local copy
+    is still there) doesn't need pulling again.
+    """
+    FILE = ".uaft-manifest.json"
+
+    def __init__(self, folder:Path):
+        super().__init__(folder/self.FILE)
+
+    def empty(self) -> dict:
+        return {**super().empty(), "targets": {}}
+
+    def entry(self, target:str, remote:str) -> dict|None:
+        with self._lock:
+            return self.data["targets"].get(target, {}).get(remote)
+
+    def is_current(self, target:str, e:RemoteEntry) -> bool:
+        rec = self.entry(target, e.path)
+        if rec is None:
+            return False
+        local = self.path.parent/rec["local"]
+        if not local.is_file() or (rec.get("size") is not None and local.stat().st_size != rec["size"]):
+            return False
+        if e.size is not None and rec.get("size") != e.size:
+            return False
+        # pulls made without a listing have no timestamp; size is all we can compare
+        return rec.get("stamp") is None or e.stamp is None or rec["stamp"] == e.stamp
+
+    def record(self, target:str, remote:str, local:Path, size:int|None=None, stamp:str|None=None, **extra):
+        with self._lock:
+            rec = {"size": size if size is not None else local.stat().st_size, "stamp": stamp,
+                   "local": local.name, "pulled_at": datetime.now().isoformat(timespec="seconds"), **extra}
+            self.data["targets"].setdefault(target, {})[remote] = rec
+        self.save()
+
+    def stats(self, local:Path) -> dict|None:
+        """Cached utrace_stats() for a file in this folder, if it hasn't changed since."""
+        st = local.stat()
+        with self._lock:
+            rec = self.data.get("stats", {}).get(local.name)
+        if (rec and rec["size"] == st.st_size and rec["mtime_ns"] == st.st_mtime_ns
+                and rec.get("version") == UTRACE_STATS_VERSION):
+            return rec["stats"]
+        return None
+
+    def record_stats(self, local:Path, stats:dict):
+        st = local.stat()
+        with self._lock:
+            self.data.setdefault("stats", {})[local.name] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                                                       "version": UTRACE_STATS_VERSION, "stats": stats}
+        self.save()
+
+# ------------------------- trace store -------------------------
+def _link_into_place(src:Path, dest:Path) -> str:
+    # Point dest at src's content: a hardlink where the filesystem allows it, else a relative
+    # symlink. Built under a temp name and swapped in with os.replace, so dest never vanishes.
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.link")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+        kind = "hardlink"
+    except OSError:
+        os.symlink(os.path.relpath(src, dest.parent), tmp)
+        kind = "symlink"
+    try:
+        os.replace(tmp, dest)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+    return kind
+
+
+def _same_file(a:Path, b:Path) -> bool:
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def _link_count(p:Path) -> int:
+    try:
+        return p.stat().st_nlink
+    except OSError:
+        return 0
+
+
+class TraceStore(JsonFile):
+    """Content-addressed copies of the traces in a pull folder, kept in <folder>/.uaft-store.
+
+    objects/<algo>/<ab>/<rest of hash> holds each distinct content once; the files in the
+    pull folder are hardlinks to those blobs (symlinks where hardlinks aren't supported),
+    so the same capture pulled twice, or from two packages, costs its disk space once.
+    index.json maps hash -> {"size", "names", "added_at"}, names relative to the folder.
+    Deleting a trace from the folder leaves its blob with only the store's own link;
+    prune() (run on load and after each adopt) drops such blobs and the stale names. With
+    symlinks the blob is the only copy, so one that a symlink in the folder still resolves
+    to (e.g. a renamed trace) is kept and indexed under that name instead.
+    """
+    DIR = ".uaft-store"
+
+    def __init__(self, folder:Path):
+        self.folder = folder
+        self.root = folder/self.DIR
+        super().__init__(self.root/"index.json")
+        self._writing = threading.Lock()   # adopt() and prune() never interleave
+        self._by_name = {n: h for h, rec in self.data["objects"].items() for n in rec["names"]}
+        try:
+            self.prune()
+        except OSError:
+            pass
+
+    def empty(self) -> dict:
+        return {**super().empty(), "objects": {}}
+
+    def blob_path(self, digest:str) -> Path:
+        algo, _, hexdigest = digest.partition(":")
+        return self.root/"objects"/algo/hexdigest[:2]/hexdigest[2:]
+
+    def lookup(self, digest:str) -> Path|None:
+        """The stored blob for a hash, if there is one."""
+        with self._lock:
+            known = digest in self.data["objects"]
+        blob = self.blob_path(digest)
+        return blob if known and blob.is_file() else None
+
+    def digest_of(self, local:Path) -> str|None:
+        """Hash of a file in the folder, without reading it, while it is still linked to its blob."""
+        with self._lock:
+            digest = self._by_name.get(local.relative_to(self.folder).as_posix())
+        blob = self.lookup(digest) if digest else None
+        try:
+            return digest if blob is not None and os.path.samefile(blob, local) else None
+        except OSError:
+            return None
+
+    def adopt(self, local:Path, digest:str) -> bool:
+        """Back a freshly pulled file in the folder by its blob; True if that content was already stored.
+
+        Raises OSError if the filesystem supports neither hardlinks nor symlinks; `local`
+        is left as a plain file then.
+        """
+        blob = self.blob_path(digest)
+        with self._writing:
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            duplicate = False
+            try:
+                os.link(local, blob)   # usual case: the pulled file just gets a second name
+            except FileExistsError:
+                duplicate = not os.path.samefile(blob, local)
+                if duplicate:
+                    _link_into_place(blob, local)   # drops the new copy
+            except OSError:
+                os.replace(local, blob)   # no hardlinks (e.g. exFAT): keep the content in the store
+                try:
+                    _link_into_place(blob, local)
+                except OSError:
+                    os.replace(blob, local)
+                    raise
+            self._add_name(local.relative_to(self.folder).as_posix(), digest, blob.stat().st_size)
+        try:
+            self.prune()   # the pull may have replaced a file that was the last link to older content
+        except OSError:
+            pass
+        return duplicate
+
+    def prune(self) -> int:
+        """Forget names whose file was deleted or now holds other content, and delete the
+        blobs nothing in the folder points at any more; returns the bytes freed."""
+        doomed:list[Path] = []
+        linked = None
+        with self._writing:
+            with self._lock:
+                objects = self.data["objects"]
+                changed = False
+                for digest, rec in list(objects.items()):
+                    blob = self.blob_path(digest)
+                    names = [n for n in rec["names"] if _same_file(blob, self.folder/n)]
+                    # no names left and no other hardlink (a renamed copy still counts)
+                    if not names and _link_count(blob) <= 1:
+                        if linked is None:
+                            linked = self._symlinked_blobs()
+                        names = linked.get(blob, [])   # a renamed symlink: the blob is the only copy
+                        if not names:
+                            del objects[digest]
+                            doomed.append(blob)
+                            changed = True
+                            continue
+                    if names != rec["names"]:
+                        rec["names"], changed = names, True
+                if changed:
+                    self._by_name = {n: h for h, rec in objects.items() for n in rec["names"]}
+                known = {self.blob_path(h) for h in objects}
+            # blobs the index never recorded, e.g. after a crash between link and index write
+            orphans = [b for b in (self.root/"objects").glob("*/*/*")
+                       if b not in known and b.is_file() and _link_count(b) == 1]
+            if orphans and linked is None:
+                linked = self._symlinked_blobs()
+            doomed += [b for b in orphans if b not in linked]
+            freed = 0
+            for blob in doomed:
+                try:
+                    size = blob.stat().st_size
+                    blob.unlink()
+                    freed += size
+                except OSError:
+                    pass
+            if changed:
+                self.save()
+        return freed
+
+    def _symlinked_blobs(self) -> dict[Path,list[str]]:
+        # blob -> names of the symlinks in the folder that resolve to it (the fallback where
+        # hardlinks aren't supported); the store dir itself is skipped
+        store = self.root.resolve()
+        linked:dict[Path,list[str]] = {}
+        for root, dirs, files in os.walk(self.folder):
+            if Path(root) == self.folder:
+                dirs[:] = [d for d in dirs if d != self.DIR]
+            for name in files:
+                p = Path(root)/name
+                if not p.is_symlink():
+                    continue
+                try:
+                    target = p.resolve(strict=True)
+                except (OSError, RuntimeError):
+                    continue   # dangling or looping link
+                if target.is_relative_to(store):
+                    linked.setdefault(self.root/target.relative_to(store), []).append(p.relative_to(self.folder).as_posix())
+        return linked
+
+    def _add_name(self, name:str, digest:str, size:int):
+        with self._lock:
+            objects = self.data["objects"]
+            old = self._by_name.get(name)
+            if old is not None and old != digest and old in objects:
+                # the name now shows other content; prune() drops the old blob once nothing shows it
+                objects[old]["names"].remove(name)
+            rec = objects.setdefault(digest, {"size": size, "names": [], "added_at": datetime.now().isoformat(timespec="seconds")})
+            if name not in rec["names"]:
+                rec["names"].append(name)
+            self._by_name[name] = digest
+        self.save()
+
+# ------------------------- .utrace files -------------------------
+# Layout written by UE's TraceLog file transport: a 4-byte magic ("TRC2" with a metadata
+# block, or the older "TRCE"; stored little-endian, so the bytes read "2CRT"/"ECRT"),
+# then for TRC2 a uint16 metadata size followed by fields of [uint8 size, uint8 id, value],
+# then uint8 transport and uint8 protocol versions. For the packet transports the rest is
+# packets of uint16 PacketSize (header included) and uint16 ThreadId; with 0x8000 set in
+# ThreadId the packet is followed by uint16 DecodedSize and an LZ4 block.
+UTRACE_MAGICS = {b"2CRT": "TRC2", b"TRC2": "TRC2", b"ECRT": "TRCE", b"TRCE": "TRCE"}
+UTRACE_METADATA_FIELDS = {0: "control_port"}
+UTRACE_PACKET_TRANSPORTS = (2, 3, 4)   # Packet, TidPacket, TidPacketSync
+UTRACE_ENCODED = 0x8000
+UTRACE_TID_MASK = 0x3fff
+UTRACE_HEADER_SCAN = 4 << 20    # bytes of packets read for session info
+UTRACE_INTERNAL_TIDS = 4        # thread ids below this carry the trace's own streams (event definitions etc.)
+# NewEvent field type info: category bits, then flags and log2 of the element size
+UTRACE_FIELD_FLOAT = 0o100
+UTRACE_FIELD_ARRAY = 0o200      # variable length, sent as aux data after the fixed part
+UTRACE_FIELD_SIGNED = 0o020
+UTRACE_FIELD_STRING = 0o010     # array of 8-bit (AnsiString) or 16-bit (WideString) chars
+UTRACE_FIELD_SIZE = 0o003
+UTRACE_NAME = re.compile(rb"[A-Za-z_$][\w$]*")
+# Diagnostics.Session2 field -> info key
+SESSION2_FIELDS = {"Platform": "platform", "AppName": "app_name", "ProjectName": "project_name",
+                   "CommandLine": "command_line", "Branch": "branch", "BuildVersion": "build_version",
+                   "Changelist": "changelist", "ConfigurationType": "build_config", "TargetType": "target_type"}
+BUILD_CONFIGS = ("Unknown", "Debug", "DebugGame", "Development", "Shipping", "Test")   # EBuildConfiguration
+TARGET_TYPES = ("Unknown", "Game", "Server", "Client", "Editor", "Program")           # EBuildTargetType
+
+
+def lz4_block_decode(src, size:int) -> bytes:
+    """Decode one raw LZ4 block (no frame header) of known decoded size."""
+    if lz4_block is not None:
+        return lz4_block.decompress(bytes(src), uncompressed_size=size)
+    out = bytearray()
+    i, n = 0, len(src)
+    while i < n:
+        token = src[i]; i += 1
+        lit = token >> 4
+        if lit == 15:
+            while True:
+                b = src[i]; i += 1; lit += b
+                if b != 255:
+                    break
+        out += src[i:i + lit]; i += lit
+        if i >= n:
+            break
+        off = src[i] | (src[i + 1] << 8); i += 2
+        mlen = (token & 15) + 4
+        if token & 15 == 15:
+            while True:
+                b = src[i]; i += 1; mlen += b
+                if b != 255:
+                    break
+        if not 0 < off <= len(out):
+            raise ValueError(f"LZ4 match offset {off} outside the {len(out)} bytes decoded so far")
+        start = len(out) - off
+        if off >= mlen:
+            out += out[start:start + mlen]
+        else:   # overlapping match repeats the last `off` bytes: copy what's there, doubling each time
+            while mlen:
+                chunk = out[start:start + min(mlen, len(out) - start)]
+                out += chunk
+                mlen -= len(chunk)
+    if len(out) != size:
+        raise ValueError(f"LZ4 block decoded to {len(out)} bytes, expected {size}")
+    return bytes(out)
+
+
+def utrace_header(mm) -> tuple[dict,int]:
+    """(header fields, offset of the first packet) from the start of a .utrace buffer."""
+    magic = UTRACE_MAGICS.get(bytes(mm[:4]))
+    if magic is None:
+        raise ValueError("not a .utrace file (unknown magic)")
+    try:
+        return _utrace_header(mm, magic)
+    except (struct.error, IndexError) as e:
+        raise ValueError("truncated .utrace header") from e
+
+
+def _utrace_header(mm, magic:str) -> tuple[dict,int]:
+    info:dict = {"magic": magic, "metadata": {}}
+    pos = 4
+    if magic == "TRC2":
+        (meta_size,) = struct.unpack_from("<H", mm, pos)
+        pos += 2
+        end = pos + meta_size
+        while pos + 2 <= end:
+            size, fid = mm[pos], mm[pos + 1]
+            value = bytes(mm[pos + 2:pos + 2 + size])
+            name = UTRACE_METADATA_FIELDS.get(fid, f"field_{fid}")
+            info["metadata"][name] = int.from_bytes(value, "little") if size in (1, 2, 4, 8) else value.hex()
+            pos += 2 + size
+        pos = end
+    info["transport"], info["protocol"] = mm[pos], mm[pos + 1]
+    return info, pos + 2
+
+
+def utrace_packets(mm, pos:int, limit:int|None=None):
+    """Yields (thread id, encoded, payload view, decoded size) per packet, zero-copy."""
+    end = len(mm) if limit is None else min(len(mm), pos + limit)
+    while pos + 4 <= end:
+        size, tid = struct.unpack_from("<HH", mm, pos)
+        if size < 4 or pos + size > len(mm):
+            return   # torn tail of a capture that was cut off
+        if tid & UTRACE_ENCODED:
+            (decoded,) = struct.unpack_from("<H", mm, pos + 4)
+            yield tid & UTRACE_TID_MASK, True, mm[pos + 6:pos + size], decoded
+        else:
+            yield tid & UTRACE_TID_MASK, False, mm[pos + 4:pos + size], size - 4
+        pos += size
+
+
+class UtraceEventType:
+    """An event type declared by a NewEvent record; fields are (name, offset, size, type info)."""
+    __slots__ = ("uid", "logger", "name", "flags", "fields")
+
+    def __init__(self, uid:int, logger:str, name:str, flags:int, fields:list[tuple[str,int,int,int]]):
+        self.uid, self.logger, self.name, self.flags, self.fields = uid, logger, name, flags, fields
+
+    @property
+    def fixed_size(self) -> int:
+        return max((off + size for _name, off, size, ti in self.fields if not ti & UTRACE_FIELD_ARRAY), default=0)
+
+
+class UtraceProtocol:
+    """The encodings that change with the trace protocol version.
+
+    Aux data is a uint32 of aux_data uid byte, 5-bit field index at bit 8 and 19-bit size
+    at bit 13, then the data; an aux_terminal uid byte ends an event's aux blocks.
+    scope_uids maps the well-known uids of thread streams to (name, payload bytes).
+    """
+    __slots__ = ("version", "aux_data", "aux_terminal", "scope_uids")
+
+    def __init__(self, version:int, aux_data:int, aux_terminal:int, scope_uids:dict[int,tuple[str,int]]):
+        self.version, self.aux_data, self.aux_terminal, self.scope_uids = version, aux_data, aux_terminal, scope_uids
+
+
+# versions whose layout is known; others are refused rather than misread. The _T scope
+# variants carry a timestamp.
+UTRACE_PROTOCOLS = {
+    5: UtraceProtocol(5, 1 << 1, 2 << 1, {3: ("$Trace.EnterScope", 0), 4: ("$Trace.LeaveScope", 0),
+                                          5: ("$Trace.EnterScope", 7), 6: ("$Trace.LeaveScope", 7)}),
+}
+
+
+def utrace_protocol(info:dict) -> UtraceProtocol:
+    """The UtraceProtocol for a utrace_header() result; ValueError for unsupported versions."""
+    proto = UTRACE_PROTOCOLS.get(info["protocol"])
+    if proto is None:
+        raise ValueError(f"unsupported .utrace protocol version {info['protocol']}")
+    return proto
+
+
+def _parse_new_event(rec) -> UtraceEventType|None:
+    # NewEvent payload: uint16 EventUid, uint8 FieldCount, uint8 Flags, uint8 LoggerNameSize,
+    # uint8 EventNameSize, FieldCount x (uint16 Offset, uint16 Size, uint8 TypeInfo,
+    # uint8 NameSize), then the logger, event and field names back to back. None unless
+    # all of that adds up.
+    if len(rec) < 6:
+        return None
+    uid, count, flags, logger_len, event_len = struct.unpack_from("<HBBBB", rec)
+    names_at = 6 + 6 * count
+    if names_at > len(rec) or not logger_len or not event_len:
+        return None
+    descs = [struct.unpack_from("<HHBB", rec, 6 + 6 * i) for i in range(count)]
+    if names_at + logger_len + event_len + sum(d[3] for d in descs) != len(rec):
+        return None
+    names, p = [], names_at
+    for size in (logger_len, event_len, *(d[3] for d in descs)):
+        name = bytes(rec[p:p + size])
+        if not UTRACE_NAME.fullmatch(name):
+            return None
+        names.append(name.decode("ascii"))
+        p += size
+    fields = [(name, off, size, ti) for name, (off, size, ti, _n) in zip(names[2:], descs)]
+    return UtraceEventType(uid, names[0], names[1], flags, fields)
+
+
+def _new_events(buf:bytes) -> list[UtraceEventType]:
+    # NewEvent records are framed as important events, uint16 Uid (0 = NewEvent) and uint16
+    # Size; scanned for rather than walked, so a cut-off early buffer still yields the rest.
+    found, p, n = [], 0, len(buf)
+    while True:
+        p = buf.find(b"\x00\x00", p)
+        if p < 0 or p + 10 > n:
+            return found
+        size = buf[p + 2] | (buf[p + 3] << 8)
+        t = _parse_new_event(buf[p + 4:p + 4 + size]) if p + 4 + size <= n else None
+        if t is None:
+            p += 1
+            continue
+        found.append(t)
+        p += 4 + size
+
+
+def _aux_blocks(proto:UtraceProtocol, buf, p:int, end:int, keep:bool=True) -> tuple[dict[int,bytes],int,bool]|None:
+    # Aux blocks from p: ({field index: data}, offset after them, whether the terminal was
+    # reached). Stops short at `end` when the data runs out; None if the bytes aren't aux
+    # blocks. With keep=False the data is only skipped.
+    blocks:dict[int,bytes] = {}
+    while p < end:
+        if buf[p] == proto.aux_terminal:
+            return blocks, p + 1, True
+        if buf[p] != proto.aux_data:
+            return None
+        if p + 4 > end:
+            break
+        (pack,) = struct.unpack_from("<I", buf, p)
+        index, size = (pack >> 8) & 0x1f, pack >> 13
+        if p + 4 + size > end:
+            break
+        if keep:
+            blocks[index] = blocks.get(index, b"") + bytes(buf[p + 4:p + 4 + size])
+        p += 4 + size
+    return blocks, p, False
+
+
+def _field_values(t:UtraceEventType, fixed, blocks:dict[int,bytes]) -> dict:
+    # aux blocks are keyed by the field's index in the definition
+    values = {}
+    for i, (name, off, size, ti) in enumerate(t.fields):
+        if ti & UTRACE_FIELD_ARRAY:
+            if i in blocks:
+                values[name] = (blocks[i].decode("utf-16-le" if ti & UTRACE_FIELD_SIZE else "latin-1", "replace")
+                                if ti & UTRACE_FIELD_STRING else blocks[i])
+        elif ti & UTRACE_FIELD_FLOAT and size in (4, 8):
+            values[name] = struct.unpack_from("<f" if size == 4 else "<d", fixed, off)[0]
+        else:
+            values[name] = int.from_bytes(fixed[off:off + size], "little", signed=bool(ti & UTRACE_FIELD_SIGNED))
+    return values
+
+
+def _important_values(proto:UtraceProtocol, t:UtraceEventType, buf, p:int, end:int) -> dict|None:
+    # Field values of the important event in buf[p:end] (past its Uid/Size header); the
+    # fixed part and aux blocks must fill it exactly.
+    fixed_end = p + t.fixed_size
+    if fixed_end > end:
+        return None
+    blocks:dict[int,bytes] = {}
+    if fixed_end < end:
+        run = _aux_blocks(proto, buf, fixed_end, end)
+        if run is None or run[1] != end:
+            return None
+        blocks = run[0]
+    return _field_values(t, buf[p:fixed_end], blocks)
+
+
+def _session_fields(proto:UtraceProtocol, buf:bytes) -> dict:
+    # Diagnostics.Session2 is an important event laid out by its own NewEvent definition,
+    # which older engines declare without some of the fields (ProjectName, TargetType).
+    t = next((t for t in _new_events(buf) if (t.logger, t.name) == ("Diagnostics", "Session2")), None)
+    if t is None:
+        return {}
+    tag, p = struct.pack("<H", t.uid), 0
+    while True:
+        p = buf.find(tag, p)
+        if p < 0 or p + 4 > len(buf):
+            return {}
+        (size,) = struct.unpack_from("<H", buf, p + 2)
+        values = _important_values(proto, t, buf, p + 4, p + 4 + size) if p + 4 + size <= len(buf) else None
+        if values and any(isinstance(v, str) for v in values.values()):
+            break
+        p += 1
+    info = {}
+    enums = {"build_config": BUILD_CONFIGS, "target_type": TARGET_TYPES}
+    for field, key in SESSION2_FIELDS.items():
+        value = values.get(field)
+        if key in enums:
+            value = enums[key][value] if isinstance(value, int) and 0 < value < len(enums[key]) else None
+        if value:
+            info[key] = value
+    if "build_config" not in info:   # Unknown: builds often still name it
+        for text in (info.get("build_version", ""), info.get("command_line", "")):
+            config = next((c for c in BUILD_CONFIGS[1:] if re.search(rf"\b{c}\b", text)), None)
+            if config:
+                info["build_config"] = config
+                break
+    return info
+
+
+def _early_bytes(view:memoryview, transport:int, pos:int, scan:int) -> bytes:
+    # Slices of the mapping must all be gone before it can close, so they stay local here.
+    # Each thread's packets form one stream, so they're joined per thread, internal ones first.
+    if transport not in UTRACE_PACKET_TRANSPORTS:
+        return bytes(view[pos:pos + scan])   # raw transport: events follow directly
+    streams:dict[int,list[bytes]] = {}
+    for tid, encoded, payload, decoded in utrace_packets(view, pos, scan):
+        try:
+            streams.setdefault(tid, []).append(lz4_block_decode(payload, decoded) if encoded else bytes(payload))
+        except (ValueError, IndexError):
+            continue   # undecodable packet: skip it
+    return b"".join(b"".join(streams[tid]) for tid in sorted(streams))
+
+
+def read_utrace_info(path:Path, scan:int=UTRACE_HEADER_SCAN) -> dict:
+    """Header and session info of a .utrace without reading the rest of the file.
+
+    The file is memory-mapped and only the header plus the first `scan` bytes of packets
+    are touched. Keys: magic, metadata, transport, protocol and, when the session event is
+    found, platform, app_name, project_name, command_line, branch, build_version,
+    changelist, build_config and target_type. Traces of a protocol version not in
+    UTRACE_PROTOCOLS get the header keys only. Raises ValueError for files that aren't traces.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < 6:
+            raise ValueError("file too small for a .utrace header")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            info, pos = utrace_header(view)
+            proto = UTRACE_PROTOCOLS.get(info["protocol"])
+            if proto is None:
+                return info
+            early = _early_bytes(view, info["transport"], pos, scan)
+    info.update(_session_fields(proto, early))
+    return info
+
+
+UTRACE_STATS_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+UTRACE_STATS_VERSION = 2        # bump when utrace_stats() output changes; older cached stats are redone
+UTRACE_EVENT_MAYBE_AUX = 0x02   # NewEvent flags
+UTRACE_EVENT_NOSYNC = 0x04      # without it, events carry a 3-byte serial after the uid
+
+
+def utrace_stats(path:str) -> dict:
+    """Per-thread packet/byte totals and per-event-type counts and bytes of a .utrace.
+
+    Runs in a worker process (see scan_utrace_stats). Two passes over the memory-mapped
+    file: the internal streams first, for the event definitions and the important events,
+    then every thread's packets, decompressed and walked event by event with the sizes
+    from those definitions. events["Logger.Event"] = [count, bytes]. A thread stream that
+    stops parsing can't be resynced; the rest of it is counted as "undecoded" bytes.
+    Raises ValueError for protocol versions not in UTRACE_PROTOCOLS.
+    """
+    threads:dict[str,list[int]] = {}
+    events:dict[str,list[int]] = {}
+    types:dict[int,UtraceEventType] = {}
+    undecoded = 0
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+        info, pos = utrace_header(view)
+        proto = utrace_protocol(info)
+        if info["transport"] in UTRACE_PACKET_TRANSPORTS:
+            internal = _tally_packets(view, pos, threads)
+            for buf in internal:
+                types.update((t.uid, t) for _uid, _size, t in _important_events(buf) if t is not None)
+            for buf in internal:
+                undecoded += _tally_importants(buf, types, events)
+            undecoded += _tally_thread_events(proto, view, pos, types, events)
+    return {"protocol": info["protocol"], "packets": sum(t[0] for t in threads.values()),
+            "bytes": sum(t[1] for t in threads.values()), "decoded": sum(t[2] for t in threads.values()),
+            "threads": threads, "events": events, "undecoded": undecoded}
+
+
+def _tally_packets(view:memoryview, pos:int, threads:dict[str,list[int]]) -> list[bytes]:
+    # threads[tid] = [packets, bytes in the file, decoded bytes]; returns the internal streams
+    internal:dict[int,list[bytes]] = {}
+    for tid, encoded, payload, decoded in utrace_packets(view, pos):
+        t = threads.setdefault(str(tid), [0, 0, 0])
+        t[0] += 1; t[1] += len(payload) + (6 if encoded else 4); t[2] += decoded
+        if tid < UTRACE_INTERNAL_TIDS:
+            try:
+                internal.setdefault(tid, []).append(lz4_block_decode(payload, decoded) if encoded else bytes(payload))
+            except (ValueError, IndexError):
+                pass
+    return [b"".join(chunks) for chunks in internal.values()]
+
+
+def _important_events(buf:bytes):
+    # Walks an internal stream of uint16 Uid/uint16 Size records: (uid, record bytes,
+    # NewEvent definition or None) each, then (None, bytes left over, None).
+    p, n = 0, len(buf)
+    while p + 4 <= n:
+        uid, size = struct.unpack_from("<HH", buf, p)
+        if p + 4 + size > n:
+            break
+        yield uid, 4 + size, _parse_new_event(buf[p + 4:p + 4 + size]) if uid == 0 else None
+        p += 4 + size
+    yield None, n - p, None
+
+
+def _tally_importants(buf:bytes, types:dict[int,UtraceEventType], events:dict[str,list[int]]) -> int:
+    # returns the bytes that didn't belong to a known event
+    undecoded = 0
+    for uid, size, new in _important_events(buf):
+        if new is not None:
+            _tally_event(events, "$Trace.NewEvent", size)
+        elif uid and uid in types:
+            _tally_event(events, f"{types[uid].logger}.{types[uid].name}", size)
+        else:
+            undecoded += size
+    return undecoded
+
+
+def _tally_event(events:dict[str,list[int]], name:str, size:int):
+    e = events.setdefault(name, [0, 0])
+    e[0] += 1; e[1] += size
+
+
+def _tally_thread_events(proto:UtraceProtocol, view:memoryview, pos:int, types:dict[int,UtraceEventType], events:dict[str,list[int]]) -> int:
+    # Events may straddle packets, so each thread's unparsed tail carries over to its next
+    # packet. Returns the bytes that couldn't be attributed to an event.
+    carry:dict[int,bytes] = {}
+    lost:set[int] = set()
+    undecoded = 0
+    for tid, encoded, payload, decoded in utrace_packets(view, pos):
+        if tid < UTRACE_INTERNAL_TIDS:
+            continue
+        if tid in lost:
+            undecoded += decoded
+            continue
+        rest = carry.pop(tid, b"")
+        try:
+            data = rest + (lz4_block_decode(payload, decoded) if encoded else bytes(payload))
+        except (ValueError, IndexError):
+            lost.add(tid)   # a gap in the stream: nothing after it lines up
+            undecoded += len(rest) + decoded
+            continue
+        done, in_sync = _walk_events(proto, data, types, events)
+        if in_sync:
+            carry[tid] = data[done:]
+        else:
+            lost.add(tid)
+            undecoded += len(data) - done
+    return undecoded + sum(len(rest) for rest in carry.values())
+
+
+def _walk_events(proto:UtraceProtocol, buf:bytes, types:dict[int,UtraceEventType], events:dict[str,list[int]]) -> tuple[int,bool]:
+    # Tallies the whole events at the start of buf: (offset of the first one that's cut
+    # off or doesn't parse, whether the stream is still in sync there). A uid byte with
+    # the low bit set starts a two-byte uid.
+    p, n = 0, len(buf)
+    while p < n:
+        start = p
+        if buf[p] & 1:
+            if p + 2 > n:
+                return start, True
+            uid = (buf[p] | (buf[p + 1] << 8)) >> 1
+            p += 2
+        else:
+            uid = buf[p] >> 1
+            p += 1
+        if uid in proto.scope_uids:
+            name, size = proto.scope_uids[uid]
+            p += size
+        elif uid in types:
+            t = types[uid]
+            name = f"{t.logger}.{t.name}"
+            p += (0 if t.flags & UTRACE_EVENT_NOSYNC else 3) + t.fixed_size
+            if t.flags & UTRACE_EVENT_MAYBE_AUX and p < n:
+                run = _aux_blocks(proto, buf, p, n, keep=False)
+                if run is None:
+                    return start, False
+                if not run[2]:
+                    return start, True
+                p = run[1]
+            elif t.flags & UTRACE_EVENT_MAYBE_AUX:
+                return start, True
+        else:
+            return start, False
+        if p > n:
+            return start, True
+        _tally_event(events, name, p - start)
+    return p, True
+
+
+def scan_utrace_stats(paths:list[Path], progress=None, workers:int=UTRACE_STATS_WORKERS) -> dict[str,dict|str]:
+    """utrace_stats() for many traces across a process pool; path -> stats, or error text.
+
+    progress((path, result)) is called as each trace finishes. Worker processes are
+    spawned rather than forked, which is safe from a threaded Qt app on every platform.
+    """
+    results:dict[str,dict|str] = {}
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths)) or 1, mp_context=ctx) as pool:
+        futures = {pool.submit(utrace_stats, str(p)): str(p) for p in paths}
+        for fut in as_completed(futures):
+            path = futures[fut]
+            try:
+                results[path] = fut.result()
+            except Exception as e:   # one bad file shouldn't sink the batch
+                results[path] = str(e) or type(e).__name__
+            if progress:
+                progress((path, results[path]))
+    return results
+
+
+def utrace_summary(info:dict) -> str:
+    return " · ".join(x for x in (info.get("platform"), info.get("app_name"), info.get("build_config"),
+                                   info.get("build_version")) if x)
+
+# ------------------------- headless Insights export -------------------------
+# TimingInsights console commands run by UnrealInsights once analysis completes;
+# each writes one CSV. kind -> (command, CSV suffix)
+INSIGHTS_EXPORTS = {
+    "threads": ("TimingInsights.ExportThreads", "threads"),
+    "timers": ("TimingInsights.ExportTimers", "timers"),
+    "timer_stats": ("TimingInsights.ExportTimerStatistics", "timer-stats"),
+    "timing_events": ("TimingInsights.ExportTimingEvents", "timing-events"),   # can be huge
+}
+INSIGHTS_DEFAULT_EXPORTS = ("threads", "timers", "timer_stats")
+INSIGHTS_MAX_PARALLEL = 2            # each instance analyzes a whole trace in memory
+INSIGHTS_EXPORT_TIMEOUT = 600.0      # seconds, plus size / INSIGHTS_MIN_RATE
+INSIGHTS_MIN_RATE = 4 << 20          # bytes/s of trace analyzed; slower counts as hung
+
+
+def insights_export_args(exe:Path, trace:Path, commands:list[str], rsp:Path) -> list[str]:
+    # several commands go through a response file ("@=<file>", one command per line)
+    rsp.write_text("\n".join(commands) + "\n", encoding="utf-8")
+    return [str(exe), f"-OpenTraceFile={trace}", "-NoUI", "-AutoQuit", f"-ExecOnAnalysisCompleteCmd=@={rsp}"]
+
+
+def export_trace(exe:Path, trace:Path, kinds=INSIGHTS_DEFAULT_EXPORTS, timeout:float|None=None) -> list[Path]:
+    """Run UnrealInsights headless on one trace and write <stem>.<kind>.csv next to it.
+
+    The CSVs are written into a temp folder beside the trace and renamed into place only
+    when Insights exits cleanly and produced all of them, so a killed or crashed run
+    leaves no partial exports behind.
+    """
+    if timeout is None:
+        timeout = INSIGHTS_EXPORT_TIMEOUT + trace.stat().st_size / INSIGHTS_MIN_RATE
+    tmp = Path(tempfile.mkdtemp(prefix=".uaft-export-", dir=trace.parent))
+    try:
+        outputs = {tmp/f"{trace.stem}.{INSIGHTS_EXPORTS[k][1]}.csv": trace.parent/f"{trace.stem}.{INSIGHTS_EXPORTS[k][1]}.csv"
+                   for k in kinds}
+        commands = [f'{INSIGHTS_EXPORTS[k][0]} "{out}"' for k, out in zip(kinds, outputs)]
+        args = insights_export_args(exe, trace, commands, tmp/"export.rsp")
+        code, out, err = run(args, cwd=trace.parent, timeout=timeout, op="Insights export")
+        missing = [p.name for p in outputs if not p.is_file()]
+        if code != 0 or missing:
+            detail = (err or out).strip().splitlines()[-5:]
+            raise RuntimeError(f"UnrealInsights exited with {code}"
+                               + (f", missing {', '.join(missing)}" if missing else "")
+                               + ("\n" + "\n".join(detail) if detail else ""))
+        for src, dest in outputs.items():
+            os.replace(src, dest)
+        return list(outputs.values())
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+EXPORT_CACHE_MAX = int(float(os.environ.get("UAFT_HELPER_EXPORT_CACHE_MB", "2048")) * (1 << 20))   # bytes
+
+
+def insights_version(exe:Path) -> str:
+    """Identifies the UnrealInsights build: the executable's size and mtime, plus
+    Engine/Build/Build.version next to the binary (Engine/Binaries/<Platform>/UnrealInsights)
+    when there is one. Locally rebuilt binaries keep the Build.version of their engine."""
+    st = exe.stat()
+    version = f"exe:{st.st_size}:{st.st_mtime_ns}"
+    for root in exe.resolve().parents[:4]:
+        try:
+            v = json.loads((root/"Build"/"Build.version").read_text(encoding="utf-8"))
+            return (f"{v.get('MajorVersion')}.{v.get('MinorVersion')}.{v.get('PatchVersion')}"
+                    f"-{v.get('Changelist')}+{v.get('BranchName', '')}|{version}")
+        except (OSError, ValueError, AttributeError):
+            continue
+    return version
+
+
+class ExportCache(JsonFile):
+    """Insights export CSVs keyed by (trace content hash, export command, Insights version).
+
+    Lives in export-cache/ in the user config folder; index.json records each entry's
+    size and last use, and the least recently used entries are evicted once the total
+    exceeds `max_bytes`. Hits are copied out, so editing an exported CSV can't touch
+    the cache.
+    """
+    DIR = "export-cache"
+
+    def __init__(self, root:Path|None=None, max_bytes:int=EXPORT_CACHE_MAX):
+        self.root = root or user_config_dir()/self.DIR
+        self.max_bytes = max_bytes
+        super().__init__(self.root/"index.json")
+
+    def empty(self) -> dict:
+        return {**super().empty(), "entries": {}}
+
+    @staticmethod
+    def key(digest:str, command:str, version:str) -> str:
+        return hashlib.blake2b(f"{digest}\0{command}\0{version}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def _path(self, key:str) -> Path:
+        return self.root/key[:2]/f"{key}.csv"
+
+    def get(self, key:str, dest:Path) -> bool:
+        """Copy a cached export to dest (atomically); False on a miss."""
+        with self._lock:
+            entry = self.data["entries"].get(key)
+        src = self._path(key)
+        if entry is None or not src.is_file():
+            return False
+        tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+        with self._lock:
+            if key in self.data["entries"]:
+                self.data["entries"][key]["used_at"] = time.time()
+        self.save()
+        return True
+
+    def put(self, key:str, src:Path, **meta):
+        size = src.stat().st_size
+        if size > self.max_bytes:
+            return   # would evict everything else and still not fit
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, path)
+        with self._lock:
+            entries = self.data["entries"]
+            entries[key] = {"size": size, "used_at": time.time(), **meta}
+            total = sum(e["size"] for e in entries.values())
+            evict = []
+            for k, e in sorted(entries.items(), key=lambda kv: kv[1]["used_at"]):
+                if total <= self.max_bytes:
+                    break
+                if k != key:
+                    evict.append(k)
+                    total -= e["size"]
+            for k in evict:
+                del entries[k]
+        for k in evict:
+            self._path(k).unlink(missing_ok=True)
+        self.save()
+
+
+def export_trace_cached(exe:Path, trace:Path, kinds, cache:ExportCache, version:str,
+                        digest:str|None=None) -> tuple[list[Path],int]:
+    """export_trace() that reuses cached CSVs for the same content; (CSV paths, cache hits)."""
+    digest = digest or file_digest(trace)
+    paths, missing, hits = [], [], 0
+    for k in kinds:
+        dest = trace.parent/f"{trace.stem}.{INSIGHTS_EXPORTS[k][1]}.csv"
+        if cache.get(cache.key(digest, INSIGHTS_EXPORTS[k][0], version), dest):
+            hits += 1
+        else:
+            missing.append(k)
+        paths.append(dest)
+    if missing:
+        for k, out in zip(missing, export_trace(exe, trace, missing)):
+            cache.put(cache.key(digest, INSIGHTS_EXPORTS[k][0], version), out,
+                      trace=trace.name, command=INSIGHTS_EXPORTS[k][0], version=version)
+    return paths, hits
+
+
+def export_traces(exe:Path, traces:list[Path], kinds=INSIGHTS_DEFAULT_EXPORTS, progress=None,
+                  workers:int=INSIGHTS_MAX_PARALLEL, cache:ExportCache|None=None,
+                  digests:dict[str,str]|None=None) -> dict[str,tuple[list[Path],int]|str]:
+    """export_trace() for many traces, at most `workers` UnrealInsights processes at a time.
+
+    Returns trace -> (CSV paths, cache hits), or error text; progress((trace, result)) as
+    each finishes. With a cache, exports already made for the same content by the same
+    Insights build are copied from it; `digests` (trace -> file_digest) saves re-hashing.
+    """
+    results:dict[str,tuple[list[Path],int]|str] = {}
+    version = insights_version(exe) if cache is not None else ""
+    digests = digests or {}
+
+    def one(t:Path):
+        if cache is None:
+            return export_trace(exe, t, kinds), 0
+        return export_trace_cached(exe, t, kinds, cache, version, digests.get(str(t)))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(traces)))) as pool:
+        futures = {pool.submit(one, t): str(t) for t in traces}
+        for fut in as_completed(futures):
+            trace = futures[fut]
+            try:
+                results[trace] = fut.result()
+            except Exception as e:   # one failed trace shouldn't stop the batch
+                results[trace] = str(e) or type(e).__name__
+            if progress:
+                progress((trace, results[trace]))
+    return results
+
+# ------------------------- catalog -------------------------
+CATALOG_SINCE = {"Any time": None, "Last 24 hours": 1, "Last 7 days": 7, "Last 30 days": 30}   # label -> days
+
+
+class TraceCatalog:
+    """Every verified pull, in catalog.sqlite3 in the user config folder.
+
+    One row per pull: device (serial, make, model), package, remote and local path, size,
+    content hash, pull time and the UECommandLine.txt last pushed to that device/package,
+    plus what read_utrace_info() found in the trace itself (platform, app, build, the
+    command line the game really ran with). search() uses an FTS5 index when this SQLite
+    has it and LIKE matching otherwise.
+    """
+    FILE = "catalog.sqlite3"
+    VERSION = 1
+    INFO_COLUMNS = ("platform", "app_name", "build_version", "build_config", "trace_command_line")
+    COLUMNS = ("serial", "make", "model", "package", "remote", "local", "size", "hash", "pulled_at", "command_line") + INFO_COLUMNS
+    TEXT_COLUMNS = ("make", "model", "serial", "package", "remote", "command_line") + INFO_COLUMNS
+
+    def __init__(self, path:Path|None=None):
+        self.path = path or user_config_dir()/self.FILE
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        with self._db:
+            self._db.execute("CREATE TABLE IF NOT EXISTS pulls (id INTEGER PRIMARY KEY, "
+                             + ", ".join(f"{c} {'INTEGER' if c == 'size' else 'TEXT'}" for c in self.COLUMNS) + ")")
+            self._db.execute("CREATE INDEX IF NOT EXISTS pulls_pulled_at ON pulls (pulled_at)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS pulls_target ON pulls (serial, package)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS pulls_hash ON pulls (hash)")
+            self._db.execute(f"PRAGMA user_version = {self.VERSION}")
+        self.fts = self._create_fts()
+
+    def _create_fts(self) -> bool:
+        cols = ", ".join(self.TEXT_COLUMNS)
+        try:
+            with self._db:
+                self._db.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS pulls_fts USING fts5({cols}, content='pulls', content_rowid='id')")
+                self._db.execute(f"CREATE TRIGGER IF NOT EXISTS pulls_ai AFTER INSERT ON pulls BEGIN "
+                                 f"INSERT INTO pulls_fts (rowid, {cols}) VALUES (new.id, {', '.join('new.' + c for c in self.TEXT_COLUMNS)}); END")
+                self._db.execute(f"CREATE TRIGGER IF NOT EXISTS pulls_ad AFTER DELETE ON pulls BEGIN "
+                                 f"INSERT INTO pulls_fts (pulls_fts, rowid, {cols}) VALUES ('delete', old.id, {', '.join('old.' + c for c in self.TEXT_COLUMNS)}); END")
+            return True
+        except sqlite3.OperationalError:   # SQLite built without FTS5
+            return False
+
+    def add(self, **row) -> int:
+        row.setdefault("pulled_at", datetime.now().isoformat(timespec="seconds"))
+        values = [row.get(c) for c in self.COLUMNS]
+        with self._lock, self._db:
+            cur = self._db.execute(f"INSERT INTO pulls ({', '.join(self.COLUMNS)}) VALUES ({', '.join('?' * len(self.COLUMNS))})", values)
+            return cur.lastrowid
+
+    def search(self, text:str="", since_days:int|None=None, limit:int=500) -> list[dict]:
+        """Newest first. Every word in `text` must match (as a prefix with FTS5, a substring without)."""
+        words = text.split()
+        where, params = [], []
+        if since_days is not None:
+            where.append("p.pulled_at >= ?")
+            params.append(datetime.fromtimestamp(time.time() - since_days * 86400).isoformat(timespec="seconds"))
+        if words and self.fts:
+            where.append("p.id IN (SELECT rowid FROM pulls_fts WHERE pulls_fts MATCH ?)")
+            params.append(" ".join('"{}"*'.format(w.replace('"', '""')) for w in words))
+        elif words:
+            haystack = " || ' ' || ".join(f"coalesce(p.{c}, '')" for c in self.TEXT_COLUMNS)
+            for w in words:
+                where.append(f"({haystack}) LIKE ? ESCAPE '\\'")
+                params.append("%" + w.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        sql = (f"SELECT p.id, {', '.join('p.' + c for c in self.COLUMNS)} FROM pulls p"
+               + (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY p.pulled_at DESC, p.id DESC LIMIT ?")
+        with self._lock:
+            rows = self._db.execute(sql, params + [limit]).fetchall()
+        return [dict(zip(("id",) + self.COLUMNS, r)) for r in rows]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+# ------------------------- delta push -------------------------
+PUSH_MAX_PARALLEL = 4
+
+
+class PushManifest(JsonFile):
+    """What was last pushed to each device/package, kept as push-manifest.json in the user config folder.
+
+    targets["<serial>|<package>"][remote path] = {"hash", "size", "mtime_ns", "pushed_at"}.
+    A local file whose size and mtime match its record is not even re-hashed; one that was
+    only touched (same hash) is not pushed again.
+    """
+    FILE = "push-manifest.json"
+
+    def __init__(self, path:Path|None=None):
+        super().__init__(path or user_config_dir()/self.FILE)
+
+    def empty(self) -> dict:
+        return {**super().empty(), "targets": {}}
+
+    def entry(self, target:str, remote:str) -> dict|None:
+        with self._lock:
+            return self.data["targets"].get(target, {}).get(remote)
+
+    def record(self, target:str, remote:str, digest:str, size:int, mtime_ns:int):
+        with self._lock:
+            self.data["targets"].setdefault(target, {})[remote] = {
+                "hash": digest, "size": size, "mtime_ns": mtime_ns,
+                "pushed_at": datetime.now().isoformat(timespec="seconds")}
+
+
+def plan_push(local_dir:Path, remote_dir:str, target:str, manifest:PushManifest, force:bool=False) -> tuple[list[tuple],int]:
+    """([(local, remote, hash, size, mtime_ns)] to push, number of unchanged files) for a folder."""
+    todo, unchanged = [], 0
+    for dirpath, _, names in os.walk(local_dir):
+        for name in sorted(names):
+            local = Path(dirpath)/name
+            st = local.stat()
+            remote = f"{remote_dir.rstrip('/')}/{local.relative_to(local_dir).as_posix()}"
+            rec = None if force else manifest.entry(target, remote)
+            if rec and rec["size"] == st.st_size and rec["mtime_ns"] == st.st_mtime_ns:
+                unchanged += 1
+                continue
+            digest = file_digest(local)
+            if rec and rec["size"] == st.st_size and rec["hash"] == digest:
+                manifest.record(target, remote, digest, st.st_size, st.st_mtime_ns)   # touched, not changed
+                unchanged += 1
+                continue
+            todo.append((local, remote, digest, st.st_size, st.st_mtime_ns))
+    return todo, unchanged
+
+
+def push_folder(uaft:"UAFT", conn:tuple, local_dir:Path, remote_dir:str, manifest:PushManifest,
+                force:bool=False, progress=None, limit:int=PUSH_MAX_PARALLEL) -> tuple[int,int,list[tuple[str,str]]]:
+    """Push the files under local_dir that changed since the last push to this target, `limit` at a time.
+
+    Returns (pushed, unchanged, [(remote, error)]). progress((done, total, remote, error))
+    is called as each push completes. Successful pushes are recorded even if others fail.
+    """
+    target = target_key(conn)
+    todo, unchanged = plan_push(local_dir, remote_dir, target, manifest, force)
+    failures:list[tuple[str,str]] = []
+
+    async def main():
+        sem = asyncio.Semaphore(limit)
+        client = AsyncUAFT(uaft)
+
+        async def one(item:tuple):
+            local, remote, digest, size, mtime_ns = item
+            async with sem:
+                try:
+                    await client.push(*conn, str(local), remote, size)
+                except Exception as e:
+                    return remote, str(e).strip() or type(e).__name__
+            manifest.record(target, remote, digest, size, mtime_ns)
+            return remote, None
+
+        for done, fut in enumerate(asyncio.as_completed([one(t) for t in todo]), 1):
+            remote, error = await fut
+            if error:
+                failures.append((remote, error))
+            if progress:
+                progress((done, len(todo), remote, error))
+
+    try:
+        if todo:
+            asyncio.run(main())
+    finally:
+        manifest.save()
+    return len(todo) - len(failures), unchanged, failures
+
+# ------------------------- caching -------------------------
+CACHE_TTL = float(os.environ.get("UAFT_HELPER_CACHE_TTL", "120"))   # seconds
+
+
+class TTLCache:
+    """Thread-safe key -> value memo whose entries expire after `ttl` seconds."""
+    def __init__(self, ttl:float=CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data:dict = {}
+
+    def get(self, key):
+        """The cached value, or None when missing or expired."""
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return None
+            stamp, value = hit
+            if time.monotonic() - stamp > self.ttl:
+                del self._data[key]
+                return None
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+
+    def invalidate(self, match=None):
+        """Drop every entry, or only those whose key satisfies match(key)."""
+        with self._lock:
+            if match is None:
+                self._data.clear()
+            else:
+                for key in [k for k in self._data if match(k)]:
+                    del self._data[key]
+
+# ------------------------- persisted state -------------------------
+class StateStore(JsonFile):
+    """Last-known session state (tool paths, device inventory, package and trace listings).
+
+    Shown on startup before UAFT has answered; a missing or corrupt file just means an empty state.
+    """
+    def __init__(self, path:Path|None=None):
+        super().__init__(path or user_config_dir()/"state.json")
+
+    def empty(self) -> dict:
+        # devices: serial -> [make, model] inventory; device_list: serials of the last listing;
+        # command_lines: target -> UECommandLine.txt content last pushed there
+        return {**super().empty(), "saved_at": None, "paths": {}, "connection": {},
+                "devices": {}, "device_list": [], "packages": {}, "traces": {}, "command_lines": {}}
+
+    def save(self):
+        self.data["saved_at"] = datetime.now().isoformat(timespec="seconds")
+        try:
+            super().save()
+        except OSError:
+            pass   # state is a convenience; never fail an operation over it
+
+# ------------------------- background jobs -------------------------
+class JobSignals(QObject):
+    done = Signal(object)
+    failed = Signal(object)
+    progress = Signal(object)
+
+
+class Job(QRunnable):
+    """Runs fn(*args, **kwargs) on a QThreadPool worker and reports back through signals.
+
+    Signals are delivered on the GUI thread, so connected slots may touch widgets.
+    With report=True, fn also receives a `progress` callable for partial results.
+    """
+    def __init__(self, fn, *args, report:bool=False, **kwargs):
+        super().__init__()
+        self.fn, self.args, self.kwargs = fn, args, kwargs
+        self.signals = JobSignals()
+        if report:
+            self.kwargs["progress"] = lambda value: self._emit(self.signals.progress, value)
+
+    def _emit(self, signal, value):
+        try:
+            signal.emit(value)
+        except RuntimeError:
+            pass   # the window was closed while this job was still running
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self._emit(self.signals.failed, e)
+        else:
+            self._emit(self.signals.done, result)
+
+
+def stream_batches(items, progress, interval:float=0.1) -> int:
+    """Drain `items`, handing them to `progress` in lists at most every `interval` seconds.
+
+    Keeps the signal rate bounded when a generator yields thousands of entries.
+    Returns how many items were seen.
+    """
+    batch, total, last = [], 0, time.monotonic()
+    for it in items:
+        batch.append(it)
+        total += 1
+        if time.monotonic() - last >= interval:
+            progress(batch)
+            batch, last = [], time.monotonic()
+    if batch:
+        progress(batch)
+    return total
+
+# ------------------------- trace list model -------------------------
+class TraceListModel(QAbstractTableModel):
+    """On-device traces as parallel arrays (path / size / timestamp / flags) for a QTableView.
+
+    Refreshes are applied as diffs: upsert() updates or appends rows as a listing streams
+    in, retain() then removes whatever the listing no longer contains, so a refresh of a
+    long soak-test folder touches only the rows that changed.
+    """
+    COLUMNS = ("Trace", "Size", "Modified", "Info")
+    GROWING, STALE = 1, 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._paths:list[str] = []
+        self._sizes = array("q")          # -1 = unknown
+        self._stamps:list[str|None] = []
+        self._flags = bytearray()
+        self._rows:dict[str,int] = {}     # path -> row
+        self._info:dict[str,str] = {}     # path -> summary read from the pulled copy
+        self._italic = QFont(); self._italic.setItalic(True)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        row, col = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 0:
+                return self._paths[row]
+            if col == 1:
+                return _fmt_bytes(self._sizes[row]) if self._sizes[row] >= 0 else ""
+            if col == 3:
+                return self._info.get(self._paths[row], "")
+            return self._stamps[row] or ""
+        if role == Qt.ItemDataRole.UserRole:    # sort key
+            return (self._paths[row], self._sizes[row], self._stamps[row] or "", self._info.get(self._paths[row], ""))[col]
+        flags = self._flags[row]
+        if role == Qt.ItemDataRole.ForegroundRole and flags:
+            return Qt.GlobalColor.gray if flags & self.STALE else Qt.GlobalColor.darkYellow
+        if role == Qt.ItemDataRole.FontRole and flags & self.STALE:
+            return self._italic
+        if role == Qt.ItemDataRole.ToolTipRole:
+            if flags & self.STALE:
+                return "From the last session — refreshing"
+            if flags & self.GROWING:
+                return "Still being written — a pull will wait until it stops growing"
+        return None
+
+    def entry(self, row:int) -> RemoteEntry:
+        size = self._sizes[row]
+        return RemoteEntry(self._paths[row], size if size >= 0 else None, self._stamps[row])
+
+    def paths(self) -> list[str]:
+        return list(self._paths)
+
+    def clear(self):
+        self.beginResetModel()
+        self._paths.clear(); self._sizes = array("q"); self._stamps.clear()
+        self._flags = bytearray(); self._rows.clear(); self._info.clear()
+        self.endResetModel()
 
-# ------------------------- helpers -------------------------
+    def set_info(self, info:dict[str,str]):
+        """Merge path -> summary (platform, app, build of the pulled copy) into the Info column."""
+        self._info.update(info)
+        for path in info:
+            row = self._rows.get(path)
+            if row is not None:
+                ix = self.index(row, 3)
+                self.dataChanged.emit(ix, ix)
 
-def run(cmd:list[str], cwd:Path|None=None) -> tuple[int,str,str]:
-    try:
-        proc = subprocess.Popen(cmd, cwd=str(cwd) if cwd else None,
-                                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                                text=True, shell=False)
-    except PermissionError as e:
-        # Common on Windows when selecting a folder instead of the .exe,
-        # or when the file is blocked by SmartScreen/AV.
-        raise RuntimeError(f"Permission error launching: {cmd[0]} — check that it's an executable (.exe on Windows) and not blocked (Right‑click > Properties > Unblock). Original: {e}")
-    out, err = proc.communicate()
-    return proc.returncode, out, err
+    def upsert(self, entries, flags_for=lambda e: 0):
+        """Update rows that exist, append the rest (one insert for the whole batch)."""
+        new = []
+        last = self.columnCount() - 1
+        for e in entries:
+            row = self._rows.get(e.path)
+            size, flags = -1 if e.size is None else e.size, flags_for(e)
+            if row is None:
+                new.append((e, size, flags))
+            elif (self._sizes[row], self._stamps[row], self._flags[row]) != (size, e.stamp, flags):
+                self._sizes[row], self._stamps[row], self._flags[row] = size, e.stamp, flags
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last))
+        if new:
+            first = len(self._paths)
+            self.beginInsertRows(QModelIndex(), first, first + len(new) - 1)
+            for i, (e, size, flags) in enumerate(new):
+                self._rows[e.path] = first + i
+                self._paths.append(e.path); self._sizes.append(size)
+                self._stamps.append(e.stamp); self._flags.append(flags)
+            self.endInsertRows()
 
+    def retain(self, keep:set[str]):
+        """Remove every row whose path is not in `keep`, one contiguous run at a time."""
+        doomed = [r for r, p in enumerate(self._paths) if p not in keep]
+        while doomed:
+            end = doomed.pop()
+            start = end
+            while doomed and doomed[-1] == start - 1:
+                start = doomed.pop()
+            self.beginRemoveRows(QModelIndex(), start, end)
+            del self._paths[start:end + 1], self._sizes[start:end + 1]
+            del self._stamps[start:end + 1], self._flags[start:end + 1]
+            self.endRemoveRows()
+        self._rows = {p: r for r, p in enumerate(self._paths)}
 
-def path_exists(p:str) -> bool:
-    return Path(p).expanduser().exists()
 
+class TraceFilterProxy(QSortFilterProxyModel):
+    """Sorts on the raw values and filters paths by substring, or by glob when the
+    text contains * ? or [ — both via Qt's C++ matching, so filtering stays instant."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(Qt.ItemDataRole.UserRole)
+        self.setFilterKeyColumn(0)
+        self.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
 
-# ------------------------- core UAFT driver -------------------------
-class UAFT:
-    def __init__(self, uaft_path:Path):
-        self.uaft_path = uaft_path
+    def set_pattern(self, text:str):
+        text = text.strip()
+        if any(c in text for c in "*?["):
+            # unanchored like the substring filter: "GPU*.utrace" matches anywhere in the path
+            rx = fnmatch.translate(f"*{text.lstrip('*')}")
+            self.setFilterRegularExpression(QRegularExpression(rx, QRegularExpression.PatternOption.CaseInsensitiveOption))
+        else:
+            self.setFilterFixedString(text)
 
-    def _base_args(self, serial:str|None, ip:str|None, port:str|None, package:str|None, token:str|None):
-        args = [str(self.uaft_path)]
-        # Prefer serial over IP; if serial is provided, ignore IP to avoid confusing UAFT
-        if serial:
-            args += ["-s", serial]
-        elif ip:
-            args += ["-ip", ip]
-        if port:
-            args += ["-t", port]
-        if package:
-            args += ["-p", package]
-        if token:
-            args += ["-k", token]
-        return args
+# ------------------------- remote browser -------------------------
+AFS_ROOTS = ("^saved", "^project", "^engine", "^ext")
 
-    def devices(self) -> list[str]:
-        code, out, err = run([str(self.uaft_path), "devices"])   # UAFT prints list
-        if code != 0:
-            raise RuntimeError(err or out)
-        # filter lines that look like device serials
-        lines = [ln.strip().lstrip("@") for ln in out.splitlines() if ln.strip()]
-        # Heuristic: serial lines have no spaces
-        return [ln for ln in lines if " " not in ln and ln.lower() != "devices"]
 
-    def packages(self, serial:str|None=None) -> list[str]:
-        args = [str(self.uaft_path)]
-        if serial:
-            args += ["-s", serial]
-        args += ["packages"]
-        code, out, err = run(args)
-        if code != 0:
-            raise RuntimeError(err or out)
-        return [ln.strip() for ln in out.splitlines() if ln.strip() and "." in ln]
+class _RemoteNode:
+    __slots__ = ("entry", "parent", "row", "children", "request")
 
-    def push_commandfile(self, serial:str|None, ip:str|None, port:str|None, package:str, token:str|None, local_cmd:str):
-        # UAFT: push <local> ^commandfile
-        args = self._base_args(serial, ip, port, package, token) + ["push", local_cmd, "^commandfile"]
-        code, out, err = run(args)
-        if code != 0:
-            raise RuntimeError(err or out)
-        return out
+    def __init__(self, entry:RemoteEntry, parent:"_RemoteNode|None", row:int):
+        self.entry, self.parent, self.row = entry, parent, row
+        self.children:list[_RemoteNode]|None = None   # None = not listed yet
+        self.request = 0   # id of the listing in flight for this folder, 0 if none
 
-    def list_traces(self, serial:str|None, ip:str|None, port:str|None, package:str, token:str|None) -> list[str]:
-        # UAFT: ls -R ^saved/Traces
-        args = self._base_args(serial, ip, port, package, token) + ["ls", "-R", "^saved/Traces"]
-        code, out, err = run(args)
-        if code != 0:
-            # If folder missing, UAFT returns non-zero; treat as no traces
-            return []
-        files = []
-        for ln in out.splitlines():
-            ln = ln.strip()
-            if ln.endswith(".trace") or ln.endswith(".utrace"):
-                files.append(ln)
-        return files
-
-    def pull_trace(self, serial:str|None, ip:str|None, port:str|None, package:str, token:str|None, remote_file:str, local_dir:Path) -> Path:
-        local_dir.mkdir(parents=True, exist_ok=True)
-        args = self._base_args(serial, ip, port, package, token) + ["pull", remote_file, str(local_dir)]
-        code, out, err = run(args)
-        if code != 0:
-            raise RuntimeError(err or out)
-        return local_dir/Path(remote_file).name
+
+class RemoteTreeModel(QAbstractItemModel):
+    """The AFS namespace of one device/package, listed one directory at a time.
+
+    Nothing is listed until a folder is expanded: the view asks canFetchMore()/fetchMore()
+    and `lister(path, on_done, on_error)` runs a one-level `ls` off the GUI thread. A
+    folder's listing is kept until refresh() drops it (or reset() drops everything).
+    Each listing carries a request id; a reply for a folder that was dropped or asked
+    again since is ignored.
+    """
+    COLUMNS = ("Name", "Size", "Modified")
+
+    def __init__(self, lister, roots=AFS_ROOTS, parent=None):
+        super().__init__(parent)
+        self._lister = lister
+        self._roots = roots
+        self._requests = 0
+        self._root = _RemoteNode(RemoteEntry("", is_dir=True), None, 0)
+        self._build_roots()
+
+    def _build_roots(self):
+        self._root.children = [_RemoteNode(RemoteEntry(r, is_dir=True), self._root, i) for i, r in enumerate(self._roots)]
+
+    def _node(self, index:QModelIndex) -> _RemoteNode:
+        return index.internalPointer() if index.isValid() else self._root
+
+    def _index(self, node:_RemoteNode) -> QModelIndex:
+        return QModelIndex() if node is self._root else self.createIndex(node.row, 0, node)
+
+    def index(self, row, column, parent=QModelIndex()):
+        children = self._node(parent).children
+        if not children or not 0 <= row < len(children) or not 0 <= column < len(self.COLUMNS):
+            return QModelIndex()
+        return self.createIndex(row, column, children[row])
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        return self._index(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self._node(parent).children or ())
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.COLUMNS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self._node(parent)
+        return node.entry.is_dir and (node.children is None or bool(node.children))
+
+    def canFetchMore(self, parent):
+        node = self._node(parent)
+        return node.entry.is_dir and node.children is None and not node.request
+
+    def fetchMore(self, parent):
+        node = self._node(parent)
+        if not self.canFetchMore(parent):
+            return
+        self._requests += 1
+        node.request = rid = self._requests
+        self._lister(node.entry.path, lambda entries: self._listed(node, rid, entries),
+                     lambda e: self._list_failed(node, rid))
+
+    def _listed(self, node:_RemoteNode, rid:int, entries:list[RemoteEntry]):
+        if node.request != rid:   # dropped by refresh()/reset(), or listed again, meanwhile
+            return
+        node.request = 0
+        entries = sorted(entries, key=lambda e: (not e.is_dir, e.path.lower()))
+        if not entries:
+            node.children = []
+            ix = self._index(node)
+            self.dataChanged.emit(ix, ix)   # lets the view drop the expand arrow
+            return
+        self.beginInsertRows(self._index(node), 0, len(entries) - 1)
+        node.children = [_RemoteNode(e, node, i) for i, e in enumerate(entries)]
+        self.endInsertRows()
+
+    def _list_failed(self, node:_RemoteNode, rid:int):
+        if node.request == rid:
+            node.request = 0   # children stay None, so expanding again retries
+
+    @staticmethod
+    def _drop(nodes):
+        # detached nodes may still be referenced by listings in flight; disown those
+        for node in nodes or ():
+            node.request = 0
+            RemoteTreeModel._drop(node.children)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        e, col = node.entry, index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 0:
+                name = e.path if node.parent is self._root else e.path.rsplit("/", 1)[-1]
+                return name + ("/" if e.is_dir else "") + (" (listing…)" if node.request else "")
+            if col == 1:
+                return "" if e.is_dir or e.size is None else _fmt_bytes(e.size)
+            return e.stamp or ""
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return e.path
+        return None
+
+    def entry(self, index:QModelIndex) -> RemoteEntry|None:
+        return self._node(index).entry if index.isValid() else None
+
+    def refresh(self, index:QModelIndex):
+        """Forget a folder's listing (and everything below it) and list it again."""
+        node = self._node(index)
+        if not node.entry.is_dir:
+            node = node.parent
+            index = self._index(node)
+        if node is self._root:
+            self.reset()
+            return
+        self._drop(node.children)
+        if node.children:
+            self.beginRemoveRows(index, 0, len(node.children) - 1)
+            node.children = None
+            self.endRemoveRows()
+        node.children, node.request = None, 0
+        self.fetchMore(index)
+
+    def reset(self):
+        self._drop(self._root.children)
+        self.beginResetModel()
+        self._build_roots()
+        self.endResetModel()
 
 # ------------------------- UI -------------------------
 class App(QWidget):
@@ -161,16 +2672,38 @@ class App(QWidget):
         self.trace_args.setPlainText(DEFAULT_TRACE_ARGS)
 
         self.btn_detect_devices = QPushButton("List Devices")
+        self.btn_force_refresh = QPushButton("Force Refresh")
+        self.btn_force_refresh.setToolTip(f"Device and package lists are reused for {CACHE_TTL:g}s; this drops them and asks UAFT again.")
         from PySide6.QtWidgets import QTableWidget, QTableWidgetItem, QHeaderView
 
-        self.device_table = QTableWidget(0, 3)
-        self.device_table.setHorizontalHeaderLabels(["Make", "Model", "Serial"])
+        self.device_table = QTableWidget(0, 4)
+        self.device_table.setHorizontalHeaderLabels(["Make", "Model", "Serial", "State"])
         self.device_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.device_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.device_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.device_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
 
         self.device_table.setMinimumHeight(160)
+        self.chk_track_devices = QCheckBox("Track devices live (adb)")
+        self.chk_track_devices.setToolTip("Follow adb's device stream and update the table as phones are plugged, unplugged or change state.")
+        self._tracker:DeviceTracker|None = None
+        self._cache = TTLCache()
+        self._uaft:UAFT|None = None
+        self._state = StateStore()
+        self._save_timer = QTimer(self); self._save_timer.setSingleShot(True); self._save_timer.setInterval(2000)
+        self._save_timer.timeout.connect(self._save_state)
+        self._prefer_serial:str|None = None
+        self._open_after:set[int] = set()
+        self._inflight:set[tuple[str,str,str]] = set()
+        self._manifests:dict[str,TraceManifest] = {}
+        self._stores:dict[str,TraceStore] = {}
+        self._stability = StabilityTracker()
+        self._unsettled:list[Transfer] = []
+        self._settle_polling = False
+        self._settle_timer = QTimer(self); self._settle_timer.setInterval(int(STABLE_POLL * 1000))
+        self._settle_timer.timeout.connect(self._poll_unsettled)
+        self._manifests_lock = threading.Lock()
+        self._prefer_package:str|None = None
         self.btn_list_packages = QPushButton("List Packages (AFS)")
         self.btn_list_packages.setToolTip("AFS = Android File Server. Shows packages on the device that expose the AFS receiver for UAFT operations.")
         self.pkg_list = QListWidget()
@@ -178,17 +2711,101 @@ class App(QWidget):
         self.pkg_list.setMinimumHeight(120)
         self.pkg_list.setToolTip("Select your game/app package (e.g., com.Company.Game)")
         self.btn_write_cmd = QPushButton("Generate and Push UECommandLine.txt")
+        self.push_local = QLineEdit(); self.push_local.setPlaceholderText("local folder with pak/ini/config overrides")
+        self.btn_push_choose = QPushButton("Choose Folder…")
+        self.push_remote = QLineEdit(); self.push_remote.setPlaceholderText("e.g. ^project/Saved/Config/Android")
+        self.chk_push_all = QCheckBox("Push everything")
+        self.chk_push_all.setToolTip("Ignore what was pushed before, e.g. after reinstalling the app")
+        self.btn_push_folder = QPushButton("Push Changed Files")
+        self.btn_push_folder.setToolTip("Push only the files that changed since the last push to this device/package")
+        self._push_manifest = PushManifest()
 
         self.btn_refresh_traces = QPushButton("Refresh Traces")
-        self.trace_list = QListWidget(); self.trace_list.setSelectionMode(QListWidget.SingleSelection); self.trace_list.setMinimumHeight(160)
+        self.btn_sync_traces = QPushButton("Sync Traces")
+        self.chk_watch = QCheckBox("Watch && auto-pull")
+        self.chk_watch.setToolTip("Keep polling ^saved/Traces for the current device/package and pull each new trace as soon as the capture finishes")
+        self._watcher:TraceWatcher|None = None
+        self.btn_sync_traces.setToolTip("Pull every trace under ^saved/Traces that isn't already in the Pull to folder (new or changed size/timestamp)")
+        self.trace_model = TraceListModel(self)
+        self.trace_proxy = TraceFilterProxy(self); self.trace_proxy.setSourceModel(self.trace_model)
+        self.trace_list = QTableView(); self.trace_list.setModel(self.trace_proxy)
+        self.trace_list.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.trace_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.trace_list.setSortingEnabled(True); self.trace_list.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+        self.trace_list.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.trace_list.verticalHeader().setVisible(False)
+        self.trace_list.setMinimumHeight(160)
+        self.trace_filter = QLineEdit(); self.trace_filter.setPlaceholderText("Filter: text or glob, e.g. *GPU*.utrace")
+        self.trace_filter.setClearButtonEnabled(True)
+        self._trace_target:str|None = None
+        self.remote_model = RemoteTreeModel(self._list_remote_dir, parent=self)
+        self.remote_tree = QTreeView(); self.remote_tree.setModel(self.remote_model)
+        self.remote_tree.setUniformRowHeights(True)   # keeps large folders cheap to lay out
+        self.remote_tree.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.remote_tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.remote_tree.header().setStretchLastSection(False)
+        self.remote_tree.setMinimumHeight(160)
+        self.remote_target = QLabel("Expand a folder to list it")
+        self.btn_remote_refresh = QPushButton("Refresh Folder")
+        self.btn_remote_refresh.setToolTip("List the selected folder again. With nothing selected, start over from the roots for the current device/package.")
+        self.btn_remote_pull = QPushButton("Pull Selected Files")
+        self._browse_conn:tuple|None = None
+        self.catalog_search = QLineEdit(); self.catalog_search.setClearButtonEnabled(True)
+        self.catalog_search.setPlaceholderText("Search everything pulled so far, e.g. pixel 8 gpu")
+        self.catalog_since = QComboBox(); self.catalog_since.addItems(list(CATALOG_SINCE))
+        self.catalog_table = QTableWidget(0, 6)
+        self.catalog_table.setHorizontalHeaderLabels(["Pulled", "Device", "Package", "Trace", "Size", "Local file"])
+        self.catalog_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.catalog_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        self.catalog_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.catalog_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.catalog_table.verticalHeader().setVisible(False)
+        self.catalog_table.setToolTip("Double-click to open the local copy in Unreal Insights")
+        self.btn_trace_stats = QPushButton("Trace Stats")
+        self.btn_export = QPushButton("Export CSVs")
+        self.btn_export.setToolTip("Run UnrealInsights headless on the selected .utrace files and write thread/timer CSVs next to each")
+        self._export_cache = ExportCache()
+        self.chk_export_events = QCheckBox("incl. timing events")
+        self.chk_export_events.setToolTip("Also export every timing event; the CSV can be many times the size of the trace")
+        self.btn_trace_stats.setToolTip("Bytes per thread, and count and bytes per event type, of the selected .utrace files, without Insights")
+        try:
+            self._catalog:TraceCatalog|None = TraceCatalog()
+        except (sqlite3.Error, OSError) as e:
+            self._catalog = None
+            self.catalog_search.setPlaceholderText(f"Catalog unavailable: {e}")
+            self.catalog_search.setEnabled(False)
+        self.trace_tabs = QTabWidget()
         self.pull_dir = QLineEdit(str(Path.home()/"UnrealTraces"))
         self.btn_choose_dir = QPushButton("Choose Folder…")
-        self.btn_pull = QPushButton("Pull Selected Trace")
+        self.btn_pull = QPushButton("Pull Selected Traces")
+        self.max_pulls = QSpinBox(); self.max_pulls.setRange(1, 16); self.max_pulls.setValue(4)
+        self.max_pulls.setToolTip("Pulls running at once, across all devices")
+        self.max_pulls_device = QSpinBox(); self.max_pulls_device.setRange(1, 8); self.max_pulls_device.setValue(2)
+        self.max_pulls_device.setToolTip("Pulls running at once from the same device")
         self.chk_open_insights = QCheckBox("Open in Unreal Insights after pull")
+        self.chk_verify = QCheckBox("Verify pulls"); self.chk_verify.setChecked(True)
+        self.chk_verify.setToolTip("Check each pulled file's size against the device listing and pull again on a mismatch")
+        self.transfer_table = QTableWidget(0, 5)
+        self.transfer_table.setHorizontalHeaderLabels(["Trace", "Device", "Progress", "Speed", "ETA / Status"])
+        self.transfer_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.transfer_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        self.transfer_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.transfer_table.setMinimumHeight(100)
+        self._transfer_rows:dict[int,int] = {}
         self.log = QTextEdit(); self.log.setReadOnly(True)
 
+        # UAFT/adb calls block, so they run here instead of on the GUI thread
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(32)   # room for long-lived trackers plus a full transfer queue
+        # hashing is disk-bound: a couple of threads of its own, so it never holds up transfers
+        self._hash_pool = QThreadPool(self)
+        self._hash_pool.setMaxThreadCount(2)
+        self._jobs:set[Job] = set()
+        self._transfers = TransferQueue(self._start_transfer, self.max_pulls.value(), self.max_pulls_device.value())
+
         self._build_layout()
         self._connect_signals()
+        self._restore_state()
 
     def _build_layout(self):
         root = QVBoxLayout(self)
@@ -205,7 +2822,7 @@ class App(QWidget):
         lc = QVBoxLayout()
         lc.addLayout(self._row([QLabel("Security Token:"), self.security_token, QLabel("Port:"), self.port]))
         lc.addLayout(self._row([QLabel("Device Serial:"), self.serial, QLabel("or IP:"), self.ip, QLabel("Package:"), self.package]))
-        lc.addLayout(self._row([self.btn_detect_devices, self.btn_list_packages]))
+        lc.addLayout(self._row([self.btn_detect_devices, self.btn_list_packages, self.btn_force_refresh, self.chk_track_devices]))
         lc.addWidget(self.device_table)
         lc.addWidget(self.pkg_list)
         box_conn.setLayout(lc)
@@ -215,17 +2832,41 @@ class App(QWidget):
         la = QVBoxLayout(); la.addWidget(self.trace_args); la.addWidget(self.btn_write_cmd)
         box_args.setLayout(la)
 
+        # folder push
+        box_push = QGroupBox("Push Folder to Device")
+        lpf = QVBoxLayout()
+        lpf.addLayout(self._row([QLabel("Local:"), self.push_local, self.btn_push_choose]))
+        lpf.addLayout(self._row([QLabel("Device:"), self.push_remote, self.chk_push_all, self.btn_push_folder]))
+        box_push.setLayout(lpf)
+
         # traces
         box_traces = QGroupBox("Traces on Device")
         lt = QVBoxLayout()
-        lt.addLayout(self._row([self.btn_refresh_traces]))
-        lt.addWidget(self.trace_list)
+        lt.addLayout(self._row([self.btn_refresh_traces, self.btn_sync_traces, self.chk_watch]))
+        tab_traces = QWidget(); ltt = QVBoxLayout(tab_traces); ltt.setContentsMargins(0, 0, 0, 0)
+        ltt.addLayout(self._row([QLabel("Filter:"), self.trace_filter]))
+        ltt.addWidget(self.trace_list)
+        tab_browse = QWidget(); ltb = QVBoxLayout(tab_browse); ltb.setContentsMargins(0, 0, 0, 0)
+        ltb.addLayout(self._row([self.remote_target, self.btn_remote_refresh, self.btn_remote_pull]))
+        ltb.addWidget(self.remote_tree)
+        self.trace_tabs.addTab(tab_traces, "Traces")
+        self.trace_tabs.addTab(tab_browse, "Browse Device")
+        tab_catalog = QWidget(); ltc = QVBoxLayout(tab_catalog); ltc.setContentsMargins(0, 0, 0, 0)
+        ltc.addLayout(self._row([QLabel("Search:"), self.catalog_search, self.catalog_since]))
+        ltc.addLayout(self._row([self.btn_trace_stats, self.btn_export, self.chk_export_events]))
+        ltc.addWidget(self.catalog_table)
+        self.trace_tabs.addTab(tab_catalog, "Pulled (Catalog)")
+        self._catalog_tab = tab_catalog
+        lt.addWidget(self.trace_tabs)
         lt.addLayout(self._row([QLabel("Pull to:"), self.pull_dir, self.btn_choose_dir, self.btn_pull, self.chk_open_insights]))
+        lt.addLayout(self._row([QLabel("Parallel pulls:"), self.max_pulls, QLabel("per device:"), self.max_pulls_device, self.chk_verify]))
+        lt.addWidget(self.transfer_table)
         box_traces.setLayout(lt)
 
         root.addWidget(box_paths)
         root.addWidget(box_conn)
         root.addWidget(box_args)
+        root.addWidget(box_push)
         root.addWidget(box_traces)
         root.addWidget(QLabel("Log"))
         root.addWidget(self.log)
@@ -242,11 +2883,28 @@ class App(QWidget):
         self.btn_browse_insights.clicked.connect(self.pick_insights)
         self.btn_detect_devices.clicked.connect(self.on_list_devices)
         self.btn_list_packages.clicked.connect(self.on_list_packages)
+        self.btn_force_refresh.clicked.connect(self.on_force_refresh)
         self.btn_write_cmd.clicked.connect(self.on_write_cmd)
+        self.btn_push_choose.clicked.connect(self.on_choose_push_dir)
+        self.btn_push_folder.clicked.connect(self.on_push_folder)
         self.btn_refresh_traces.clicked.connect(self.on_refresh_traces)
+        self.btn_sync_traces.clicked.connect(self.on_sync_traces)
+        self.chk_watch.toggled.connect(self.on_watch_traces)
+        self.trace_filter.textChanged.connect(self.trace_proxy.set_pattern)
         self.btn_choose_dir.clicked.connect(self.on_choose_dir)
         self.btn_pull.clicked.connect(self.on_pull_trace)
+        self.btn_remote_refresh.clicked.connect(self.on_remote_refresh)
+        self.btn_remote_pull.clicked.connect(self.on_remote_pull)
+        self.catalog_search.textChanged.connect(self.on_search_catalog)
+        self.catalog_since.currentIndexChanged.connect(self.on_search_catalog)
+        self.catalog_table.cellDoubleClicked.connect(self.on_catalog_open)
+        self.btn_trace_stats.clicked.connect(self.on_trace_stats)
+        self.btn_export.clicked.connect(self.on_export_insights)
+        self.trace_tabs.currentChanged.connect(lambda i: self.trace_tabs.widget(i) is self._catalog_tab and self.on_search_catalog())
+        self.max_pulls.valueChanged.connect(self._update_transfer_limits)
+        self.max_pulls_device.valueChanged.connect(self._update_transfer_limits)
         self.device_table.itemSelectionChanged.connect(self.on_device_selected)
+        self.chk_track_devices.toggled.connect(self.on_track_devices)
         self.pkg_list.itemClicked.connect(lambda it: self.package.setText(it.text()))
 
     # -------------------- actions --------------------
@@ -262,51 +2920,173 @@ class App(QWidget):
             self.insights_path.setText(path)
 
     def on_list_devices(self):
+        self._list_devices()
+
+    def _list_devices(self, prefer:str|None=None):
+        # prefer: serial to keep selected (revalidating restored state) instead of the first row
         try:
             uaft = self._require_uaft()
-            devs = uaft.devices()
-            self.device_table.setRowCount(0)
-            for d in devs:
-                # fetch human-readable make/model using adb
-                make, model = self._adb_device_info(d)
-                row = self.device_table.rowCount()
-                self.device_table.insertRow(row)
-                self.device_table.setItem(row, 0, QTableWidgetItem(make))
-                self.device_table.setItem(row, 1, QTableWidgetItem(model))
-                self.device_table.setItem(row, 2, QTableWidgetItem(d))
-            if devs:
-                self.device_table.selectRow(0)
-                self.serial.setText(devs[0])
-            self._log(f"Found {len(devs)} device(s)")
         except Exception as e:
-            if "UnrealAndroidFileTool" in str(e) or "valid UnrealAndroidFileTool path" in str(e):
-                self._err("Pick UnrealAndroidFileTool.exe first (Tool Paths → Browse UAFT…) then try again.")
-            else:
-                self._err(e)
-        except Exception as e:
-            # Friendlier message if UAFT is missing
-            if "UnrealAndroidFileTool" in str(e) or "valid UnrealAndroidFileTool path" in str(e):
-                self._err("Pick UnrealAndroidFileTool.exe first (Tool Paths → Browse UAFT…) then try again.")
-            else:
-                self._err(e)
+            self._err_uaft(e)
+            return
+        self._prefer_serial = prefer
+        self.device_table.setRowCount(0)
+        key = ("devices", uaft.stamp)
+        cached = self._cache.get(key)
+        if cached is not None:
+            for info in cached:
+                self._add_device_row(info)
+            self._log(f"Found {len(cached)} device(s) (cached)")
+            return
+        rows = []
+
+        def add(info):
+            rows.append(info)
+            self._add_device_row(info)
+
+        def done(n):
+            self._cache.put(key, rows)
+            self._remember_devices(rows)
+            self._state.data["device_list"] = [d for _, _, d in rows]
+            self._log(f"Found {n} device(s)")
+
+        known = dict(self._state.data["devices"])
+        self._submit(self._discover_devices, uaft, known, on_progress=add, on_done=done,
+                     on_error=self._err_uaft, busy=self.btn_detect_devices)
+
+    def on_force_refresh(self):
+        self._cache.invalidate()
+        self._uaft = None
+        self.on_list_devices()
+
+    def _discover_devices(self, uaft:UAFT, known:dict[str,list[str]], progress) -> int:
+        # worker thread: fetch human-readable make/model using adb, one row per device as it completes;
+        # make/model never change for a serial, so ones already in the inventory skip adb
+        devs = uaft.devices()
+        for d in devs:
+            if d in known:
+                progress((*known[d], d))
+        decorate_devices([d for d in devs if d not in known], progress)
+        return len(devs)
+
+    def _remember_devices(self, rows:list[tuple[str,str,str]]):
+        inv = self._state.data["devices"]
+        for make, model, d in rows:
+            if make not in ("?", "…"):
+                inv[d] = [make, model]
+        self._save_timer.start()
+
+    def _add_device_row(self, info:tuple[str,str,str]):
+        make, model, d = info
+        row = self._device_row(d)
+        if row < 0:
+            row = self.device_table.rowCount()
+            self.device_table.insertRow(row)
+            self.device_table.setItem(row, 2, QTableWidgetItem(d))
+            self.device_table.setItem(row, 3, QTableWidgetItem(""))
+        self.device_table.setItem(row, 0, QTableWidgetItem(make))
+        self.device_table.setItem(row, 1, QTableWidgetItem(model))
+        if self._prefer_serial:
+            if d == self._prefer_serial:
+                self.device_table.selectRow(row)
+        elif self.device_table.currentRow() < 0:
+            self.device_table.selectRow(row)
+            self.serial.setText(d)
+
+    def _device_row(self, serial:str) -> int:
+        for row in range(self.device_table.rowCount()):
+            if self.device_table.item(row, 2).text() == serial:
+                return row
+        return -1
+
+    def on_track_devices(self, on:bool):
+        if self._tracker is not None:
+            self._tracker.stop()
+            self._tracker = None
+        if on:
+            self._tracker = DeviceTracker()
+            self._submit(self._tracker.run, on_progress=self._apply_device_snapshot)
+            self._log("Tracking adb devices")
+
+    def _apply_device_snapshot(self, devs:list[dict[str,str]]):
+        # incremental update: drop unplugged rows, add new ones, refresh state
+        states = {d["serial"]: d for d in devs}
+        changed = set()
+        for row in reversed(range(self.device_table.rowCount())):
+            serial = self.device_table.item(row, 2).text()
+            if serial not in states:
+                self.device_table.removeRow(row)
+                changed.add(serial)
+                self._log(f"Device disconnected: {serial}")
+        fresh = []
+        for serial, d in states.items():
+            row = self._device_row(serial)
+            was = self.device_table.item(row, 3).text() if row >= 0 else None
+            if row < 0:
+                model = d.get("model", "").replace("_", " ") or serial
+                self._add_device_row(("…", model, serial))
+                row = self._device_row(serial)
+                self._log(f"Device connected: {serial} ({d['state']})")
+            elif was and was != d["state"]:
+                self._log(f"Device {serial}: {was} -> {d['state']}")
+            self.device_table.setItem(row, 3, QTableWidgetItem(d["state"]))
+            if was != d["state"]:
+                changed.add(serial)
+            if d["state"] == "device" and was != "device":
+                fresh.append(serial)
+        if changed:
+            # device list and those devices' package lists are stale now
+            self._cache.invalidate(lambda k: k[0] == "devices" or k[-1] in changed)
+        if fresh:
+            def decorated(info):
+                self._add_device_row(info)
+                self._remember_devices([info])
+            self._submit(decorate_devices, fresh, on_progress=decorated)
 
     def on_list_packages(self):
+        self._list_packages()
+
+    def _list_packages(self, prefer:str|None=None):
+        # prefer: package to keep selected (revalidating restored state) instead of the first one
         try:
             uaft = self._require_uaft()
-            dev = self.serial.text().strip() or None
-            pkgs = uaft.packages(dev)
-            self.pkg_list.clear()
-            for p in pkgs:
-                self.pkg_list.addItem(QListWidgetItem(p))
-            if pkgs:
-                self.pkg_list.setCurrentRow(0)
-                self.package.setText(pkgs[0])
-            self._log(f"Found {len(pkgs)} package(s) with AFS")
         except Exception as e:
-            if "UnrealAndroidFileTool" in str(e) or "valid UnrealAndroidFileTool path" in str(e):
-                self._err("Pick UnrealAndroidFileTool.exe first (Tool Paths → Browse UAFT…) then try again.")
-            else:
-                self._err(e)
+            self._err_uaft(e)
+            return
+        dev = self.serial.text().strip() or None
+        self._prefer_package = prefer
+        self.pkg_list.clear()
+        key = ("packages", uaft.stamp, dev)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._add_packages(cached)
+            self._log(f"Found {len(cached)} package(s) with AFS (cached)")
+            return
+        pkgs = []
+
+        def add(batch):
+            pkgs.extend(batch)
+            self._add_packages(batch)
+
+        def done(n):
+            self._cache.put(key, pkgs)
+            self._state.data["packages"][dev or ""] = pkgs
+            self._save_timer.start()
+            self._log(f"Found {n} package(s) with AFS")
+
+        self._submit(stream_batches, uaft.iter_packages(dev), on_progress=add, on_done=done,
+                     on_error=self._err_uaft, busy=self.btn_list_packages)
+
+    def _add_packages(self, pkgs:list[str]):
+        first = self.pkg_list.count() == 0
+        for p in pkgs:
+            self.pkg_list.addItem(QListWidgetItem(p))
+        if self._prefer_package:
+            if self._prefer_package in pkgs:
+                self.pkg_list.setCurrentRow(self.pkg_list.count() - len(pkgs) + pkgs.index(self._prefer_package))
+        elif first and pkgs:
+            self.pkg_list.setCurrentRow(0)
+            self.package.setText(pkgs[0])
 
     def on_device_selected(self):
         row = self.device_table.currentRow()
@@ -314,24 +3094,10 @@ class App(QWidget):
             serial = self.device_table.item(row, 2).text()
             self.serial.setText(serial)
 
-    def _adb_device_info(self, serial:str):
-        try:
-            code, out, err = run(["adb", "-s", serial, "shell", "getprop", "ro.product.manufacturer"])
-            make = out.strip() if code == 0 else "?"
-            code, out, err = run(["adb", "-s", serial, "shell", "getprop", "ro.product.model"])
-            model = out.strip() if code == 0 else serial
-            return make, model
-        except Exception:
-            return "?", serial
-
     def on_write_cmd(self):
         try:
             uaft = self._require_uaft()
-            serial = self.serial.text().strip() or None
-            ip = None if serial else (self.ip.text().strip() or None)
-            port = self.port.text().strip() or None
-            pkg = self.package.text().strip()
-            token = self.security_token.text().strip() or None
+            serial, ip, port, pkg, token = self._conn()
             if not pkg:
                 raise RuntimeError("Package is required")
             if not self._valid_package(pkg):
@@ -343,26 +3109,95 @@ class App(QWidget):
                 raise RuntimeError("Please enter trace arguments to write to UECommandLine.txt")
             tmp = Path(Path.home()/"UECommandLine.txt")
             tmp.write_text(content, encoding="utf-8")
-            out = uaft.push_commandfile(serial, ip, port, pkg, token, str(tmp))
+        except Exception as e:
+            self._err(e)
+            return
+        key = target_key((serial, ip, port, pkg, token))
+
+        def pushed(out):
+            # the catalog files later pulls from this target under the command line that produced them
+            self._state.data["command_lines"][key] = content
+            self._save_timer.start()
             self._log("Pushed UECommandLine.txt to ^commandfile\n" + out)
+
+        self._submit(uaft.push_commandfile, serial, ip, port, pkg, token, str(tmp),
+                     on_done=pushed, busy=self.btn_write_cmd)
+
+    def on_choose_push_dir(self):
+        d = QFileDialog.getExistingDirectory(self, "Choose folder to push", self.push_local.text())
+        if d:
+            self.push_local.setText(d)
+
+    def on_push_folder(self):
+        try:
+            uaft = self._require_uaft()
+            conn = self._conn()
+            if not conn[3]:
+                raise RuntimeError("Package is required")
+            local = Path(self.push_local.text().strip())
+            if not self.push_local.text().strip() or not local.is_dir():
+                raise RuntimeError(f"Local folder not found: {local}")
+            remote = self.push_remote.text().strip()
+            if not remote.startswith("^"):
+                raise RuntimeError("Device path must start with an AFS root such as ^project or ^saved")
         except Exception as e:
             self._err(e)
+            return
+
+        def pushed(p):
+            done, total, path, error = p
+            if error:
+                self.log.append(f"<span style='color:#b00;'>Push failed: {path}: {error}</span>")
+            else:
+                self._log(f"[{done}/{total}] Pushed {path}")
+
+        def finished(result):
+            n, unchanged, failures = result
+            self._log(f"Folder push: {n} pushed, {unchanged} unchanged" + (f", {len(failures)} failed" if failures else ""))
+
+        self._log(f"Pushing changes in {local} to {remote}…")
+        self._submit(push_folder, uaft, conn, local, remote, self._push_manifest, self.chk_push_all.isChecked(),
+                     on_progress=pushed, on_done=finished, busy=self.btn_push_folder)
 
     def on_refresh_traces(self):
         try:
             uaft = self._require_uaft()
-            serial = self.serial.text().strip() or None
-            ip = None if serial else (self.ip.text().strip() or None)
-            port = self.port.text().strip() or None
-            pkg = self.package.text().strip()
-            token = self.security_token.text().strip() or None
-            traces = uaft.list_traces(serial, ip, port, pkg, token)
-            self.trace_list.clear()
-            for f in traces:
-                self.trace_list.addItem(QListWidgetItem(f))
-            self._log(f"Found {len(traces)} trace(s) under ^saved/Traces")
         except Exception as e:
             self._err(e)
+            return
+        conn = self._conn()
+        key = target_key(conn)
+        if key != self._trace_target:
+            self.trace_model.clear()   # another device/package: nothing to diff against
+            self._trace_target = key
+        seen:list[RemoteEntry] = []
+
+        def add(batch:list[RemoteEntry]):
+            self._stability.observe(key, batch)
+            seen.extend(batch)
+            self.trace_model.upsert(batch, lambda e: self._trace_flags(key, e))
+
+        def done(n):
+            if self._trace_target == key:
+                self.trace_model.retain({e.path for e in seen})
+                self.trace_model.set_info(self._pulled_info(key))
+            self._state.data["traces"][key] = [[e.path, e.size, e.stamp] for e in seen]
+            self._save_timer.start()
+            self._log(f"Found {n} trace(s) under ^saved/Traces")
+
+        self._submit(stream_batches, uaft.iter_trace_entries(*conn), on_progress=add, on_done=done,
+                     busy=self.btn_refresh_traces)
+
+    def _pulled_info(self, key:str) -> dict[str,str]:
+        # summaries of traces already pulled into the current Pull to folder
+        try:
+            records = self._manifest(Path(self.pull_dir.text().strip())).data["targets"].get(key, {})
+        except OSError:
+            return {}
+        return {remote: utrace_summary(rec["info"]) for remote, rec in records.items() if rec.get("info")}
+
+    def _trace_flags(self, key:str, e:RemoteEntry) -> int:
+        return TraceListModel.GROWING if self._stability.state(key, e.path) == "growing" else 0
 
     def on_choose_dir(self):
         d = QFileDialog.getExistingDirectory(self, "Choose destination folder", self.pull_dir.text())
@@ -371,23 +3206,529 @@ class App(QWidget):
 
     def on_pull_trace(self):
         try:
-            it = self.trace_list.currentItem()
-            if not it:
-                raise RuntimeError("Select a trace in the list first")
-            remote_path = it.text()
+            rows = [self.trace_proxy.mapToSource(ix).row() for ix in self.trace_list.selectionModel().selectedRows()]
+            if not rows:
+                raise RuntimeError("Select one or more traces in the list first")
+            self._require_uaft()
+            dest = Path(self.pull_dir.text().strip())
+        except Exception as e:
+            self._err(e)
+            return
+        conn = self._conn()
+        entries = [self.trace_model.entry(r) for r in rows]
+        self._queue_pulls([Transfer(conn, e.path, dest, e.size, e.stamp) for e in entries])
+
+    # -------------------- remote browser --------------------
+    def _list_remote_dir(self, path:str, on_done, on_error):
+        # RemoteTreeModel.fetchMore() calls this when a folder is expanded for the first time
+        try:
+            uaft = self._require_uaft()
+            if self._browse_conn is None:
+                conn = self._conn()
+                if not conn[3]:
+                    raise RuntimeError("Enter or select a package first")
+                self._browse_conn = conn
+        except Exception as e:
+            on_error(e)
+            self._err(e)
+            return
+        conn, key = self._browse_conn, target_key(self._browse_conn)
+        self.remote_target.setText(f"Browsing {key}")
+
+        def done(entries:list[RemoteEntry]):
+            # these listings count towards "has this file stopped growing" for pulls from here
+            self._stability.observe(key, [e for e in entries if not e.is_dir])
+            on_done(entries)
+
+        def failed(e):
+            on_error(e)
+            self._log(f"Can't list {path}: {e}")
+
+        self._submit(uaft.list_dir, *conn, path, on_done=done, on_error=failed)
+
+    def on_remote_refresh(self):
+        index = self.remote_tree.currentIndex()
+        if (not index.isValid() or self._browse_conn is None
+                or target_key(self._browse_conn) != target_key(self._conn())):
+            self._browse_conn = None
+            self.remote_target.setText("Expand a folder to list it")
+            self.remote_model.reset()
+            return
+        self.remote_model.refresh(index.siblingAtColumn(0))
+
+    def on_remote_pull(self):
+        try:
+            entries = [self.remote_model.entry(ix) for ix in self.remote_tree.selectionModel().selectedRows()]
+            files = [e for e in entries if e is not None and not e.is_dir]
+            if not files:
+                raise RuntimeError("Select one or more files in the device tree first")
+            self._require_uaft()
+            dest = Path(self.pull_dir.text().strip())
+        except Exception as e:
+            self._err(e)
+            return
+        if len(files) < len(entries):
+            self._log(f"Skipping {len(entries) - len(files)} folder(s); only files can be pulled")
+        self._queue_pulls([Transfer(self._browse_conn, e.path, dest, e.size, e.stamp) for e in files])
+
+    # -------------------- catalog --------------------
+    def on_search_catalog(self, *_):
+        if self._catalog is None:
+            return
+        try:
+            rows = self._catalog.search(self.catalog_search.text(), CATALOG_SINCE[self.catalog_since.currentText()])
+        except sqlite3.Error as e:
+            self._log(f"Catalog search failed: {e}")
+            return
+        t = self.catalog_table
+        t.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            device = " ".join(x for x in (row["make"], row["model"]) if x) or row["serial"]
+            cells = (row["pulled_at"].replace("T", " "), device, row["package"], row["remote"],
+                     _fmt_bytes(row["size"] or 0), row["local"])
+            for c, text in enumerate(cells):
+                item = QTableWidgetItem(text or "")
+                if c == 1:
+                    item.setToolTip(row["serial"])
+                elif c == 3:
+                    tip = [utrace_summary(row), row["trace_command_line"] and f"Ran with: {row['trace_command_line']}",
+                           row["command_line"] and f"UECommandLine.txt:\n{row['command_line']}"]
+                    item.setToolTip("\n".join(x for x in tip if x))
+                t.setItem(r, c, item)
+
+    def on_catalog_open(self, row:int, _col:int):
+        local = Path(self.catalog_table.item(row, 5).text())
+        if not local.is_file():
+            self._err(f"{local} is no longer on disk")
+        elif not self.insights_path.text().strip():
+            self._err("Set the UnrealInsights executable first")
+        else:
+            self._open_insights(local)
+
+    def _selected_catalog_traces(self) -> list[Path]:
+        rows = sorted({ix.row() for ix in self.catalog_table.selectedIndexes()})
+        paths = [Path(self.catalog_table.item(r, 5).text()) for r in rows]
+        paths = list(dict.fromkeys(p for p in paths if p.suffix == ".utrace" and p.is_file()))
+        if not paths:
+            raise RuntimeError("Select one or more pulled .utrace files in the catalog first")
+        return paths
+
+    def on_trace_stats(self):
+        try:
+            paths = self._selected_catalog_traces()
+        except Exception as e:
+            self._err(e)
+            return
+        todo = []
+        for p in paths:
+            try:
+                cached = self._manifest(p.parent).stats(p)
+            except OSError:
+                cached = None
+            if cached is None:
+                todo.append(p)
+            else:
+                self._log_stats(p, cached)
+        if not todo:
+            return
+
+        def scanned(r):
+            path, result = Path(r[0]), r[1]
+            if isinstance(result, str):
+                self._log(f"Stats for {path.name} failed: {result}")
+                return
+            try:
+                self._manifest(path.parent).record_stats(path, result)
+            except OSError as e:
+                self._log(f"Warning: could not cache stats for {path.name}: {e}")
+            self._log_stats(path, result)
+
+        self._log(f"Scanning {len(todo)} trace(s)…")
+        self._submit(scan_utrace_stats, todo, on_progress=scanned, busy=self.btn_trace_stats)
+
+    def on_export_insights(self):
+        try:
+            paths = self._selected_catalog_traces()
+            exe = Path(self.insights_path.text().strip())
+            if not self.insights_path.text().strip() or not exe.is_file():
+                raise RuntimeError("Set the UnrealInsights executable first")
+        except Exception as e:
+            self._err(e)
+            return
+        kinds = INSIGHTS_DEFAULT_EXPORTS + (("timing_events",) if self.chk_export_events.isChecked() else ())
+
+        def exported(r):
+            trace, result = Path(r[0]), r[1]
+            if isinstance(result, str):
+                self.log.append(f"<span style='color:#b00;'>Export failed: {trace.name}: {result}</span>")
+            else:
+                paths, hits = result
+                cached = f" ({hits} of {len(paths)} from cache)" if hits else ""
+                self._log(f"Exported {trace.name}: {', '.join(p.name for p in paths)}{cached}")
+
+        self._log(f"Exporting {len(paths)} trace(s) with UnrealInsights (headless, {INSIGHTS_MAX_PARALLEL} at a time)…")
+        digests = self._known_digests(paths)
+        self._submit(export_traces, exe, paths, kinds, on_progress=exported, cache=self._export_cache, digests=digests,
+                     on_done=lambda results: self._log("Insights export finished"), busy=self.btn_export)
+
+    def _known_digests(self, paths:list[Path]) -> dict[str,str]:
+        # hashes the trace store already knows, so cache lookups don't re-read multi-GB traces
+        digests = {}
+        for p in paths:
+            try:
+                digest = self._store(p.parent).digest_of(p)
+            except (OSError, ValueError):
+                digest = None
+            if digest:
+                digests[str(p)] = digest
+        return digests
+
+    def _log_stats(self, path:Path, stats:dict):
+        threads = sorted(stats["threads"].items(), key=lambda kv: -kv[1][2])
+        top = ", ".join(f"{tid}: {_fmt_bytes(t[2])}" for tid, t in threads[:5])
+        events = sorted(stats["events"].items(), key=lambda kv: -kv[1][1])
+        heaviest = ", ".join(f"{name} {_fmt_bytes(e[1])} ({e[0]:,})" for name, e in events[:8])
+        undecoded = f", {_fmt_bytes(stats['undecoded'])} undecoded" if stats["undecoded"] else ""
+        self._log(f"{path.name}: {stats['packets']} packets, {_fmt_bytes(stats['bytes'])} on disk, "
+                  f"{_fmt_bytes(stats['decoded'])} decoded; {len(threads)} thread(s), largest {top or '-'}; "
+                  f"{len(events)} event type(s){undecoded}, heaviest {heaviest or '-'}")
+
+    def on_sync_traces(self):
+        try:
+            uaft = self._require_uaft()
+            conn = self._conn()
+            if not conn[3]:
+                raise RuntimeError("Package is required")
+            dest = Path(self.pull_dir.text().strip())
+        except Exception as e:
+            self._err(e)
+            return
+        self._log("Sync: listing ^saved/Traces…")
+        self._submit(self._plan_sync, uaft, conn, dest,
+                     on_done=lambda plan: self._start_sync(plan, dest), busy=self.btn_sync_traces)
+
+    def _plan_sync(self, uaft:UAFT, conn:tuple, dest:Path) -> tuple[list[Transfer],int]:
+        # worker thread: everything listed that the manifest doesn't already cover
+        manifest = self._manifest(dest)
+        key = target_key(conn)
+        todo, skipped = [], 0
+        entries = list(uaft.iter_trace_entries(*conn))
+        self._stability.observe(key, entries)
+        for e in entries:
+            if manifest.is_current(key, e):
+                skipped += 1
+            else:
+                todo.append(Transfer(conn, e.path, dest, e.size, e.stamp))
+        return todo, skipped
+
+    def _start_sync(self, plan:tuple[list[Transfer],int], dest:Path):
+        todo, skipped = plan
+        self._log(f"Sync: {len(todo)} new/changed, {skipped} already in {dest}")
+        if todo:
+            self._queue_pulls(todo)
+
+    def on_watch_traces(self, on:bool):
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+            self._log("Stopped watching for traces")
+        if not on:
+            return
+        try:
             uaft = self._require_uaft()
-            serial = self.serial.text().strip() or None
-            ip = None if serial else (self.ip.text().strip() or None)
-            port = self.port.text().strip() or None
-            pkg = self.package.text().strip()
-            token = self.security_token.text().strip() or None
+            conn = self._conn()
+            if not conn[3]:
+                raise RuntimeError("Package is required")
             dest = Path(self.pull_dir.text().strip())
-            local = uaft.pull_trace(serial, ip, port, pkg, token, remote_path, dest)
-            self._log(f"Pulled {remote_path} -> {local}")
-            if self.chk_open_insights.isChecked() and self.insights_path.text().strip():
-                self._open_insights(local)
         except Exception as e:
+            self.chk_watch.setChecked(False)
             self._err(e)
+            return
+        watcher = TraceWatcher(uaft, conn, self._stability, self._manifest(dest))
+        self._watcher = watcher
+        failures = []
+
+        def report(event):
+            kind, payload = event
+            if kind == "ready":
+                failures.clear()
+                n = self._queue_pulls([Transfer(conn, e.path, dest, e.size, e.stamp) for e in payload],
+                                      open_insights=True)
+                if n:
+                    self._log(f"Watch: {n} new trace(s) finished on {target_key(conn)}")
+            elif not failures:   # log the first failure of a streak only
+                failures.append(payload)
+                self._log(f"Watch: listing failed ({payload}); retrying every {WATCH_MAX_INTERVAL:g}s")
+
+        self._submit(watcher.run, on_progress=report)
+        self._log(f"Watching {target_key(conn)} ^saved/Traces; new traces go to {dest}")
+
+    def _manifest(self, folder:Path) -> TraceManifest:
+        with self._manifests_lock:
+            key = str(folder.resolve())
+            if key not in self._manifests:
+                self._manifests[key] = TraceManifest(folder)
+            return self._manifests[key]
+
+    def _store(self, folder:Path) -> TraceStore:
+        with self._manifests_lock:
+            key = str(folder.resolve())
+            if key not in self._stores:
+                self._stores[key] = TraceStore(folder)
+            return self._stores[key]
+
+    def _queue_pulls(self, transfers:list[Transfer], open_insights:bool=False) -> int:
+        # the same file can be asked for twice (sync + watcher, double clicks); pull it once
+        transfers = [t for t in transfers if t.key not in self._inflight]
+        if not transfers:
+            return 0
+        self._inflight.update(t.key for t in transfers)
+        # a single pull may open Insights afterwards; a batch would spawn one window per trace
+        # unless the caller (the watcher) asks for it explicitly
+        if len(transfers) == 1 or open_insights:
+            self._open_after.update(t.id for t in transfers)
+        ready = []
+        for t in transfers:
+            self._add_transfer_row(t)
+            if self._stability.state(target_key(t.conn), t.remote) == "stable":
+                ready.append(t)
+            else:
+                # possibly still being written: hold it back until listings show it settled
+                self._unsettled.append(t)
+                self._set_transfer_status(t, "waiting for capture to finish")
+        if self._unsettled and not self._settle_timer.isActive():
+            self._settle_timer.start()
+        self._transfers.submit(ready)
+        running, waiting = self._transfers.counts()
+        held = len(transfers) - len(ready)
+        self._log(f"Queued {len(transfers)} pull(s) ({running} running, {waiting} waiting"
+                  + (f", {held} held until the capture stops growing)" if held else ")"))
+        return len(transfers)
+
+    def _poll_unsettled(self):
+        # timer tick: re-list each target that has held-back pulls, then release settled ones
+        if self._settle_polling or not self._unsettled:
+            if not self._unsettled:
+                self._settle_timer.stop()
+            return
+        try:
+            uaft = self._require_uaft()
+        except Exception as e:
+            self._settle_timer.stop()
+            for t in self._unsettled:
+                self._transfer_failed(t, e, queued=False)
+            self._unsettled.clear()
+            return
+        # only the pulls this listing covers are resolved by it; later arrivals wait for the next tick
+        polled = list(self._unsettled)
+        folders = {(target_key(t.conn), t.remote.rsplit("/", 1)[0]): t.conn for t in polled}
+        self._settle_polling = True
+
+        def listed(result:dict[str,list[RemoteEntry]]):
+            self._settle_polling = False
+            ready, done = [], set()
+            for t in polled:
+                if t not in self._unsettled:
+                    continue
+                key = target_key(t.conn)
+                e = next((x for x in result.get(key, []) if x.path == t.remote), None)
+                if e is None:
+                    self._transfer_failed(t, RuntimeError("no longer on the device"), queued=False)
+                    done.add(t.id)
+                elif self._stability.state(key, t.remote) == "stable":
+                    t.size, t.stamp = e.size, e.stamp
+                    self._set_transfer_status(t, "waiting")
+                    ready.append(t)
+                    done.add(t.id)
+            self._unsettled = [t for t in self._unsettled if t.id not in done]
+            if not self._unsettled:
+                self._settle_timer.stop()
+            if ready:
+                self._transfers.submit(ready)
+
+        def failed(e):
+            self._settle_polling = False
+            self._log(f"Waiting for traces to settle: listing failed ({e}), retrying")
+
+        self._submit(self._list_folders, uaft, folders, on_done=listed, on_error=failed)
+
+    def _list_folders(self, uaft:UAFT, folders:dict[tuple[str,str],tuple]) -> dict[str,list[RemoteEntry]]:
+        # worker thread: one-level listing of each folder holding a waiting pull, per target
+        result:dict[str,list[RemoteEntry]] = {}
+        for (key, folder), conn in folders.items():
+            try:
+                entries = [e for e in uaft.list_dir(*conn, folder) if not e.is_dir]
+            except CommandTimeout:
+                raise
+            except RuntimeError:
+                entries = []   # folder gone: its files are reported as no longer on the device
+            self._stability.observe(key, entries)
+            result.setdefault(key, []).extend(entries)
+        return result
+
+    def _update_transfer_limits(self):
+        self._transfers.set_limits(self.max_pulls.value(), self.max_pulls_device.value())
+
+    def _start_transfer(self, t:Transfer):
+        # called by TransferQueue when a slot frees up; finished() is only ever called
+        # from the GUI-thread callbacks below, so this runs on the GUI thread too
+        try:
+            uaft = self._require_uaft()
+        except Exception as e:
+            self._transfer_failed(t, e)
+            return
+        self._set_transfer_status(t, "running")
+        started = time.monotonic()
+
+        def failed(e):
+            if isinstance(e, IncompletePull):
+                self._transfers.finished(t)
+                self._pull_mismatch(t, str(e))
+            else:
+                self._transfer_failed(t, e)
+
+        self._submit(uaft.pull_trace, *t.conn, t.remote, t.dest, t.size, verify=self.chk_verify.isChecked(),
+                     on_progress=lambda p: self._show_transfer_progress(t, p),
+                     on_done=lambda local: self._on_pulled(t, local, time.monotonic() - started),
+                     on_error=failed)
+
+    def _on_pulled(self, t:Transfer, local:Path, elapsed:float):
+        self._transfers.finished(t)
+        size = local.stat().st_size if local.is_file() else 0
+        rate = size / elapsed if elapsed > 0 else 0.0
+        self._finish_transfer_row(t, size, rate)
+        # device + rate in the log makes slow cables/hubs stand out
+        self._log(f"Pulled {t.remote} -> {local} ({_fmt_bytes(size)} in {elapsed:.1f}s, {_fmt_bytes(rate)}/s from {t.device or 'device'})")
+        self._set_transfer_status(t, "hashing")
+
+        def hash_failed(e):
+            self._log(f"Warning: could not hash {local}: {e}")
+            self._pull_verified(t, local, None)
+
+        self._submit(self._hash_and_store, local, t.dest, pool=self._hash_pool,
+                     on_done=lambda r: self._pull_verified(t, local, *r), on_error=hash_failed)
+
+    def _hash_and_store(self, local:Path, folder:Path) -> tuple[str,bool,dict|None]:
+        # hash pool: (digest, whether the trace store already had this content, .utrace info)
+        digest = file_digest(local)
+        try:
+            duplicate = self._store(folder).adopt(local, digest)
+        except OSError:
+            duplicate = False   # no links on this filesystem: the pull stays a plain file
+        info = None
+        if local.suffix == ".utrace":
+            try:
+                info = read_utrace_info(local)
+            except (OSError, ValueError):
+                pass
+        return digest, duplicate, info
+
+    def _catalog_pull(self, t:Transfer, local:Path, digest:str|None, info:dict):
+        if self._catalog is None:
+            return
+        serial, key = t.conn[0] or t.conn[1] or "", target_key(t.conn)
+        make, model = self._state.data["devices"].get(serial, ("", ""))
+        try:
+            self._catalog.add(serial=serial, make=make, model=model, package=t.conn[3], remote=t.remote,
+                              local=str(local.absolute()), size=local.stat().st_size, hash=digest,
+                              command_line=self._state.data["command_lines"].get(key),
+                              platform=info.get("platform"), app_name=info.get("app_name"),
+                              build_version=info.get("build_version"), build_config=info.get("build_config"),
+                              trace_command_line=info.get("command_line"))
+        except (sqlite3.Error, OSError) as e:
+            self._log(f"Warning: could not add {local.name} to the catalog: {e}")
+            return
+        if self.trace_tabs.currentWidget() is self._catalog_tab:
+            self.on_search_catalog()
+
+    def _pull_mismatch(self, t:Transfer, why:str):
+        if t.attempts > PULL_RETRIES:
+            self._transfer_failed(t, RuntimeError(f"incomplete after {t.attempts} attempts ({why})"), queued=False)
+            return
+        t.attempts += 1
+        self._log(f"Pulled {t.remote} is incomplete ({why}); pulling again")
+        self._set_transfer_status(t, f"retry {t.attempts - 1}/{PULL_RETRIES}")
+        self._transfers.submit([t])
+
+    def _pull_verified(self, t:Transfer, local:Path, digest:str|None, duplicate:bool=False, info:dict|None=None):
+        self._inflight.discard(t.key)
+        self._set_transfer_status(t, "done (already stored)" if duplicate else "done")
+        if duplicate:
+            self._log(f"{local.name} has the same content as an earlier pull; stored once")
+        try:
+            self._manifest(t.dest).record(target_key(t.conn), t.remote, local, t.size, t.stamp,
+                                          **({"hash": digest} if digest else {}), **({"info": info} if info else {}))
+        except OSError as e:
+            self._log(f"Warning: could not update the pull manifest: {e}")
+        if info and self._trace_target == target_key(t.conn):
+            self.trace_model.set_info({t.remote: utrace_summary(info)})
+        self._catalog_pull(t, local, digest, info or {})
+        open_it = t.id in self._open_after and _trace_from_line(t.remote) is not None
+        self._open_after.discard(t.id)
+        if open_it and self.chk_open_insights.isChecked() and self.insights_path.text().strip():
+            self._open_insights(local)
+        self._log_queue_idle()
+
+    def _transfer_failed(self, t:Transfer, e:Exception, queued:bool=True):
+        if queued:
+            self._transfers.finished(t)
+        self._inflight.discard(t.key)
+        if self._watcher is not None and target_key(self._watcher.conn) == target_key(t.conn):
+            self._watcher.forget(t.remote)   # a watched capture gets another go on the next listing
+        self._open_after.discard(t.id)
+        self._set_transfer_status(t, "failed")
+        # keep the batch going; a dialog per failed file would bury the user
+        self.log.append(f"<span style='color:#b00;'>Pull failed: {t.remote}: {e}</span>")
+        self._log_queue_idle()
+
+    # -------------------- transfer table --------------------
+    def _add_transfer_row(self, t:Transfer):
+        row = self.transfer_table.rowCount()
+        self.transfer_table.insertRow(row)
+        self._transfer_rows[t.id] = row
+        bar = QProgressBar(); bar.setRange(0, 100); bar.setValue(0)
+        bar.setFormat(_fmt_bytes(t.size) if t.size else "")
+        self.transfer_table.setItem(row, 0, QTableWidgetItem(Path(t.remote).name))
+        self.transfer_table.setItem(row, 1, QTableWidgetItem(t.device))
+        self.transfer_table.setCellWidget(row, 2, bar)
+        self.transfer_table.setItem(row, 3, QTableWidgetItem(""))
+        self.transfer_table.setItem(row, 4, QTableWidgetItem("waiting"))
+        self.transfer_table.scrollToBottom()
+
+    def _set_transfer_status(self, t:Transfer, text:str):
+        row = self._transfer_rows.get(t.id)
+        if row is not None:
+            self.transfer_table.item(row, 4).setText(text)
+
+    def _show_transfer_progress(self, t:Transfer, p:TransferProgress):
+        row = self._transfer_rows.get(t.id)
+        if row is None:
+            return
+        bar = self.transfer_table.cellWidget(row, 2)
+        if p.total:
+            bar.setRange(0, 100)
+            bar.setValue(min(100, int(p.done * 100 / p.total)))
+            bar.setFormat(f"%p%  {_fmt_bytes(p.done)} / {_fmt_bytes(p.total)}")
+        else:
+            bar.setRange(0, 0)   # size unknown: busy indicator
+            bar.setFormat(_fmt_bytes(p.done))
+        self.transfer_table.item(row, 3).setText(f"{_fmt_bytes(p.rate)}/s")
+        eta = p.eta
+        self.transfer_table.item(row, 4).setText(f"{eta:.0f}s left" if eta is not None else "running")
+
+    def _finish_transfer_row(self, t:Transfer, size:int, rate:float):
+        row = self._transfer_rows.get(t.id)
+        if row is None:
+            return
+        bar = self.transfer_table.cellWidget(row, 2)
+        bar.setRange(0, 100); bar.setValue(100); bar.setFormat(_fmt_bytes(size))
+        self.transfer_table.item(row, 3).setText(f"{_fmt_bytes(rate)}/s")
+        self.transfer_table.item(row, 4).setText("done")
+
+    def _log_queue_idle(self):
+        # _inflight also covers pulls held for a settling capture and pulls being hashed
+        if not self._transfers.busy and not self._inflight:
+            self._log("All transfers finished")
 
     def _open_insights(self, trace_path:Path):
         exe = Path(self.insights_path.text().strip())
@@ -401,14 +3742,145 @@ class App(QWidget):
             self._err(e)
 
     def _require_uaft(self) -> UAFT:
-        p = Path(self.uaft_path.text().strip())
+        text = self.uaft_path.text().strip()
+        # reuse the validated driver while the path is unchanged and it was checked recently
+        if self._uaft is not None and str(self._uaft.uaft_path) == text and self._cache.get(("uaft", text)):
+            return self._uaft
+        p = Path(text)
         if not p.exists():
             raise RuntimeError("Pick UnrealAndroidFileTool.exe first (Tool Paths → Browse UAFT…). It's usually at Engine/Binaries/DotNET/Android/<platform>/UnrealAndroidFileTool.exe")
         if not p.is_file():
             raise RuntimeError("The selected UAFT path is a folder. Please select the UnrealAndroidFileTool executable (…/UnrealAndroidFileTool.exe)")
         if sys.platform.startswith("win") and p.suffix.lower() != ".exe":
             self._log("Warning: UAFT on Windows should be an .exe — make sure you picked UnrealAndroidFileTool.exe")
-        return UAFT(p)
+        self._uaft = UAFT(p, self._state.data.get("timeouts"))
+        self._cache.put(("uaft", text), True)
+        return self._uaft
+
+    def _conn(self) -> tuple[str|None,str|None,str|None,str,str|None]:
+        # (serial, ip, port, package, token) as UAFT._base_args expects them
+        serial = self.serial.text().strip() or None
+        ip = None if serial else (self.ip.text().strip() or None)
+        port = self.port.text().strip() or None
+        pkg = self.package.text().strip()
+        token = self.security_token.text().strip() or None
+        return serial, ip, port, pkg, token
+
+    def _submit(self, fn, *args, on_done=None, on_error=None, on_progress=None, busy:QWidget|None=None,
+                pool:QThreadPool|None=None, **kwargs) -> Job:
+        """Run fn(*args, **kwargs) on the worker pool (or `pool`); callbacks run on the GUI thread.
+
+        `busy` (usually the button that started the job) is disabled until it finishes.
+        """
+        job = Job(fn, *args, report=on_progress is not None, **kwargs)
+        self._jobs.add(job)   # keep the runnable and its signals alive until it reports back
+        if busy is not None:
+            busy.setEnabled(False)
+
+        def finish():
+            self._jobs.discard(job)
+            if busy is not None:
+                busy.setEnabled(True)
+
+        def done(result):
+            finish()
+            if on_done:
+                on_done(result)
+
+        def failed(e):
+            finish()
+            (on_error or self._err)(e)
+
+        job.signals.done.connect(done)
+        job.signals.failed.connect(failed)
+        if on_progress:
+            job.signals.progress.connect(on_progress)
+        (pool or self._pool).start(job)
+        return job
+
+    # -------------------- warm start --------------------
+    def _restore_state(self):
+        st = self._state.data
+        if not st["saved_at"]:
+            return
+        paths, c = st["paths"], st["connection"]
+        for field, value in ((self.uaft_path, paths.get("uaft")), (self.insights_path, paths.get("insights")),
+                             (self.pull_dir, paths.get("pull_dir")), (self.push_local, paths.get("push_local")),
+                             (self.push_remote, paths.get("push_remote")), (self.serial, c.get("serial")),
+                             (self.ip, c.get("ip")), (self.port, c.get("port")), (self.package, c.get("package"))):
+            if value:
+                field.setText(value)
+        if "open_insights" in st:
+            self.chk_open_insights.setChecked(bool(st["open_insights"]))
+        if "verify_pulls" in st:
+            self.chk_verify.setChecked(bool(st["verify_pulls"]))
+        if "pull_limits" in st:
+            self.max_pulls.setValue(st["pull_limits"][0]); self.max_pulls_device.setValue(st["pull_limits"][1])
+
+        # last-known listings, greyed out until UAFT confirms them
+        serial = self.serial.text().strip()
+        self.device_table.blockSignals(True)
+        for d in st["device_list"]:
+            make, model = st["devices"].get(d, ("?", d))
+            row = self.device_table.rowCount()
+            self.device_table.insertRow(row)
+            for col, text in enumerate((make, model, d, "cached")):
+                self.device_table.setItem(row, col, self._stale(QTableWidgetItem(text)))
+            if d == serial:
+                self.device_table.selectRow(row)
+        self.device_table.blockSignals(False)
+        for p in st["packages"].get(serial, []):
+            self.pkg_list.addItem(self._stale(QListWidgetItem(p)))
+        self._trace_target = target_key(self._conn())
+        # entries are [path, size, stamp]; older state files stored bare paths
+        restored = [RemoteEntry(*(f if isinstance(f, list) else [f])) for f in st["traces"].get(self._trace_target, [])]
+        self.trace_model.upsert(restored, lambda e: TraceListModel.STALE)
+        self.trace_model.set_info(self._pulled_info(self._trace_target))
+        self._log(f"Restored last session from {st['saved_at']} (stale, revalidating…)")
+        QTimer.singleShot(0, self._revalidate)
+
+    def _stale(self, item):
+        item.setForeground(Qt.GlobalColor.gray)
+        f = item.font(); f.setItalic(True); item.setFont(f)
+        return item
+
+    def _revalidate(self):
+        if not Path(self.uaft_path.text().strip()).is_file():
+            return
+        serial, pkg = self.serial.text().strip(), self.package.text().strip()
+        self._list_devices(prefer=serial or None)
+        self._list_packages(prefer=pkg or None)
+        if pkg:
+            self.on_refresh_traces()
+
+    def _save_state(self):
+        st = self._state.data
+        st["paths"] = {"uaft": self.uaft_path.text().strip(), "insights": self.insights_path.text().strip(),
+                       "pull_dir": self.pull_dir.text().strip(), "push_local": self.push_local.text().strip(),
+                       "push_remote": self.push_remote.text().strip()}
+        # the security token is deliberately not persisted
+        st["connection"] = {"serial": self.serial.text().strip(), "ip": self.ip.text().strip(),
+                            "port": self.port.text().strip(), "package": self.package.text().strip()}
+        st["open_insights"] = self.chk_open_insights.isChecked()
+        st["verify_pulls"] = self.chk_verify.isChecked()
+        st["pull_limits"] = [self.max_pulls.value(), self.max_pulls_device.value()]
+        self._state.save()
+
+    def closeEvent(self, event):
+        if self._tracker is not None:
+            self._tracker.stop()
+        if self._watcher is not None:
+            self._watcher.stop()
+        # the pools wait for their jobs on exit: drop the queued ones and kill the UAFT/Insights
+        # processes the running ones are blocked on, or a pull could keep the app alive for its
+        # whole timeout after the window is gone (and orphan UAFT in its own process group)
+        self._pool.clear()
+        self._hash_pool.clear()
+        _children.kill_all()
+        self._save_state()
+        if self._catalog is not None:
+            self._catalog.close()
+        super().closeEvent(event)
 
     def _valid_package(self, pkg:str) -> bool:
         # Very simple Android package validation: segments separated by '.', no spaces/colons
@@ -420,11 +3892,20 @@ class App(QWidget):
 
     def _err(self, e:Exception|str):
         text = str(e)
-        self.log.append(f"<span style='color:#b00;'>Error: {text}</span>")
-        QMessageBox.critical(self, "Error", text)
+        title = "Timed out" if isinstance(e, CommandTimeout) else "Error"
+        self.log.append(f"<span style='color:#b00;'>{title}: {text}</span>")
+        QMessageBox.critical(self, title, text)
+
+    def _err_uaft(self, e:Exception|str):
+        # Friendlier message if UAFT is missing
+        if "UnrealAndroidFileTool" in str(e) or "valid UnrealAndroidFileTool path" in str(e):
+            self._err("Pick UnrealAndroidFileTool.exe first (Tool Paths → Browse UAFT…) then try again.")
+        else:
+            self._err(e)
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()   # trace stats run in spawned worker processes
     try:
         app = QApplication(sys.argv)
         w = App(); w.show()
@@ -0,0 +1,36 @@
+"""Stand-in for UnrealInsights' headless export, driven by environment variables.
+
+Reads the commands from the -ExecOnAnalysisCompleteCmd=@=<file> response file and
+writes one small CSV per `TimingInsights.Export* "<path>"` line.
+
+FAKE_INSIGHTS_FAIL  exit with this code (after writing the CSVs) and complain on stderr
+FAKE_INSIGHTS_SKIP  command that writes nothing
+FAKE_INSIGHTS_LOG   file that gets one line per invocation (the trace)
+"""
+import os
+import sys
+from pathlib import Path
+
+
+def main(argv):
+    opts = dict(a.lstrip("-").split("=", 1) for a in argv if "=" in a)
+    if "-NoUI" not in argv or "-AutoQuit" not in argv or not opts.get("ExecOnAnalysisCompleteCmd", "").startswith("@="):
+        print(f"not a headless export: {argv}", file=sys.stderr)
+        return 2
+    trace = Path(opts["OpenTraceFile"])
+    if os.environ.get("FAKE_INSIGHTS_LOG"):
+        with open(os.environ["FAKE_INSIGHTS_LOG"], "a", encoding="utf-8") as f:
+            f.write(f"{trace}\n")
+    rsp = Path(opts["ExecOnAnalysisCompleteCmd"][2:])
+    for line in rsp.read_text(encoding="utf-8").splitlines():
+        command, _, out = line.partition(" ")
+        if command != os.environ.get("FAKE_INSIGHTS_SKIP"):
+            Path(out.strip('"')).write_text(f"command,trace\n{command},{trace.name}\n", encoding="utf-8")
+    code = int(os.environ.get("FAKE_INSIGHTS_FAIL", "0"))
+    if code:
+        print("LogTraceServices: Error: analysis failed", file=sys.stderr)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
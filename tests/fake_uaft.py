@@ -0,0 +1,51 @@
+"""Stand-in for UnrealAndroidFileTool, driven by environment variables.
+
+FAKE_UAFT_ROOT      folder playing the device; "^saved/x" is <root>/^saved/x
+FAKE_UAFT_LS        file whose lines are printed verbatim for any `ls`
+FAKE_UAFT_DEVICES   space-separated serials for `devices`
+FAKE_UAFT_CHUNK_DELAY  seconds to sleep between 64 KB chunks of a pull
+FAKE_UAFT_LOG       file that gets one line per invocation (the argv)
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+
+def main(argv):
+    if os.environ.get("FAKE_UAFT_LOG"):
+        with open(os.environ["FAKE_UAFT_LOG"], "a", encoding="utf-8") as f:
+            f.write(" ".join(argv) + "\n")
+    args = list(argv)
+    while args and args[0] in ("-s", "-ip", "-t", "-p", "-k"):
+        del args[:2]
+    cmd, rest = args[0], args[1:]
+    root = Path(os.environ.get("FAKE_UAFT_ROOT", "."))
+    if cmd == "devices":
+        print("\n".join(os.environ.get("FAKE_UAFT_DEVICES", "").split()))
+    elif cmd == "packages":
+        print("com.example.game")
+    elif cmd == "ls":
+        print(Path(os.environ["FAKE_UAFT_LS"]).read_text(encoding="utf-8"), end="")
+    elif cmd == "push":
+        dest = root/rest[1]
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(Path(rest[0]).read_bytes())
+    elif cmd == "pull":
+        src, dest = root/rest[0], Path(rest[1])/Path(rest[0]).name
+        delay = float(os.environ.get("FAKE_UAFT_CHUNK_DELAY", "0"))
+        with open(src, "rb") as fin, open(dest, "wb") as fout:
+            while block := fin.read(1 << 16):
+                fout.write(block)
+                fout.flush()
+                time.sleep(delay)
+    elif cmd == "hang":
+        time.sleep(60)
+    else:
+        print(f"unknown command {cmd}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,153 @@
+import asyncio
+import os
+import stat
+import struct
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+POSIX_ONLY = "stand-in executables are shell scripts"
+
+
+def make_executable(folder:Path, name:str, script:Path) -> Path:
+    """A shell wrapper that runs `script` with this interpreter, usable as a tool path."""
+    exe = folder/name
+    exe.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n', encoding="utf-8")
+    exe.chmod(exe.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return exe
+
+
+def make_fake_uaft(folder:Path) -> Path:
+    return make_executable(folder, "UnrealAndroidFileTool", HERE/"fake_uaft.py")
+
+
+def make_fake_insights(folder:Path) -> Path:
+    return make_executable(folder, "UnrealInsights", HERE/"fake_insights.py")
+
+
+class FakeEnv:
+    """Sets environment variables for the stand-ins and restores them afterwards."""
+    def __init__(self, **values):
+        self.values = {k: str(v) for k, v in values.items()}
+        self.saved = {}
+
+    def __enter__(self):
+        for k, v in self.values.items():
+            self.saved[k] = os.environ.get(k)
+            os.environ[k] = v
+        return self
+
+    def __exit__(self, *exc):
+        for k, v in self.saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+# .utrace builders: TRC2 header, TidPacket transport, protocol 5
+AUX_END = b"\x04"
+
+
+def important(uid:int, payload:bytes) -> bytes:
+    return struct.pack("<HH", uid, len(payload)) + payload
+
+
+def new_event(uid:int, logger:str, name:str, fields, flags:int=0) -> bytes:
+    """NewEvent record; fields are (name, offset, size, type info)."""
+    body = struct.pack("<HBBBB", uid, len(fields), flags, len(logger), len(name))
+    body += b"".join(struct.pack("<HHBB", off, size, ti, len(n)) for n, off, size, ti in fields)
+    body += logger.encode() + name.encode() + b"".join(f[0].encode() for f in fields)
+    return important(0, body)
+
+
+def aux(index:int, data:bytes) -> bytes:
+    return struct.pack("<I", len(data) << 13 | index << 8 | 2) + data
+
+
+def lz4_literals(data:bytes) -> bytes:
+    """A valid LZ4 block holding `data` as one literal run."""
+    if len(data) < 15:
+        return bytes([len(data) << 4]) + data
+    out, rest = bytearray([0xf0]), len(data) - 15
+    while rest >= 255:
+        out.append(255)
+        rest -= 255
+    out.append(rest)
+    return bytes(out) + data
+
+
+def packet(tid:int, payload:bytes, encode:bool=False) -> bytes:
+    if encode:
+        block = lz4_literals(payload)
+        return struct.pack("<HHH", 6 + len(block), tid | 0x8000, len(payload)) + block
+    return struct.pack("<HH", 4 + len(payload), tid) + payload
+
+
+def utrace(*packets:bytes, port:int=1980) -> bytes:
+    meta = struct.pack("<BBH", 2, 0, port)
+    return b"2CRT" + struct.pack("<H", len(meta)) + meta + bytes([3, 5]) + b"".join(packets)
+
+
+class FakeAdbServer:
+    """asyncio stand-in for the adb server's host protocol, on a free local port.
+
+    `devices` is the devices-l text, `props` serial -> getprop output for shell:, and
+    `tracking` the device lists sent, one per update, to track-devices clients.
+    """
+    def __init__(self, devices:str="", props:dict[str,str]|None=None, tracking=(), long_tracking:bool=True):
+        self.devices, self.props, self.tracking = devices, props or {}, list(tracking)
+        self.long_tracking = long_tracking
+        self.services:list[str] = []
+        self.port = None
+        self._server = None
+        self._writers = set()
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        for writer in self._writers:
+            writer.close()   # ends held-open tracking connections
+        self._server.close()
+        await self._server.wait_closed()
+
+    @staticmethod
+    def _block(text:str) -> bytes:
+        data = text.encode("utf-8")
+        return b"%04x" % len(data) + data
+
+    async def _request(self, reader) -> str:
+        n = int(await reader.readexactly(4), 16)
+        service = (await reader.readexactly(n)).decode("utf-8")
+        self.services.append(service)
+        return service
+
+    async def _serve(self, reader, writer):
+        self._writers.add(writer)
+        try:
+            service = await self._request(reader)
+            if service == "host:devices-l":
+                writer.write(b"OKAY" + self._block(self.devices))
+            elif service in ("host:track-devices-l", "host:track-devices"):
+                if service.endswith("-l") and not self.long_tracking:
+                    writer.write(b"FAIL" + self._block("unknown host service"))
+                else:
+                    writer.write(b"OKAY" + b"".join(self._block(devs) for devs in self.tracking))
+                    await writer.drain()
+                    await reader.read()   # held open until the client goes away
+            elif service.startswith("host:transport:") and service[15:] in self.props:
+                writer.write(b"OKAY")
+                await writer.drain()
+                await self._request(reader)
+                writer.write(b"OKAY" + self.props[service[15:]].encode("utf-8"))
+            else:
+                writer.write(b"FAIL" + self._block(f"device '{service.rpartition(':')[2]}' not found"))
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            self._writers.discard(writer)
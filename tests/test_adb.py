@@ -0,0 +1,64 @@
+import asyncio
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import UE_UAFT_Tool as tool
+from tests.support import POSIX_ONLY, FakeAdbServer, FakeEnv, make_executable
+
+DEVICES = ("R58M123 device usb:1-1 product:beyond1 model:SM_G973F device:beyond1 transport_id:3\n"
+           "emulator-5554 unauthorized transport_id:4\n")
+PROPS = {"R58M123": "samsung\r\nSM-G973F\r\n"}
+
+
+class AdbClientTest(unittest.IsolatedAsyncioTestCase):
+    async def test_devices(self):
+        async with FakeAdbServer(DEVICES) as adb:
+            devs = await tool.AdbClient(port=adb.port).devices()
+        self.assertEqual(devs[0], {"serial": "R58M123", "state": "device", "usb": "1-1", "product": "beyond1",
+                                   "model": "SM_G973F", "device": "beyond1", "transport_id": "3"})
+        self.assertEqual((devs[1]["serial"], devs[1]["state"]), ("emulator-5554", "unauthorized"))
+
+    async def test_shell_and_device_info(self):
+        async with FakeAdbServer(props=PROPS) as adb:
+            client = tool.AdbClient(port=adb.port)
+            self.assertEqual(await tool.adb_device_info_async("R58M123", client), ("samsung", "SM-G973F"))
+        self.assertEqual(adb.services, ["host:transport:R58M123",
+                                        "shell:getprop ro.product.manufacturer; getprop ro.product.model"])
+
+    async def test_fail_reply_raises(self):
+        async with FakeAdbServer() as adb:
+            client = tool.AdbClient(port=adb.port)
+            with self.assertRaisesRegex(tool.AdbError, "device 'GONE' not found"):
+                await client.shell("GONE", "true")
+            # a device adb doesn't know isn't retried through the adb binary
+            self.assertEqual(await tool.adb_device_info_async("GONE", client), ("?", "GONE"))
+
+    async def test_track_devices(self):
+        updates = ["R58M123\tdevice\n", "R58M123\tdevice\nemulator-5554\toffline\n"]
+        for long_tracking in (True, False):
+            async with FakeAdbServer(tracking=updates, long_tracking=long_tracking) as adb:
+                seen = []
+                async for devs in tool.AdbClient(port=adb.port).track_devices():
+                    seen.append([(d["serial"], d["state"]) for d in devs])
+                    if len(seen) == 2:
+                        break
+            self.assertEqual(seen, [[("R58M123", "device")], [("R58M123", "device"), ("emulator-5554", "offline")]])
+            self.assertEqual(adb.services[-1], "host:track-devices-l" if long_tracking else "host:track-devices")
+
+    @unittest.skipIf(sys.platform.startswith("win"), POSIX_ONLY)
+    async def test_falls_back_to_the_adb_binary(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            script = Path(tmp)/"adb.py"
+            script.write_text("print('google'); print('Pixel 8')\n", encoding="utf-8")
+            make_executable(Path(tmp), "adb", script)
+            async with FakeAdbServer() as adb:
+                port = adb.port   # nothing listens there once the server is closed
+            with FakeEnv(PATH=f"{tmp}:{tool.os.environ['PATH']}"):
+                info = await tool.adb_device_info_async("X1", tool.AdbClient(port=port))
+        self.assertEqual(info, ("google", "Pixel 8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
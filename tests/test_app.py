@@ -0,0 +1,91 @@
+import unittest
+from pathlib import Path
+
+import UE_UAFT_Tool as tool
+
+T1 = ("SERIAL1", None, None, "com.example.game", None)
+T2 = ("SERIAL2", None, None, "com.example.game", None)
+
+
+class FakeTimer:
+    def __init__(self):
+        self.active = False
+
+    def isActive(self):
+        return self.active
+
+    def start(self):
+        self.active = True
+
+    def stop(self):
+        self.active = False
+
+
+class FakeQueue:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, transfers):
+        self.submitted += transfers
+
+
+class SettleHarness:
+    """The state App._poll_unsettled works on, with the worker job captured instead of run."""
+    def __init__(self):
+        self._settle_polling = False
+        self._unsettled = []
+        self._settle_timer = FakeTimer()
+        self._stability = tool.StabilityTracker(settle=0)
+        self._transfers = FakeQueue()
+        self.failed, self.jobs = [], []
+
+    def _require_uaft(self):
+        return None
+
+    def _transfer_failed(self, t, e, queued=True):
+        self.failed.append((t, str(e)))
+
+    def _set_transfer_status(self, t, status):
+        pass
+
+    def _log(self, text):
+        pass
+
+    def _list_folders(self, uaft, folders):
+        raise AssertionError("runs on a worker")
+
+    def _submit(self, fn, *args, on_done=None, on_error=None, **kw):
+        self.jobs.append((args, on_done))
+
+    poll = tool.App._poll_unsettled
+
+
+class PollUnsettledTest(unittest.TestCase):
+    def test_pull_queued_during_the_listing_waits_for_the_next_one(self):
+        app = SettleHarness()
+        a = tool.Transfer(T1, "^saved/Traces/a.utrace", Path("a.utrace"))
+        b = tool.Transfer(T2, "^saved/Other/b.utrace", Path("b.utrace"))
+        app._unsettled.append(a)
+        app.poll()
+        (args, listed), = app.jobs
+        self.assertEqual(args[1], {(tool.target_key(T1), "^saved/Traces"): T1})
+        app._unsettled.append(b)   # queued while the listing is in flight, elsewhere
+        entry = tool.RemoteEntry(a.remote, 10, "2025-01-31 12:00")
+        app._stability.observe(tool.target_key(T1), [entry])
+        listed({tool.target_key(T1): [entry]})
+        self.assertEqual((app.failed, app._transfers.submitted, app._unsettled), ([], [a], [b]))
+        app.poll()   # b gets its own listing
+        self.assertEqual(app.jobs[1][0][1], {(tool.target_key(T2), "^saved/Other"): T2})
+
+    def test_missing_file_fails_only_its_own_pull(self):
+        app = SettleHarness()
+        a = tool.Transfer(T1, "^saved/Traces/a.utrace", Path("a.utrace"))
+        app._unsettled.append(a)
+        app.poll()
+        app.jobs[0][1]({tool.target_key(T1): []})
+        self.assertEqual([(t, e) for t, e in app.failed], [(a, "no longer on the device")])
+        self.assertEqual(app._unsettled, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import UE_UAFT_Tool as tool
+
+CONN = ("R58M123", None, None, "com.example.game", None)
+
+
+class TraceCatalogTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name)/"catalog.sqlite3"
+        self.catalog = tool.TraceCatalog(self.path)
+        self.catalog.add(serial="R58M123", make="samsung", model="SM-G973F", package="com.example.game",
+                         remote="^saved/Traces/boot.utrace", local="/t/boot.utrace", size=10, hash="h1",
+                         pulled_at="2025-01-30T10:00:00", platform="Android", build_config="Development",
+                         trace_command_line="-trace=cpu,gpu")
+        self.catalog.add(serial="ZY22", make="Google", model="Pixel 8", package="com.example.other",
+                         remote="^saved/Traces/menu_100.utrace", local="/t/menu_100.utrace", size=20, hash="h2",
+                         pulled_at="2025-01-31T10:00:00", platform="Android", build_config="Shipping")
+
+    def tearDown(self):
+        self.catalog.close()
+        self._tmp.cleanup()
+
+    def remotes(self, *args, **kw) -> list[str]:
+        return [r["remote"].rsplit("/", 1)[1] for r in self.catalog.search(*args, **kw)]
+
+    def test_search_matches_every_word_newest_first(self):
+        self.assertEqual(self.remotes(), ["menu_100.utrace", "boot.utrace"])
+        self.assertEqual(self.remotes("android"), ["menu_100.utrace", "boot.utrace"])
+        self.assertEqual(self.remotes("pixel shipp"), ["menu_100.utrace"])
+        if self.catalog.fts:
+            self.assertEqual(self.remotes("samsung pu"), [])   # words are prefixes, not substrings
+        self.assertEqual(self.remotes("samsung cpu"), ["boot.utrace"])
+        self.assertEqual(self.remotes(limit=1), ["menu_100.utrace"])
+
+    def test_like_fallback_without_fts(self):
+        self.catalog.fts = False
+        self.assertEqual(self.remotes("u_100"), ["menu_100.utrace"])   # _ is literal, not a wildcard
+        self.assertEqual(self.remotes("u%1"), [])
+        self.assertEqual(self.remotes("SM-G9 develop"), ["boot.utrace"])
+
+    def test_since_days(self):
+        self.catalog.add(remote="^saved/Traces/now.utrace", local="/t/now.utrace")
+        self.assertEqual(self.remotes(since_days=1), ["now.utrace"])
+
+    def test_rows_survive_reopening(self):
+        self.catalog.close()
+        self.catalog = tool.TraceCatalog(self.path)
+        row = self.catalog.search("boot")[0]
+        self.assertEqual((row["serial"], row["size"], row["hash"], row["trace_command_line"]),
+                         ("R58M123", 10, "h1", "-trace=cpu,gpu"))
+
+
+class CatalogPullTest(unittest.TestCase):
+    def test_records_the_file_in_the_folder_not_its_blob(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            folder = Path(tmp)
+            local = folder/"a.utrace"
+            local.write_bytes(b"trace")
+            with mock.patch.object(tool.os, "link", side_effect=OSError("no hardlinks here")):
+                tool.TraceStore(folder).adopt(local, tool.file_digest(local))
+            self.assertTrue(local.is_symlink())
+            app = mock.Mock()
+            app._catalog = tool.TraceCatalog(folder/"catalog.sqlite3")
+            app._state.data = {"devices": {"R58M123": ["samsung", "SM-G973F"]}, "command_lines": {}}
+            try:
+                tool.App._catalog_pull(app, tool.Transfer(CONN, "^saved/Traces/a.utrace", folder), local, "h1", {})
+                row, = app._catalog.search()
+            finally:
+                app._catalog.close()
+        self.assertEqual((row["local"], row["make"], row["size"]), (str(local.absolute()), "samsung", 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import UE_UAFT_Tool as tool
+from tests.support import POSIX_ONLY, FakeEnv, make_fake_insights
+
+KINDS = tool.INSIGHTS_DEFAULT_EXPORTS
+
+
+@unittest.skipIf(sys.platform.startswith("win"), POSIX_ONLY)
+class ExportTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        (self.root/"bin").mkdir()
+        (self.root/"traces").mkdir()
+        self.exe = make_fake_insights(self.root/"bin")
+        self.log = self.root/"insights.log"
+        self.trace = self.root/"traces"/"a.utrace"
+        self.trace.write_bytes(b"2CRT trace content")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def runs(self) -> int:
+        return len(self.log.read_text(encoding="utf-8").splitlines()) if self.log.exists() else 0
+
+    def test_writes_csvs_next_to_the_trace(self):
+        paths = tool.export_trace(self.exe, self.trace, KINDS)
+        self.assertEqual([p.name for p in paths], ["a.threads.csv", "a.timers.csv", "a.timer-stats.csv"])
+        self.assertIn("TimingInsights.ExportTimerStatistics,a.utrace", paths[2].read_text(encoding="utf-8"))
+        self.assertEqual(sorted(p.name for p in self.trace.parent.iterdir()), sorted([self.trace.name] + [p.name for p in paths]))
+
+    def test_failed_run_leaves_nothing_behind(self):
+        for env, match in (({"FAKE_INSIGHTS_FAIL": 3}, "exited with 3\nLogTraceServices: Error"),
+                           ({"FAKE_INSIGHTS_SKIP": "TimingInsights.ExportTimers"}, "missing a.timers.csv")):
+            with FakeEnv(**env), self.assertRaisesRegex(RuntimeError, match):
+                tool.export_trace(self.exe, self.trace, KINDS)
+            self.assertEqual([p.name for p in self.trace.parent.iterdir()], [self.trace.name])
+
+    def test_cache_hits_until_insights_changes(self):
+        cache = tool.ExportCache(self.root/"cache")
+        with FakeEnv(FAKE_INSIGHTS_LOG=self.log):
+            first = tool.export_traces(self.exe, [self.trace], KINDS, cache=cache)
+            for p in first[str(self.trace)][0]:
+                p.unlink()
+            second = tool.export_traces(self.exe, [self.trace], KINDS, cache=cache)
+            self.assertEqual((first[str(self.trace)][1], second[str(self.trace)][1], self.runs()), (0, 3, 1))
+            self.assertTrue(all(p.is_file() for p in second[str(self.trace)][0]))
+            st = self.exe.stat()
+            os.utime(self.exe, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))   # a rebuilt Insights
+            third = tool.export_traces(self.exe, [self.trace], KINDS, cache=cache)
+        self.assertEqual((third[str(self.trace)][1], self.runs()), (0, 2))
+
+    def test_batch_reports_failures_per_trace(self):
+        missing = self.root/"traces"/"gone.utrace"
+        results = tool.export_traces(self.exe, [self.trace, missing], KINDS)
+        self.assertEqual(len(results[str(self.trace)][0]), 3)
+        self.assertIsInstance(results[str(missing)], str)
+
+
+class ExportCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.clock = iter(range(1000, 2000))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def put(self, cache:tool.ExportCache, key:str, data:bytes):
+        src = self.root/f"{key}.src"
+        src.write_bytes(data)
+        with mock.patch.object(tool.time, "time", side_effect=self.clock):
+            cache.put(key, src)
+
+    def get(self, cache:tool.ExportCache, key:str) -> bool:
+        with mock.patch.object(tool.time, "time", side_effect=self.clock):
+            return cache.get(key, self.root/"out.csv")
+
+    def test_least_recently_used_is_evicted(self):
+        cache = tool.ExportCache(self.root/"cache", max_bytes=10)
+        self.put(cache, "aa01", b"1234")
+        self.put(cache, "bb02", b"5678")
+        self.assertTrue(self.get(cache, "aa01"))   # now b is the oldest
+        self.put(cache, "cc03", b"9abc")
+        reopened = tool.ExportCache(self.root/"cache", max_bytes=10)
+        self.assertEqual(sorted(reopened.data["entries"]), ["aa01", "cc03"])
+        self.assertFalse(self.get(reopened, "bb02"))
+        self.assertFalse((self.root/"cache"/"bb"/"bb02.csv").exists())
+        self.assertTrue(self.get(reopened, "cc03"))
+        self.assertEqual((self.root/"out.csv").read_bytes(), b"9abc")
+
+    def test_oversized_entry_is_not_cached(self):
+        cache = tool.ExportCache(self.root/"cache", max_bytes=10)
+        self.put(cache, "aa01", b"1234")
+        self.put(cache, "dd04", b"x" * 11)
+        self.assertEqual(list(cache.data["entries"]), ["aa01"])
+
+    def test_key_depends_on_every_part(self):
+        keys = {tool.ExportCache.key(*parts) for parts in
+                (("h1", "c", "v"), ("h2", "c", "v"), ("h1", "d", "v"), ("h1", "c", "w"))}
+        self.assertEqual(len(keys), 4)
+
+
+class InsightsVersionTest(unittest.TestCase):
+    def test_build_version_and_binary(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            exe = Path(tmp)/"Engine"/"Binaries"/"Linux"/"UnrealInsights"
+            exe.parent.mkdir(parents=True)
+            exe.write_bytes(b"elf")
+            plain = tool.insights_version(exe)
+            self.assertTrue(plain.startswith("exe:3:"))
+            (Path(tmp)/"Engine"/"Build").mkdir()
+            (Path(tmp)/"Engine"/"Build"/"Build.version").write_text(
+                '{"MajorVersion": 5, "MinorVersion": 4, "PatchVersion": 2, "Changelist": 123, "BranchName": "++UE5+Release-5.4"}')
+            self.assertEqual(tool.insights_version(exe), f"5.4.2-123+++UE5+Release-5.4|{plain}")
+            exe.write_bytes(b"elf, rebuilt")
+            self.assertNotEqual(tool.insights_version(exe), f"5.4.2-123+++UE5+Release-5.4|{plain}")
+
+
+if __name__ == "__main__":
+    unittest.main()
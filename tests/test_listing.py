@@ -0,0 +1,62 @@
+import unittest
+
+import UE_UAFT_Tool as tool
+
+
+class LsLongLineTest(unittest.TestCase):
+    def test_toybox_line(self):
+        e = tool._entry_from_line("-rw-r--r-- 1 shell shell 1234 2025-01-31 12:34 a.utrace")
+        self.assertEqual((e.path, e.size, e.stamp, e.is_dir), ("a.utrace", 1234, "2025-01-31 12:34", False))
+
+    def test_link_count_is_not_the_size(self):
+        e = tool._entry_from_line("-rw-rw----  12 u0_a123 ext_data_rw  987654321 2025-02-01 09:05:07.123 ^saved/Traces/b.utrace")
+        self.assertEqual((e.path, e.size, e.stamp), ("^saved/Traces/b.utrace", 987654321, "2025-02-01 09:05:07.123"))
+
+    def test_names_with_spaces(self):
+        e = tool._entry_from_line("-rw-r--r-- 1 shell shell 10 2025-01-31 12:34 my capture 2.utrace")
+        self.assertEqual(e.path, "my capture 2.utrace")
+
+    def test_month_day_stamps(self):
+        self.assertEqual(tool._entry_from_line("-rw-r--r-- 1 a b 5 Jan 31 12:34 x.utrace").stamp, "Jan 31 12:34")
+        self.assertEqual(tool._entry_from_line("-rw-r--r-- 1 a b 5 Jan  3  2024 x.utrace").stamp, "Jan 3 2024")
+
+    def test_directories_and_symlinks(self):
+        d = tool._entry_from_line("drwxrwx--x 3 u0_a1 u0_a1 4096 2025-01-31 12:34 Traces")
+        self.assertEqual((d.path, d.is_dir), ("Traces", True))
+        ln = tool._entry_from_line("lrwxrwxrwx 1 root root 21 2025-01-31 12:34 latest.utrace -> a b.utrace")
+        self.assertEqual((ln.path, ln.is_dir), ("latest.utrace", False))
+
+    def test_unknown_layout_has_no_size_or_stamp(self):
+        e = tool._entry_from_line("  ^saved/Traces/odd name.utrace  ")
+        self.assertEqual((e.path, e.size, e.stamp), ("^saved/Traces/odd name.utrace", None, None))
+        self.assertIsNone(tool._entry_from_line("total 48"))
+        self.assertIsNone(tool._entry_from_line("   "))
+
+
+class ListingTest(unittest.TestCase):
+    def test_dir_entries(self):
+        lines = ["total 12",
+                 "drwxrwx--x 2 u0_a1 u0_a1 4096 2025-01-31 12:00 Traces",
+                 "-rw-rw---- 1 u0_a1 u0_a1 5 2025-01-31 12:01 Game.log",
+                 "^saved/Profiling/"]
+        entries = tool._dir_entries(lines, "^saved")
+        self.assertEqual([(e.path, e.size, e.is_dir) for e in entries],
+                         [("^saved/Traces", 4096, True), ("^saved/Game.log", 5, False), ("^saved/Profiling", None, True)])
+
+    def test_recursive_trace_listing(self):
+        lines = ["^saved/Traces:",
+                 "total 8",
+                 "-rw-rw---- 1 u0_a1 u0_a1 100 2025-01-31 12:00 a.utrace",
+                 "drwxrwx--x 2 u0_a1 u0_a1 4096 2025-01-31 12:00 Soak",
+                 "",
+                 "^saved/Traces/Soak:",
+                 "-rw-rw---- 1 u0_a1 u0_a1 200 2025-01-31 12:05 b c.utrace",
+                 "-rw-rw---- 1 u0_a1 u0_a1 300 2025-01-31 12:05 notes.txt",
+                 "^saved/Traces/full.utrace"]
+        self.assertEqual([(e.path, e.size) for e in tool._trace_entries(lines)],
+                         [("^saved/Traces/a.utrace", 100), ("^saved/Traces/Soak/b c.utrace", 200),
+                          ("^saved/Traces/full.utrace", None)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import asyncio
+import sys
+import threading
+import time
+import unittest
+
+import UE_UAFT_Tool as tool
+
+SLEEPER = [sys.executable, "-c", "import time; time.sleep(30)"]
+
+
+class ChildProcessesTest(unittest.TestCase):
+    def setUp(self):
+        self._saved = tool._children
+        tool._children = tool.ChildProcesses()
+
+    def tearDown(self):
+        tool._children = self._saved
+
+    def _wait_for_child(self):
+        deadline = time.monotonic() + 10
+        while not tool._children._pids and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertTrue(tool._children._pids, "child never registered")
+
+    def test_kill_all_stops_a_running_command(self):
+        result = {}
+        t = threading.Thread(target=lambda: result.update(r=tool.run(SLEEPER)))
+        start = time.monotonic()
+        t.start()
+        self._wait_for_child()
+        tool._children.kill_all()
+        t.join(10)
+        self.assertFalse(t.is_alive())
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertNotEqual(result["r"][0], 0)
+        self.assertFalse(tool._children._pids)
+
+    def test_kill_all_stops_a_streaming_command(self):
+        lines = []
+        t = threading.Thread(target=lambda: lines.extend(tool.run_lines(SLEEPER, check=False)))
+        t.start()
+        self._wait_for_child()
+        tool._children.kill_all()
+        t.join(10)
+        self.assertFalse(t.is_alive())
+
+    def test_children_started_after_kill_all_die_at_once(self):
+        tool._children.kill_all()
+        start = time.monotonic()
+        code, _, _ = tool.run(SLEEPER, timeout=20)
+        self.assertNotEqual(code, 0)
+        code, _, _ = asyncio.run(tool.run_async(SLEEPER, timeout=20))
+        self.assertNotEqual(code, 0)
+        self.assertLess(time.monotonic() - start, 10)
+
+    def test_finished_children_are_forgotten(self):
+        code, out, _ = tool.run([sys.executable, "-c", "print('ok')"])
+        self.assertEqual((code, out.strip()), (0, "ok"))
+        self.assertFalse(tool._children._pids)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+import UE_UAFT_Tool as tool
+
+
+class FakeLister:
+    """Records listing requests; the test answers them in any order."""
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, path, on_done, on_error):
+        self.calls.append((path, on_done, on_error))
+
+    def answer(self, i:int, *names:str):
+        path = self.calls[i][0]
+        self.calls[i][1]([tool.RemoteEntry(f"{path}/{n.rstrip('/')}", None if n.endswith("/") else 10,
+                                           is_dir=n.endswith("/")) for n in names])
+
+
+class RemoteTreeModelTest(unittest.TestCase):
+    def setUp(self):
+        self.lister = FakeLister()
+        self.model = tool.RemoteTreeModel(self.lister, roots=("^saved", "^project"))
+        self.inserted = []
+        self.model.rowsInserted.connect(lambda parent, first, last: self.inserted.append((first, last)))
+
+    def saved(self):
+        return self.model.index(0, 0)
+
+    def names(self, parent) -> list[str]:
+        return [self.model.data(self.model.index(r, 0, parent)) for r in range(self.model.rowCount(parent))]
+
+    def test_lists_on_first_expand_only(self):
+        self.assertEqual(self.model.rowCount(), 2)
+        self.assertTrue(self.model.canFetchMore(self.saved()))
+        self.model.fetchMore(self.saved())
+        self.model.fetchMore(self.saved())   # already listing
+        self.assertEqual(len(self.lister.calls), 1)
+        self.assertEqual(self.model.data(self.saved()), "^saved/ (listing…)")
+        self.lister.answer(0, "b.utrace", "Traces/")
+        self.assertEqual(self.names(self.saved()), ["Traces/", "b.utrace"])
+        self.assertFalse(self.model.canFetchMore(self.saved()))
+
+    def test_reply_after_reset_is_ignored(self):
+        self.model.fetchMore(self.saved())
+        self.model.reset()
+        self.lister.answer(0, "a.utrace")
+        self.assertEqual((self.inserted, self.model.rowCount(self.saved())), ([], 0))
+        self.assertTrue(self.model.canFetchMore(self.saved()))
+
+    def test_reply_for_a_dropped_subtree_is_ignored(self):
+        self.model.fetchMore(self.saved())
+        self.lister.answer(0, "Traces/")
+        traces = self.model.index(0, 0, self.saved())
+        self.model.fetchMore(traces)
+        self.model.refresh(self.saved())
+        self.lister.answer(1, "a.utrace")   # the old Traces node is gone
+        self.assertEqual(self.inserted, [(0, 0)])
+        self.lister.answer(2, "Traces/", "x.utrace")
+        self.assertEqual(self.names(self.saved()), ["Traces/", "x.utrace"])
+
+    def test_only_the_latest_listing_of_a_folder_counts(self):
+        self.model.fetchMore(self.saved())
+        self.model.refresh(self.saved())
+        self.lister.answer(0, "old.utrace")
+        self.assertEqual(self.model.rowCount(self.saved()), 0)
+        self.lister.answer(1, "new.utrace")
+        self.assertEqual(self.names(self.saved()), ["new.utrace"])
+
+    def test_failed_listing_can_be_retried(self):
+        self.model.fetchMore(self.saved())
+        self.lister.calls[0][2](RuntimeError("offline"))
+        self.assertTrue(self.model.canFetchMore(self.saved()))
+        self.model.fetchMore(self.saved())
+        self.lister.answer(1)
+        self.assertEqual(self.model.rowCount(self.saved()), 0)
+        self.assertFalse(self.model.hasChildren(self.saved()))
+
+
+if __name__ == "__main__":
+    unittest.main()
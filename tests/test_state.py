@@ -0,0 +1,59 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import UE_UAFT_Tool as tool
+
+
+class StateStoreTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name)/"state.json"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip(self):
+        state = tool.StateStore(self.path)
+        state.data["devices"]["S1"] = ["Google", "Pixel 8"]
+        state.save()
+        loaded = tool.StateStore(self.path).data
+        self.assertEqual(loaded["devices"], {"S1": ["Google", "Pixel 8"]})
+        self.assertIsNotNone(loaded["saved_at"])
+
+    def test_other_version_or_corrupt_loads_empty(self):
+        for text in ('{"version": 99, "devices": {"S1": ["a", "b"]}}', "{not json", "[]"):
+            self.path.write_text(text, encoding="utf-8")
+            self.assertEqual(tool.StateStore(self.path).data, tool.StateStore(self.path).empty())
+
+    def test_keys_missing_from_an_older_file_are_filled_in(self):
+        self.path.write_text('{"version": 1, "paths": {"uaft": "/x"}}', encoding="utf-8")
+        data = tool.StateStore(self.path).data
+        self.assertEqual((data["paths"], data["command_lines"]), ({"uaft": "/x"}, {}))
+
+    def test_unwritable_location_is_ignored(self):
+        self.path.mkdir()   # a folder where the file should be
+        tool.StateStore(self.path).save()
+
+
+class PushManifestTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name)/"push-manifest.json"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip(self):
+        m = tool.PushManifest(self.path)
+        m.record("S1|com.x", "^project/a.txt", "blake2b:00", 3, 42)
+        m.save()
+        self.assertEqual(tool.PushManifest(self.path).entry("S1|com.x", "^project/a.txt")["mtime_ns"], 42)
+
+    def test_other_version_loads_empty(self):
+        self.path.write_text('{"version": 99, "targets": {"S1|com.x": {}}}', encoding="utf-8")
+        self.assertEqual(tool.PushManifest(self.path).data, {"version": 1, "targets": {}})
+
+
+if __name__ == "__main__":
+    unittest.main()
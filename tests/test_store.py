@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import UE_UAFT_Tool as tool
+
+
+class TraceStoreTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.folder = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def pull(self, name:str, content:bytes, store:tool.TraceStore|None=None) -> tuple[Path,str,bool]:
+        local = self.folder/name
+        local.write_bytes(content)
+        digest = tool.file_digest(local)
+        duplicate = (store or tool.TraceStore(self.folder)).adopt(local, digest)
+        return local, digest, duplicate
+
+    def blobs(self) -> list[Path]:
+        return [p for p in (self.folder/tool.TraceStore.DIR/"objects").glob("*/*/*") if p.is_file()]
+
+    def test_duplicate_content_is_stored_once(self):
+        store = tool.TraceStore(self.folder)
+        a, digest, dup_a = self.pull("a.utrace", b"trace" * 100, store)
+        b, _, dup_b = self.pull("b.utrace", b"trace" * 100, store)
+        self.assertEqual((dup_a, dup_b), (False, True))
+        self.assertTrue(os.path.samefile(a, b))
+        self.assertEqual(len(self.blobs()), 1)
+        self.assertEqual(store.digest_of(b), digest)
+
+    def test_deleting_the_pulled_file_frees_its_blob(self):
+        a, digest, _ = self.pull("a.utrace", b"x" * 1000)
+        a.unlink()
+        store = tool.TraceStore(self.folder)
+        self.assertEqual(self.blobs(), [])
+        self.assertEqual(store.data["objects"], {})
+        self.assertIsNone(store.lookup(digest))
+
+    def test_blob_stays_while_another_name_shows_it(self):
+        store = tool.TraceStore(self.folder)
+        a, digest, _ = self.pull("a.utrace", b"y" * 1000, store)
+        self.pull("b.utrace", b"y" * 1000, store)
+        a.unlink()
+        self.assertEqual(store.prune(), 0)
+        self.assertEqual(store.data["objects"][digest]["names"], ["b.utrace"])
+        (self.folder/"b.utrace").unlink()
+        self.assertEqual(store.prune(), 1000)
+        self.assertEqual(self.blobs(), [])
+
+    def test_overwritten_name_releases_the_old_content(self):
+        store = tool.TraceStore(self.folder)
+        self.pull("a.utrace", b"old" * 100, store)
+        tmp = self.folder/"new.tmp"
+        tmp.write_bytes(b"new" * 100)
+        os.replace(tmp, self.folder/"a.utrace")   # e.g. copied over by hand
+        store.prune()
+        self.assertEqual(self.blobs(), [])
+        self.assertEqual(store.data["objects"], {})
+
+    def test_renamed_copy_keeps_its_blob(self):
+        store = tool.TraceStore(self.folder)
+        a, digest, _ = self.pull("a.utrace", b"z" * 1000, store)
+        a.rename(self.folder/"renamed.utrace")
+        store.prune()
+        self.assertEqual(len(self.blobs()), 1)
+        (self.folder/"renamed.utrace").unlink()
+        self.assertEqual(store.prune(), 1000)
+
+    def test_unindexed_orphan_blob_is_removed(self):
+        orphan = self.folder/tool.TraceStore.DIR/"objects"/"blake2b"/"ab"/"cdef"
+        orphan.parent.mkdir(parents=True)
+        orphan.write_bytes(b"left over")
+        tool.TraceStore(self.folder)
+        self.assertFalse(orphan.exists())
+
+
+    def test_renamed_symlink_keeps_the_only_copy(self):
+        with mock.patch.object(tool.os, "link", side_effect=OSError("no hardlinks here")):
+            a, digest, _ = self.pull("a.utrace", b"s" * 1000)
+        self.assertTrue(a.is_symlink())
+        a.rename(self.folder/"renamed.utrace")
+        store = tool.TraceStore(self.folder)
+        self.assertEqual((self.folder/"renamed.utrace").read_bytes(), b"s" * 1000)
+        self.assertEqual(store.data["objects"][digest]["names"], ["renamed.utrace"])
+        self.assertEqual(store.digest_of(self.folder/"renamed.utrace"), digest)
+        (self.folder/"renamed.utrace").unlink()
+        self.assertEqual(store.prune(), 1000)
+
+    def test_symlinked_name_shown_other_content_keeps_the_renamed_copy(self):
+        store = tool.TraceStore(self.folder)
+        with mock.patch.object(tool.os, "link", side_effect=OSError("no hardlinks here")):
+            a, _, _ = self.pull("a.utrace", b"1" * 1000, store)
+            a.rename(self.folder/"first.utrace")
+            self.pull("a.utrace", b"2" * 1000, store)
+        self.assertEqual((self.folder/"first.utrace").read_bytes(), b"1" * 1000)
+        self.assertEqual(len(self.blobs()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
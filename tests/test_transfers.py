@@ -0,0 +1,110 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import UE_UAFT_Tool as tool
+
+CONN = ("SERIAL1", None, None, "com.example.game", None)
+
+
+class FakeLister:
+    """Stands in for UAFT.iter_trace_entries with a fixed listing."""
+    def __init__(self, entries):
+        self.entries = entries
+
+    def iter_trace_entries(self, *conn):
+        return iter([tool.RemoteEntry(e.path, e.size, e.stamp) for e in self.entries])
+
+
+class TraceWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        entry = tool.RemoteEntry("^saved/Traces/a.utrace", 100, "2025-01-31 12:00")
+        self.watcher = tool.TraceWatcher(FakeLister([entry]), CONN, tool.StabilityTracker(settle=0),
+                                         tool.TraceManifest(Path(self._tmp.name)), min_interval=0.02, max_interval=0.02)
+        self.ready = []
+        self.thread = threading.Thread(target=self.watcher.run, args=(self._report,), daemon=True)
+
+    def tearDown(self):
+        self.watcher.stop()
+        self.thread.join(5)
+        self._tmp.cleanup()
+
+    def _report(self, event):
+        if event[0] == "ready":
+            self.ready.append([e.path for e in event[1]])
+
+    def _wait(self, n:int, timeout:float=3.0):
+        deadline = time.monotonic() + timeout
+        while len(self.ready) < n and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_reports_a_finished_trace_once(self):
+        self.thread.start()
+        self._wait(1)
+        time.sleep(0.2)
+        self.assertEqual(self.ready, [["^saved/Traces/a.utrace"]])
+
+    def test_failed_pull_is_offered_again(self):
+        self.thread.start()
+        self._wait(1)
+        self.watcher.forget("^saved/Traces/a.utrace")
+        self._wait(2)
+        self.assertEqual(self.ready, [["^saved/Traces/a.utrace"]] * 2)
+
+
+def transfer(serial:str, name:str) -> tool.Transfer:
+    return tool.Transfer((serial, None, None, "com.example.game", None), f"^saved/Traces/{name}", Path(name))
+
+
+class TransferQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.started = []
+        self.queue = tool.TransferQueue(self.started.append, max_total=3, max_per_device=2)
+
+    def test_limits_and_fifo(self):
+        self.queue.submit([transfer("A", "1"), transfer("A", "2"), transfer("A", "3"), transfer("B", "4"),
+                           transfer("B", "5")])
+        # A's third pull waits for A, B's first goes ahead of it; B's second waits for the total
+        self.assertEqual([t.remote[-1] for t in self.started], ["1", "2", "4"])
+        self.assertEqual(self.queue.counts(), (3, 2))
+        self.queue.finished(self.started[2])
+        self.assertEqual(self.started[-1].remote[-1], "5")
+        self.queue.finished(self.started[0])
+        self.assertEqual(self.started[-1].remote[-1], "3")
+        for t in self.started[1:]:
+            if t is not self.started[2]:
+                self.queue.finished(t)
+        self.assertEqual((self.queue.counts(), self.queue.busy), ((0, 0), False))
+
+    def test_raising_limits_starts_waiting_transfers(self):
+        self.queue.submit([transfer("A", str(i)) for i in range(4)])
+        self.assertEqual(len(self.started), 2)
+        self.queue.set_limits(4, 4)
+        self.assertEqual(len(self.started), 4)
+
+
+class StabilityTrackerTest(unittest.TestCase):
+    def observe(self, tracker, at:float, size:int|None, stamp:str|None="2025-01-31 12:00"):
+        with mock.patch.object(tool.time, "monotonic", return_value=at):
+            tracker.observe("T", [tool.RemoteEntry("a.utrace", size, stamp)])
+        return tracker.state("T", "a.utrace")
+
+    def test_settles_after_unchanged_listings(self):
+        tracker = tool.StabilityTracker(settle=3)
+        self.assertEqual(tracker.state("T", "a.utrace"), "new")
+        self.assertEqual(self.observe(tracker, 0, 100), "new")
+        self.assertEqual(self.observe(tracker, 2, 200), "growing")
+        self.assertEqual(self.observe(tracker, 4, 200), "growing")
+        self.assertEqual(self.observe(tracker, 5, 200), "stable")
+        self.assertEqual(self.observe(tracker, 6, 300), "growing")
+
+    def test_listing_without_size_or_stamp_is_stable(self):
+        self.assertEqual(self.observe(tool.StabilityTracker(settle=3), 0, None, None), "stable")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import UE_UAFT_Tool as tool
+from tests.support import POSIX_ONLY, FakeEnv, make_fake_uaft
+
+CONN = ("SERIAL1", None, None, "com.example.game", None)
+
+
+@unittest.skipIf(sys.platform.startswith("win"), POSIX_ONLY)
+class UAFTTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.device = self.tmp/"device"
+        (self.device/"^saved"/"Traces").mkdir(parents=True)
+        self.listing = self.tmp/"ls.txt"
+        self.listing.write_text("", encoding="utf-8")
+        self.uaft = tool.UAFT(make_fake_uaft(self.tmp))
+        self.env = FakeEnv(FAKE_UAFT_ROOT=self.device, FAKE_UAFT_LS=self.listing, FAKE_UAFT_DEVICES="SERIAL1 SERIAL2")
+        self.env.__enter__()
+
+    def tearDown(self):
+        self.env.__exit__()
+        self._tmp.cleanup()
+
+    def put_trace(self, name:str, size:int) -> str:
+        (self.device/"^saved"/"Traces"/name).write_bytes(bytes(range(256)) * (size // 256) + b"x" * (size % 256))
+        return f"^saved/Traces/{name}"
+
+
+class AsyncUAFTTest(UAFTTestCase):
+    def test_wraps_instead_of_extending(self):
+        client = tool.AsyncUAFT(self.uaft)
+        self.assertNotIsInstance(client, tool.UAFT)
+        self.assertFalse(hasattr(client, "iter_devices"))
+        self.assertIs(client.uaft, self.uaft)
+
+    def test_devices_and_packages(self):
+        async def main():
+            client = tool.AsyncUAFT(self.uaft)
+            return await asyncio.gather(client.devices(), client.packages("SERIAL1"))
+        devices, packages = asyncio.run(main())
+        self.assertEqual(devices, ["SERIAL1", "SERIAL2"])
+        self.assertEqual(packages, ["com.example.game"])
+
+    def test_pull_reports_progress(self):
+        remote = self.put_trace("a.utrace", 300_000)
+        seen = []
+        local = asyncio.run(tool.AsyncUAFT(self.uaft).pull_trace(*CONN, remote, self.tmp/"pulled", 300_000,
+                                                                  progress=seen.append, verify=True))
+        self.assertEqual(local.stat().st_size, 300_000)
+        self.assertEqual(seen[-1].done, 300_000)
+        self.assertEqual(sorted(p.name for p in (self.tmp/"pulled").iterdir()), ["a.utrace"])
+
+    def test_push_folder_pushes_only_changes(self):
+        local = self.tmp/"overrides"
+        (local/"Config").mkdir(parents=True)
+        (local/"Config"/"Engine.ini").write_text("[Core]\n", encoding="utf-8")
+        (local/"a.pak").write_bytes(b"pak")
+        manifest = tool.PushManifest(self.tmp/"push-manifest.json")
+        pushed, unchanged, failures = tool.push_folder(self.uaft, CONN, local, "^project/Saved", manifest)
+        self.assertEqual((pushed, unchanged, failures), (2, 0, []))
+        self.assertEqual((self.device/"^project"/"Saved"/"Config"/"Engine.ini").read_text(encoding="utf-8"), "[Core]\n")
+        (local/"a.pak").write_bytes(b"pak2")
+        pushed, unchanged, failures = tool.push_folder(self.uaft, CONN, local, "^project/Saved",
+                                                       tool.PushManifest(self.tmp/"push-manifest.json"))
+        self.assertEqual((pushed, unchanged, failures), (1, 1, []))
+
+
+class ListingPullTest(UAFTTestCase):
+    def test_listed_size_verifies_a_pull(self):
+        remote = self.put_trace("a.utrace", 1234)
+        self.listing.write_text("^saved/Traces:\n-rw-r--r-- 1 shell shell 1234 2025-01-31 12:34 a.utrace\n", encoding="utf-8")
+        [e] = self.uaft.iter_trace_entries(*CONN)
+        self.assertEqual((e.path, e.size), (remote, 1234))
+        local = self.uaft.pull_trace(*CONN, e.path, self.tmp/"pulled", e.size, verify=True)
+        self.assertEqual(local.stat().st_size, 1234)
+
+    def test_short_pull_is_reported(self):
+        remote = self.put_trace("a.utrace", 1000)
+        with self.assertRaises(tool.IncompletePull):
+            self.uaft.pull_trace(*CONN, remote, self.tmp/"pulled", 1234, verify=True)
+        self.assertEqual(list((self.tmp/"pulled").iterdir()), [])
+
+    def test_pull_sweeps_folders_left_by_a_crashed_pull(self):
+        pulled = self.tmp/"pulled"
+        crashed, running = pulled/".uaft-pull-999999-abc", pulled/".uaft-pull-999998-def"
+        for d in (crashed, running):
+            d.mkdir(parents=True)
+            (d/"a.utrace").write_bytes(b"partial")
+        hour_ago = tool.time.time() - tool.PULL_TMP_STALE - 60
+        for p in (crashed, crashed/"a.utrace"):
+            os.utime(p, (hour_ago, hour_ago))
+        remote = self.put_trace("a.utrace", 1000)
+        self.uaft.pull_trace(*CONN, remote, pulled, 1000, verify=True)
+        self.assertEqual(sorted(p.name for p in pulled.iterdir()), [running.name, "a.utrace"])
+
+
+class PullTmpSweepTest(unittest.TestCase):
+    def test_keeps_this_process_running_pulls_only(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            live = tool._pull_tmpdir(root)
+            leaked = root/f".uaft-pull-{os.getpid()}-old"
+            leaked.mkdir()
+            try:
+                self.assertEqual(tool.sweep_pull_tmpdirs(root), 1)
+                self.assertEqual(list(root.iterdir()), [live])
+            finally:
+                tool._drop_pull_tmpdir(live)
+            self.assertEqual(list(root.iterdir()), [])
+            self.assertNotIn(live, tool._live_pull_tmps)
+
+
+class TimeoutTest(UAFTTestCase):
+    def test_timeout_message_hides_the_security_token(self):
+        args = self.uaft._base_args("SERIAL1", None, None, "com.example.game", "s3cret-token") + ["hang"]
+        with self.assertRaises(tool.CommandTimeout) as cm:
+            tool.run(args, timeout=0.5, op="UAFT hang")
+        self.assertNotIn("s3cret-token", str(cm.exception))
+        self.assertNotIn("s3cret-token", cm.exception.cmd)
+        self.assertIn("-k ***", str(cm.exception))
+
+    def test_pull_of_unknown_size_runs_while_the_file_grows(self):
+        remote = self.put_trace("long.utrace", 20 << 16)
+        uaft = tool.UAFT(self.uaft.uaft_path, {"pull": 1.0})
+        with FakeEnv(FAKE_UAFT_CHUNK_DELAY=0.15):   # ~3 s in all, never 1 s without growth
+            local = uaft.pull_trace(*CONN, remote, self.tmp/"pulled")
+        self.assertEqual(local.stat().st_size, 20 << 16)
+
+    def test_pull_of_unknown_size_stops_once_the_file_stalls(self):
+        remote = self.put_trace("stuck.utrace", 2 << 16)
+        uaft = tool.UAFT(self.uaft.uaft_path, {"pull": 1.0})
+        with FakeEnv(FAKE_UAFT_CHUNK_DELAY=30):
+            with self.assertRaises(tool.CommandTimeout) as cm:
+                uaft.pull_trace(*CONN, remote, self.tmp/"pulled")
+        self.assertIn("made no progress", str(cm.exception))
+        self.assertEqual(list((self.tmp/"pulled").iterdir()), [])
+
+    def test_pull_of_known_size_keeps_its_total_budget(self):
+        remote = self.put_trace("sized.utrace", 20 << 16)
+        uaft = tool.UAFT(self.uaft.uaft_path, {"pull": 1.0})
+        with FakeEnv(FAKE_UAFT_CHUNK_DELAY=0.15):
+            with self.assertRaises(tool.CommandTimeout):
+                uaft.pull_trace(*CONN, remote, self.tmp/"pulled", expected_size=20 << 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
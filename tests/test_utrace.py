@@ -0,0 +1,214 @@
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import UE_UAFT_Tool as tool
+from tests.support import AUX_END, aux, important, lz4_literals, new_event, packet, utrace
+
+ANSI, WIDE, U32, U8 = 0o210, 0o211, 0o002, 0o000
+SESSION2 = [("Platform", 0, 0, ANSI), ("AppName", 0, 0, ANSI), ("ProjectName", 0, 0, WIDE),
+            ("CommandLine", 0, 0, WIDE), ("Branch", 0, 0, WIDE), ("BuildVersion", 0, 0, WIDE),
+            ("Changelist", 0, 4, U32), ("ConfigurationType", 4, 1, U8), ("TargetType", 5, 1, U8)]
+VALUES = {"Platform": b"Android", "AppName": b"MyGame", "ProjectName": "MyGame".encode("utf-16-le"),
+          "CommandLine": "-trace=default -tracehost=127.0.0.1".encode("utf-16-le"),
+          "Branch": "++MyGame+main".encode("utf-16-le"), "BuildVersion": "1.2.3-Shipping".encode("utf-16-le")}
+
+
+def session2(uid:int, fields) -> bytes:
+    # strings go as aux data by field index; fixed part: Changelist 4711, Development, Game
+    blocks = b"".join(aux(i, VALUES[name]) for i, (name, *_rest) in enumerate(fields) if name in VALUES)
+    fixed = struct.pack("<IBB", 4711, 3, 1)[:max(off + size for _n, off, size, ti in fields if not ti & 0o200)]
+    return important(uid, fixed + blocks + AUX_END)
+
+
+class Lz4Test(unittest.TestCase):
+    def decode(self, block:bytes, size:int) -> bytes:
+        with mock.patch.object(tool, "lz4_block", None):   # the built-in decoder
+            return tool.lz4_block_decode(memoryview(block), size)
+
+    def test_literals(self):
+        data = bytes(range(256)) * 2
+        self.assertEqual(self.decode(lz4_literals(data), len(data)), data)
+        self.assertEqual(self.decode(lz4_literals(b"hi"), 2), b"hi")
+
+    def test_overlapping_match(self):
+        # "ab", then 10 bytes from 2 back, then a final literal
+        self.assertEqual(self.decode(b"\x26ab\x02\x00\x10!", 13), b"abababababab!")
+
+    def test_extended_lengths(self):
+        # 15 + 5 literals, then a match of 15 + 4 + 3 bytes from 1 back, then an empty last literal run
+        block = b"\xff\x05" + bytes(range(20)) + b"\x01\x00\x03\x00"
+        self.assertEqual(self.decode(block, 42), bytes(range(20)) + b"\x13" * 22)
+
+    def test_long_zero_fill(self):
+        # one zero, then 15 + 4 + 255 * 1024 + 0 more from 1 back, then an empty last literal run
+        block = b"\x1f\x00\x01\x00" + b"\xff" * 1024 + b"\x00\x00"
+        size = 1 + 15 + 4 + 255 * 1024
+        self.assertEqual(self.decode(block, size), bytes(size))
+
+    def test_offset_before_the_start(self):
+        with self.assertRaises(ValueError):
+            self.decode(b"\x16ab\x03\x00\x00", 12)
+
+    def test_size_mismatch(self):
+        with self.assertRaises(ValueError):
+            self.decode(lz4_literals(b"hello"), 6)
+
+
+class HeaderTest(unittest.TestCase):
+    def test_trc2_metadata(self):
+        meta = b"\x02\x00\xbc\x07" + b"\x03\x09abc"   # control port, then an unknown 3-byte field
+        info, pos = tool.utrace_header(b"2CRT" + struct.pack("<H", len(meta)) + meta + b"\x03\x05")
+        self.assertEqual(info, {"magic": "TRC2", "metadata": {"control_port": 1980, "field_9": "616263"},
+                                "transport": 3, "protocol": 5})
+        self.assertEqual(pos, 4 + 2 + len(meta) + 2)
+
+    def test_trce_has_no_metadata(self):
+        self.assertEqual(tool.utrace_header(b"ECRT\x03\x04"), ({"magic": "TRCE", "metadata": {}, "transport": 3,
+                                                               "protocol": 4}, 6))
+
+    def test_bad_headers(self):
+        for data, match in ((b"PK\x03\x04", "unknown magic"), (b"2CRT\x10\x00\x02", "truncated")):
+            with self.assertRaisesRegex(ValueError, match):
+                tool.utrace_header(data)
+
+
+class PacketTest(unittest.TestCase):
+    def test_plain_encoded_and_torn_tail(self):
+        data = packet(1, b"abc") + packet(0x4005, b"0123456789abcdef", encode=True) + packet(6, b"xyz")[:-1]
+        found = [(tid, enc, bytes(payload), size) for tid, enc, payload, size in tool.utrace_packets(memoryview(data), 0)]
+        self.assertEqual(found, [(1, False, b"abc", 3), (5, True, lz4_literals(b"0123456789abcdef"), 16)])
+
+    def test_limit(self):
+        data = packet(1, b"abc") + packet(2, b"def")
+        self.assertEqual([tid for tid, *_ in tool.utrace_packets(data, 0, limit=7)], [1])
+
+
+class UtraceFileTest(unittest.TestCase):
+    def write(self, data:bytes) -> Path:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = Path(tmp.name)/"t.utrace"
+        path.write_bytes(data)
+        return path
+
+
+class SessionInfoTest(UtraceFileTest):
+    def test_fields_by_definition(self):
+        internal = new_event(7, "Diagnostics", "Session2", SESSION2, flags=5) + session2(7, SESSION2)
+        info = tool.read_utrace_info(self.write(utrace(packet(1, internal))))
+        self.assertEqual(info, {"magic": "TRC2", "metadata": {"control_port": 1980}, "transport": 3, "protocol": 5,
+                                "platform": "Android", "app_name": "MyGame", "project_name": "MyGame",
+                                "command_line": "-trace=default -tracehost=127.0.0.1", "branch": "++MyGame+main",
+                                "build_version": "1.2.3-Shipping", "changelist": 4711,
+                                "build_config": "Development", "target_type": "Game"})
+
+    def test_older_definition_without_project_name(self):
+        fields = [f for f in SESSION2 if f[0] not in ("ProjectName", "TargetType")]
+        internal = new_event(9, "Diagnostics", "Session2", fields, flags=5) + session2(9, fields)
+        info = tool.read_utrace_info(self.write(utrace(packet(1, internal))))
+        self.assertNotIn("project_name", info)
+        self.assertNotIn("target_type", info)
+        self.assertEqual((info["command_line"], info["branch"], info["build_config"]),
+                         ("-trace=default -tracehost=127.0.0.1", "++MyGame+main", "Development"))
+
+    def test_stream_split_across_encoded_packets(self):
+        internal = new_event(7, "Diagnostics", "Session2", SESSION2, flags=5) + session2(7, SESSION2)
+        half = len(internal) // 2
+        data = utrace(packet(1, internal[:half], encode=True), packet(5, b"\x0e" * 40),
+                      packet(1, internal[half:], encode=True))
+        self.assertEqual(tool.read_utrace_info(self.write(data))["app_name"], "MyGame")
+
+    def test_no_session_event(self):
+        info = tool.read_utrace_info(self.write(utrace(packet(1, new_event(7, "Cpu", "Scope", [("Id", 0, 4, U32)])))))
+        self.assertNotIn("platform", info)
+
+    def test_not_a_trace(self):
+        with self.assertRaises(ValueError):
+            tool.read_utrace_info(self.write(b"PK\x03\x04 not a trace"))
+
+
+class StatsTest(UtraceFileTest):
+    def test_events_tallied_per_type(self):
+        internal = (new_event(7, "Cpu", "Timer", [("Id", 0, 4, U32)])
+                    + new_event(8, "Log", "Message", [("Id", 0, 4, U32), ("Text", 4, 0, WIDE)], flags=6)
+                    + new_event(200, "Misc", "Wide", [("V", 0, 2, 0o001)], flags=4)
+                    + new_event(9, "Diagnostics", "Session2", SESSION2, flags=5) + session2(9, SESSION2))
+        enter, leave = b"\x0a" + bytes(7), b"\x0c" + bytes(7)          # EnterScope_T / LeaveScope_T
+        timer = b"\x0e" + b"\x01\x00\x00" + struct.pack("<I", 42)     # uid 7, serial, Id
+        message = b"\x10" + struct.pack("<I", 1) + aux(1, "hi".encode("utf-16-le")) + AUX_END
+        wide = struct.pack("<H", 200 << 1 | 1) + b"\x05\x00"           # two-byte uid
+        stream = enter + timer * 3 + message + wide + leave
+        cut = len(enter + timer) + 3   # mid-event: the rest arrives in the thread's next packet
+        data = utrace(packet(1, internal), packet(5, stream[:cut], encode=True), packet(6, b"\x64" + bytes(9)),
+                      packet(5, stream[cut:]))
+        stats = tool.utrace_stats(str(self.write(data)))
+        self.assertEqual(stats["events"], {
+            "$Trace.NewEvent": [4, len(internal) - len(session2(9, SESSION2))],
+            "Diagnostics.Session2": [1, len(session2(9, SESSION2))],
+            "$Trace.EnterScope": [1, 8], "$Trace.LeaveScope": [1, 8], "Cpu.Timer": [3, 24],
+            "Log.Message": [1, len(message)], "Misc.Wide": [1, 4]})
+        self.assertEqual(stats["undecoded"], 10)   # thread 6 starts with an unknown uid
+        self.assertEqual((stats["packets"], stats["threads"]["5"][0], stats["threads"]["5"][2]), (4, 2, len(stream)))
+
+    def test_cached_stats_need_the_current_version(self):
+        path = self.write(utrace(packet(1, new_event(7, "Cpu", "Timer", [("Id", 0, 4, U32)]))))
+        manifest = tool.TraceManifest(path.parent)
+        manifest.record_stats(path, tool.utrace_stats(str(path)))
+        self.assertEqual(tool.TraceManifest(path.parent).stats(path)["events"], {"$Trace.NewEvent": [1, 26]})
+        manifest.data["stats"][path.name]["version"] = tool.UTRACE_STATS_VERSION - 1
+        self.assertIsNone(manifest.stats(path))
+
+
+# A protocol 5 trace written out byte by byte, independent of the module's constants and
+# the builders above: TRC2 header with control port 1980, TidPacket transport; thread 1
+# holds the Diagnostics.Session2 and Cpu.Timer definitions and the session event, thread 5
+# an EnterScope_T, one Cpu.Timer and a LeaveScope_T.
+PROTOCOL5_TRACE = bytes.fromhex(
+    "32435254 0400 0200bc07 03 05"
+    "8400 0100"
+    "0000 4400 0700 03 05 0b 08 0000 0000 88 08 0000 0000 88 07 0000 0400 02 0a"
+    "  446961676e6f7374696373 53657373696f6e32 506c6174666f726d 4170704e616d65 4368616e67656c697374"
+    "0700 1a00 67120000 02e00000 416e64726f6964 02c10000 4d7947616d65 04"
+    "0000 1600 0800 01 00 03 05 0000 0400 02 02 437075 54696d6572 4964"
+    "1c00 0500"
+    "0a 01020304050607 10 010000 2a000000 0c 08090a0b0c0d0e")
+
+
+class ProtocolTest(UtraceFileTest):
+    def test_protocol5_fixture(self):
+        path = self.write(PROTOCOL5_TRACE)
+        info = tool.read_utrace_info(path)
+        self.assertEqual((info["protocol"], info["platform"], info["app_name"], info["changelist"]),
+                         (5, "Android", "MyGame", 4711))
+        stats = tool.utrace_stats(str(path))
+        self.assertEqual(stats["events"], {"$Trace.NewEvent": [2, 98], "Diagnostics.Session2": [1, 30],
+                                           "$Trace.EnterScope": [1, 8], "Cpu.Timer": [1, 8],
+                                           "$Trace.LeaveScope": [1, 8]})
+        self.assertEqual(stats["undecoded"], 0)
+
+    def test_unknown_protocol_is_refused(self):
+        path = self.write(PROTOCOL5_TRACE[:11] + b"\x06" + PROTOCOL5_TRACE[12:])
+        self.assertEqual(tool.read_utrace_info(path), {"magic": "TRC2", "metadata": {"control_port": 1980},
+                                                       "transport": 3, "protocol": 6})
+        with self.assertRaisesRegex(ValueError, "protocol version 6"):
+            tool.utrace_stats(str(path))
+
+
+class NewEventTest(unittest.TestCase):
+    def test_fields_and_fixed_size(self):
+        t, = tool._new_events(b"\x01\x02" + new_event(12, "Cpu", "Timer", [("Id", 0, 4, U32), ("Name", 4, 0, WIDE),
+                                                                            ("Depth", 4, 2, 0o001)], flags=2))
+        self.assertEqual((t.uid, t.logger, t.name, t.flags, t.fixed_size), (12, "Cpu", "Timer", 2, 6))
+        self.assertEqual([f[0] for f in t.fields], ["Id", "Name", "Depth"])
+
+    def test_sizes_must_add_up(self):
+        rec = bytearray(new_event(12, "Cpu", "Timer", [("Id", 0, 4, U32)]))
+        rec[2] += 1   # record claims one byte more than the names fill
+        self.assertEqual(tool._new_events(bytes(rec) + b"\x00"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()